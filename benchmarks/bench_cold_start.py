@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tempo di avvio a freddo: motore e riga di comando contro la GUI.
+
+Uso:
+    python benchmarks/bench_cold_start.py [--runs N] [--importtime]
+
+Ogni misura è la mediana di N processi Python nuovi. Con --importtime
+mostra i moduli più costosi da importare per `import path_analyzer`.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child_env():
+    # Bytecode abilitato: si misura l'avvio con i .pyc già scritti, come dopo l'installazione
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))
+    return env
+
+
+def make_tree(root, dirs=20, files=10):
+    for d in range(dirs):
+        sub = os.path.join(root, f"cartella_{d:02d}")
+        os.makedirs(sub)
+        for f in range(files):
+            with open(os.path.join(sub, f"documento_{f:02d}.txt"), "wb") as fh:
+                fh.write(b"x" * f)
+
+
+def run(cmd, runs):
+    env = child_env()
+    times = []
+    for i in range(runs + 1):
+        start = time.perf_counter()
+        result = subprocess.run(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if i:
+            times.append(time.perf_counter() - start)  # il primo avvio scrive i .pyc
+        if result.returncode != 0:
+            return None, result.stderr.decode(errors="replace").strip().splitlines()[-1:]
+    return statistics.median(times), None
+
+
+def import_breakdown(module, top=12):
+    # -X importtime scrive su stderr: "import time: self | cumulativo | modulo"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, env=child_env(), capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[0].split(":")[-1].strip().isdigit():
+            rows.append((int(parts[1]), int(parts[0].split(":")[-1]), parts[2].rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        py = sys.executable
+        cases = [
+            ("interprete (python -c pass)", [py, "-c", "pass"]),
+            ("import path_analyzer", [py, "-c", "import path_analyzer"]),
+            ("python -m path_analyzer --help", [py, "-m", "path_analyzer", "--help"]),
+            ("scansione CLI (200 file)", [py, "-m", "path_analyzer", tmp, "--ndjson", "none", "--no-report", "-q"]),
+            ("scansione CLI + report", [py, "-m", "path_analyzer", tmp, "--ndjson", "all", "-q",
+                                        "-o", os.path.join(tmp, "report.md")]),
+            ("import path_analyzer_gui", [py, "-c", "import path_analyzer_gui"]),
+        ]
+
+        print(f"Mediana di {args.runs} avvii — Python {sys.version.split()[0]}")
+        print(f"{'Comando':<34} {'Tempo':>10}")
+        for label, cmd in cases:
+            median, error = run(cmd, args.runs)
+            if median is None:
+                print(f"{label:<34} {'n/d':>10}  ({' '.join(error) or 'errore'})")
+            else:
+                print(f"{label:<34} {median * 1000:>8.1f}ms")
+
+    if args.importtime:
+        print()
+        print(f"{'Modulo':<40} {'Cumulativo':>11} {'Proprio':>9}")
+        for cumulative, own, name in import_breakdown("path_analyzer"):
+            print(f"{name.strip():<40} {cumulative / 1000:>9.1f}ms {own / 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Confronto tra due scansioni esportate, prima e dopo una "migrazione" sintetica.
+
+Uso:
+    python benchmarks/bench_diff.py [--entries N] [--format db|csv|ndjson]
+
+La seconda scansione ha una radice più lunga, una cartella rinominata ogni
+dieci di primo livello, un file su 50 rimosso e uno su 33 ingrandito.
+Scansioni e confronto girano in processi separati: la memoria misurata è
+solo quella del confronto (su Linux il massimo di un processo figlio parte
+da quello del padre al momento del fork).
+"""
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_report import SyntheticAnalyzer
+from path_analyzer import EntryInfo
+from path_analyzer.export import export_results
+
+# Eseguito nel processo figlio: confronto e poi memoria massima di quel processo
+CHILD = """
+import sys
+from path_analyzer.diff import main
+main(sys.argv[1:])
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"Memoria massima del confronto: {rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024:.0f}MB")
+except ImportError:
+    pass
+"""
+
+
+class MigratedAnalyzer(SyntheticAnalyzer):
+
+    def _list_directory(self, dir_path):
+        listing = super()._list_directory(dir_path)
+        depth = dir_path.count(os.sep) - self._root_seps
+        entries = []
+        for i, e in enumerate(listing.entries):
+            if e.is_dir:
+                if depth == 0 and i % 10 == 3:
+                    name = e.name.replace("di_prova", "rinominata")
+                    e = EntryInfo(name, os.path.join(dir_path, name), *e[2:])
+            elif i % 50 == 0:
+                continue
+            elif i % 33 == 0:
+                e = e._replace(size=e.size * 2 + 1)
+            entries.append(e)
+        return listing._replace(entries=entries)
+
+
+def export_scans(tmp, entries, fmt):
+    exports = []
+    for cls, name in ((SyntheticAnalyzer, "condivisione"), (MigratedAnalyzer, "nuovo_server_condivisione")):
+        root = os.path.join(tmp, name)
+        os.mkdir(root)
+        analyzer = cls(root, entries, columnar=True, path_limit=120)
+        analyzer.scan()
+        path = os.path.join(tmp, f"{name}.{fmt}")
+        export_results(analyzer, path)
+        exports.append(path)
+        del analyzer
+    return exports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=("db", "csv", "ndjson"), default="db")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            exports = pool.apply(export_scans, (tmp, args.entries, args.format))
+        print(f"Scansioni esportate: {args.entries:,} voci ciascuna ({args.format})")
+
+        changes = os.path.join(tmp, "changes.ndjson")
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", CHILD, *exports, "-o", os.path.join(tmp, "diff.md"),
+                        "--changes", changes, "-l", "120"], check=True,
+                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        elapsed = time.perf_counter() - start
+        with open(changes, encoding="utf-8") as f:
+            count = sum(1 for _ in f)
+        print(f"Confronto: {elapsed:.2f}s, {2 * args.entries / elapsed:,.0f} voci/s, {count:,} differenze")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Esportazione dei risultati in SQLite, CSV e NDJSON su un albero sintetico.
+
+Uso:
+    python benchmarks/bench_export.py [--entries N] [--objects] [--batch N]
+
+Per SQLite misura anche una query tipica sugli indici (path oltre soglia
+per profondità), per controllare che il database sia subito utilizzabile.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_report import SyntheticAnalyzer
+from path_analyzer.export import BATCH, export_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--objects", action="store_true", help="albero a oggetti invece che colonnare")
+    parser.add_argument("--batch", type=int, default=BATCH, help=f"righe per blocco (default: {BATCH})")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "condivisione")
+        os.mkdir(root)
+        analyzer = SyntheticAnalyzer(root, args.entries, columnar=not args.objects, path_limit=120)
+        print(f"Scansione sintetica (~{args.entries:,} voci)...")
+        analyzer.scan()
+
+        print(f"{'Formato':<8} {'Righe':>11} {'Tempo':>8} {'Righe/s':>10} {'File':>9}")
+        for fmt, ext in (("sqlite", ".db"), ("csv", ".csv"), ("ndjson", ".ndjson")):
+            path = os.path.join(tmp, "export" + ext)
+            start = time.perf_counter()
+            rows = export_results(analyzer, path, fmt, args.batch)
+            elapsed = time.perf_counter() - start
+            print(f"{fmt:<8} {rows:>11,} {elapsed:>7.2f}s {rows / elapsed:>10,.0f} {os.path.getsize(path) / 1e6:>7.0f}MB")
+
+        conn = sqlite3.connect(os.path.join(tmp, "export.db"))
+        start = time.perf_counter()
+        result = conn.execute("SELECT depth, COUNT(*) FROM entries WHERE path_length > 120 GROUP BY depth").fetchall()
+        print(f"Query oltre soglia per profondità: {len(result)} righe in {(time.perf_counter() - start) * 1000:.1f}ms")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Piano di rinomina su una cartella piatta enorme (100.000 file di default).
+
+Uso:
+    python benchmarks/bench_plan.py [--files N] [--workdir DIR] [--legacy-max N]
+
+Tutti i file superano la soglia. Due insiemi di regole: abbreviazioni
+(nomi nuovi tutti diversi) e un taglio a 12 caratteri (quasi tutti
+duplicati). Per ciascuno: create_plan dalla scansione e con os.walk,
+entrambi con l'indice dei nomi per cartella. Come riferimento, il
+vecchio controllo dei duplicati (names.count per ogni nome, quadratico)
+sui primi --legacy-max nomi, e una os.path.exists per operazione come
+faceva il vecchio controllo dei conflitti.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import PathAnalyzer, RenameEngine, RenameRule, RuleType
+from synthetic_tree import TreeSpec, default_root, generate
+
+RULE_SETS = {
+    "abbreviazioni": [RenameRule(RuleType.SMART_ABBREVIATE), RenameRule(RuleType.COMPRESS_SEPARATORS, {"char": "_"})],
+    "taglio a 12": [RenameRule(RuleType.TRUNCATE, {"max_chars": 12})],
+}
+
+
+def legacy_duplicates(names):
+    # Il controllo precedente: per ogni nome, un conteggio su tutta la cartella
+    return [n for n in names if names.count(n) > 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--workdir", metavar="DIR", help="dove generare la cartella (default: /dev/shm o temporanea)")
+    parser.add_argument("--legacy-max", type=int, default=20_000, metavar="N",
+                        help="nomi su cui misurare il vecchio controllo quadratico (default: 20000)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="path_analyzer_plan_", dir=args.workdir or default_root())
+    root = os.path.join(workdir, "piatta")
+    try:
+        spec = TreeSpec(breadth=0, depth=0, files=args.files, name_length=(30, 60), over_limit=0)
+        start = time.perf_counter()
+        generate(root, spec)
+        print(f"Cartella con {args.files:,} file generata in {time.perf_counter() - start:.1f}s")
+        limit = len(root) + 20  # ogni file oltre soglia
+
+        analyzer = PathAnalyzer(root, path_limit=limit)
+        start = time.perf_counter()
+        analyzer.scan()
+        print(f"Scansione: {time.perf_counter() - start:.2f}s")
+
+        for label, rules in RULE_SETS.items():
+            print(f"\nRegole: {label}")
+            for source, scan in (("scansione", analyzer), ("os.walk", None)):
+                engine = RenameEngine(root, limit)
+                plan = engine.create_plan(rules, scan=scan)
+                t = engine.phases["plan"]
+                print(f"  Piano da {source:<10} {t.wall:6.2f}s  {len(plan.operations):,} operazioni, "
+                      f"{len(plan.conflicts):,} conflitti ({t.items / t.wall if t.wall else 0:,.0f} op/s)")
+
+            names = [op.new_name.lower() for op in plan.operations[:args.legacy_max]]
+            start = time.perf_counter()
+            legacy_duplicates(names)
+            elapsed = time.perf_counter() - start
+            scale = (len(plan.operations) / len(names)) ** 2 if names else 0
+            print(f"  Riferimento, duplicati con names.count su {len(names):,} nomi: {elapsed:.2f}s "
+                  f"(~{elapsed * scale:,.0f}s stimati su {len(plan.operations):,})")
+            start = time.perf_counter()
+            for op in plan.operations:
+                os.path.exists(op.new_path)
+            print(f"  Riferimento, os.path.exists per operazione: {time.perf_counter() - start:.2f}s "
+                  f"(su tmpfs: su una condivisione di rete ogni chiamata è un round-trip)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
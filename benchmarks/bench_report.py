@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Report Markdown: scrittura in streaming contro documento composto in memoria.
+
+Uso:
+    python benchmarks/bench_report.py [--entries N] [--objects] [--tracemalloc]
+
+L'albero è sintetico (nessun file su disco): lo scanner riceve elenchi di
+directory generati al volo, quindi statistiche e report sono quelli reali.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import EntryInfo, Listing, PathAnalyzer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class SyntheticAnalyzer(PathAnalyzer):
+    # Albero regolare: fanout sottocartelle fino a levels, per_dir file per cartella
+
+    def __init__(self, root_path, entries, fanout=10, **kwargs):
+        super().__init__(root_path, workers=1, **kwargs)
+        dirs, self.levels = 1, 0
+        while dirs * 100 < entries:
+            self.levels += 1
+            dirs += fanout ** self.levels
+        self.fanout = fanout
+        self.per_dir = max(0, -(-entries // dirs) - 1)
+        self._root_seps = self.root_path.count(os.sep)
+
+    def _list_directory(self, dir_path):
+        depth = dir_path.count(os.sep) - self._root_seps
+        entries = []
+        if depth < self.levels:
+            for d in range(self.fanout):
+                name = f"cartella_di_prova_{d:02d}"
+                entries.append(EntryInfo(name, os.path.join(dir_path, name), True, False, 0, 0.0, False))
+        for f in range(self.per_dir):
+            name = f"documento_condiviso_{f:04d}.txt"
+            entries.append(EntryInfo(name, os.path.join(dir_path, name), False, True, f * 37, 1.7e9, False))
+        return Listing(entries, None, 1)
+
+
+def max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+def write_joined(analyzer, path):
+    # Come prima: tutte le righe in una lista, poi un'unica stringa
+    lines = list(analyzer.report_lines())
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def write_streaming(analyzer, path):
+    analyzer.generate_report(path)
+
+
+def measure(analyzer, writer, path, trace):
+    gc.collect()
+    rss_before = max_rss_mb()
+    start = time.perf_counter()
+    writer(analyzer, path)
+    elapsed = time.perf_counter() - start
+    rss_after = max_rss_mb()
+    size = os.path.getsize(path)
+
+    peak = None
+    if trace:
+        # Picco delle allocazioni Python, in un secondo passaggio (tracemalloc rallenta molto)
+        gc.collect()
+        tracemalloc.start()
+        writer(analyzer, path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    rss = rss_after - rss_before if rss_before is not None else None
+    return elapsed, size, peak, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--objects", action="store_true", help="albero a oggetti invece che colonnare")
+    parser.add_argument("--tracemalloc", action="store_true", help="misura anche il picco delle allocazioni Python")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "condivisione")
+        os.mkdir(root)
+        analyzer = SyntheticAnalyzer(root, args.entries, columnar=not args.objects, path_limit=120)
+        print(f"Scansione sintetica (~{args.entries:,} voci)...")
+        start = time.perf_counter()
+        analyzer.scan()
+        entries = analyzer.stats.total_dirs + analyzer.stats.total_files
+        print(f"  {entries:,} voci in {time.perf_counter() - start:.1f}s")
+
+        report = os.path.join(tmp, "report.md")
+        print(f"{'Scrittura':<12} {'Tempo':>8} {'Report':>10} {'MB/s':>8} {'Picco Python':>13} {'Δ RSS max':>10}")
+        # Prima lo streaming: il massimo RSS del processo non può che crescere
+        for label, writer in (("streaming", write_streaming), ("in memoria", write_joined)):
+            elapsed, size, peak, rss = measure(analyzer, writer, report, args.tracemalloc or resource is None)
+            peak_text = f"{peak / 1e6:>11.0f}MB" if peak is not None else f"{'—':>13}"
+            rss_text = f"{rss:>8.0f}MB" if rss is not None else f"{'n/d':>10}"
+            print(f"{label:<12} {elapsed:>7.2f}s {size / 1e6:>8.0f}MB {size / 1e6 / elapsed:>8.1f} {peak_text} {rss_text}")
+
+
+if __name__ == "__main__":
+    main()
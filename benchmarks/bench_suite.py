@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suite di benchmark: scansione, statistiche dei path, report, piano di rinomina,
+esecuzione e rollback su un albero sintetico reale (vedi synthetic_tree.py).
+
+Uso:
+    python benchmarks/bench_suite.py [--output FILE.json] [--workdir DIR] [--keep]
+                                     [--workers N] [--processes N] [--columnar]
+                                     [--phases scan,report,plan,execute,rollback]
+                                     [opzioni dell'albero: --breadth, --depth, --files, ...]
+
+Per ogni fase il file JSON riporta secondi, voci elaborate e voci al
+secondo, picco di RSS durante la fase e chiamate al filesystem (stat,
+scandir, rename, ...) contate avvolgendo le funzioni di os. Le chiamate
+fatte dentro os.DirEntry (is_dir, stat) non passano da os: per la
+scansione c'è anche il conteggio dello scanner (ScanStats.syscalls).
+
+L'albero si genera in un tmpfs (/dev/shm) se disponibile e si cancella
+alla fine, salvo --keep. Esempi:
+
+    python benchmarks/bench_suite.py --breadth 10 --depth 4 --files 90     # ~1M voci
+    python benchmarks/bench_suite.py --breadth 0 --depth 0 --files 100000  # una cartella enorme
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import PathAnalyzer, RenameEngine, RenameRule, RuleType
+from synthetic_tree import add_spec_arguments, default_root, generate, spec_from_args
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ("scan", "report", "plan", "execute", "rollback")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Regole del piano: abbreviazioni e poi un taglio, come una configurazione tipica del wizard
+RULES = [
+    RenameRule(RuleType.SMART_ABBREVIATE),
+    RenameRule(RuleType.COMPRESS_SEPARATORS, {"char": "_"}),
+    RenameRule(RuleType.TRUNCATE, {"max_chars": 40}),
+]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MISURE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PeakMemory:
+    """
+    Picco di RSS durante il blocco, campionato da un thread ogni `interval`
+    secondi da /proc/self/statm. Dove /proc non c'è resta solo il massimo
+    del processo (ru_maxrss), che non si azzera tra una fase e l'altra.
+    """
+
+    STATM = "/proc/self/statm"
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.start_mb = self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._page = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    def _rss_mb(self):
+        try:
+            with open(self.STATM) as f:
+                return int(f.read().split()[1]) * self._page / (1 << 20)
+        except OSError:
+            return None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            rss = self._rss_mb()
+            if rss is not None and rss > self.peak_mb:
+                self.peak_mb = rss
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = self._rss_mb()
+        if self.start_mb is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak_mb = max(self.peak_mb, self._rss_mb() or 0)
+        elif resource is not None:
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak_mb = rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+        return False
+
+
+class SyscallCounter:
+    """Conta le chiamate alle funzioni di os che toccano il filesystem, da tutti i thread."""
+
+    NAMES = ("stat", "lstat", "scandir", "listdir", "open", "mkdir", "rmdir", "remove", "unlink",
+             "rename", "replace")
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._counters = {}
+        self._saved = {}
+
+    def _wrap(self, name, fn):
+        counter = self._counters[name] = itertools.count()
+        tick = counter.__next__  # next() su itertools.count è atomico: niente lock
+
+        def wrapper(*args, **kwargs):
+            tick()
+            return fn(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        if self.enabled:
+            for name in self.NAMES:
+                fn = getattr(os, name, None)
+                if fn is not None:
+                    self._saved[name] = fn
+                    setattr(os, name, self._wrap(name, fn))
+        return self
+
+    def __exit__(self, *exc):
+        for name, fn in self._saved.items():
+            setattr(os, name, fn)
+        self._saved.clear()
+        return False
+
+    def counts(self):
+        # Da chiamare a fine misura: next() restituisce il numero di chiamate fatte finora
+        counts = {name: next(counter) for name, counter in self._counters.items()}
+        return {name: value for name, value in counts.items() if value}
+
+
+def measure(name, fn, items, count_syscalls, **extra):
+    """Esegue fn() e restituisce (risultato, misure della fase); items(risultato) -> voci elaborate."""
+    print(f"  {name}...", end="", flush=True)
+    with SyscallCounter(count_syscalls) as calls, PeakMemory() as memory:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+    count = items(result)
+    phase = {
+        "seconds": round(elapsed, 4),
+        "items": count,
+        "items_per_second": round(count / elapsed) if elapsed > 0 else None,
+        "rss_start_mb": _round(memory.start_mb),
+        "peak_rss_mb": _round(memory.peak_mb),
+    }
+    if count_syscalls:
+        syscalls = calls.counts()
+        phase["syscalls"] = syscalls
+        phase["syscalls_total"] = sum(syscalls.values())
+    phase.update(extra)
+    print(f" {elapsed:.2f}s")
+    return result, phase
+
+
+def _round(value, digits=1):
+    return None if value is None else round(value, digits)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SUITE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def environment(workdir):
+    info = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "workdir": workdir,
+    }
+    try:
+        info["commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                        text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        info["commit"] = None
+    return info
+
+
+def run_suite(args):
+    spec = spec_from_args(args)
+    phases = [p.strip() for p in args.phases.split(",") if p.strip()]
+    unknown = set(phases) - set(PHASES)
+    if unknown:
+        raise SystemExit(f"Fasi sconosciute: {', '.join(sorted(unknown))} (disponibili: {', '.join(PHASES)})")
+    count = not args.no_syscalls
+
+    workdir = tempfile.mkdtemp(prefix="path_analyzer_bench_", dir=args.workdir or default_root())
+    root = os.path.join(workdir, "condivisione")
+    results = {"environment": environment(workdir), "tree": spec.dict(),
+               "options": {"workers": args.workers, "processes": args.processes, "columnar": args.columnar,
+                           "rules": [rule.describe() for rule in RULES], "count_syscalls": count,
+                           "plan_from": "walk" if args.plan_walk else "scan", "minimal": args.minimal,
+                           "rename_workers": args.rename_workers},
+               "phases": {}}
+    out = results["phases"]
+    try:
+        print(f"Albero sintetico (~{spec.expected_entries():,} voci) in {root}")
+        (dirs, files, over), out["generate"] = measure(
+            "generate", lambda: generate(root, spec), lambda r: r[0] + r[1], False)
+        results["tree"].update(created_dirs=dirs, created_files=files, created_over_limit=over)
+
+        # La scansione è sempre necessaria: report e piano lavorano sui suoi risultati
+        analyzer = PathAnalyzer(root, path_limit=spec.limit, workers=args.workers, processes=args.processes,
+                                columnar=args.columnar)
+        path_stats = analyzer.stats.path_stats
+        finalize, timing = path_stats.finalize, {}
+
+        def timed_finalize():
+            # Le statistiche dei path si completano alla fine della scansione: tempo misurato a parte
+            start = time.perf_counter()
+            finalize()
+            timing["seconds"] = time.perf_counter() - start
+        path_stats.finalize = timed_finalize
+
+        _, out["scan"] = measure("scan", analyzer.scan, lambda r: analyzer.stats.total_dirs + analyzer.stats.total_files,
+                                 count)
+        s = analyzer.stats
+        out["scan"].update(scanner_syscalls=s.syscalls, over_limit=len(s.path_stats.over_limit))
+        results["scan_phases"] = s.phases.as_dict()
+        out["path_stats"] = {"seconds": round(timing.get("seconds", 0), 4), "items": s.path_stats.total_paths,
+                             "items_per_second": round(s.path_stats.total_paths / timing["seconds"])
+                             if timing.get("seconds") else None}
+
+        if "report" in phases:
+            report = os.path.join(workdir, "report.md")
+            _, out["report"] = measure("report", lambda: analyzer.generate_report(report),
+                                       lambda r: s.total_dirs + s.total_files, count)
+            size = os.path.getsize(report)
+            out["report"].update(bytes=size, mb_per_second=round(size / (1 << 20) / out["report"]["seconds"], 1))
+
+        engine = RenameEngine(root, spec.limit)
+        if "plan" in phases or "execute" in phases:
+            scan = None if args.plan_walk else analyzer
+            plan, out["plan"] = measure("plan", lambda: engine.create_plan(RULES, only_over_limit=True, scan=scan,
+                                                                                 minimal=args.minimal),
+                                        lambda p: len(p.operations), count)
+            out["plan"].update(conflicts=len(plan.conflicts), total_savings=plan.total_savings,
+                               paths_fixed=plan.paths_fixed, fixed_by_parent=plan.fixed_by_parent,
+                               still_over=plan.still_over)
+        if "execute" in phases:
+            (ok, errors, _), out["execute"] = measure("execute", lambda: engine.execute(workers=args.rename_workers),
+                                                      lambda r: r[0], count)
+            out["execute"]["errors"] = errors
+            if "rollback" in phases:
+                (ok, errors), out["rollback"] = measure("rollback", engine.rollback, lambda r: r[0], count)
+                out["rollback"]["errors"] = errors
+    finally:
+        if args.keep:
+            print(f"Albero conservato in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def print_table(results):
+    print()
+    print(f"{'Fase':<11} {'Tempo':>9} {'Voci':>11} {'Voci/s':>11} {'Picco RSS':>10} {'Chiamate':>10}")
+    for name, phase in results["phases"].items():
+        rate = f"{phase['items_per_second']:,}" if phase.get("items_per_second") else "—"
+        peak = f"{phase['peak_rss_mb']:.0f}MB" if phase.get("peak_rss_mb") is not None else "—"
+        calls = f"{phase['syscalls_total']:,}" if "syscalls_total" in phase else "—"
+        print(f"{name:<11} {phase['seconds']:>8.2f}s {phase['items']:>11,} {rate:>11} {peak:>10} {calls:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help="file JSON dei risultati (default: bench_suite_<data>_<ora>.json)")
+    parser.add_argument("--workdir", metavar="DIR", help="dove generare l'albero (default: /dev/shm o la cartella temporanea)")
+    parser.add_argument("--keep", action="store_true", help="non cancellare l'albero alla fine")
+    parser.add_argument("--phases", default=",".join(PHASES), help=f"fasi da misurare (default: {','.join(PHASES)})")
+    parser.add_argument("--workers", type=int, default=8, metavar="N", help="thread di lettura (default: 8)")
+    parser.add_argument("--processes", type=int, default=1, metavar="N", help="processi di scansione (default: 1)")
+    parser.add_argument("--columnar", action="store_true", help="albero colonnare")
+    parser.add_argument("--plan-walk", action="store_true", help="piano rileggendo il filesystem invece che dalla scansione")
+    parser.add_argument("--minimal", action="store_true", help="piano con il minor numero di rinomine")
+    parser.add_argument("--rename-workers", type=int, default=1, metavar="N",
+                        help="thread per l'esecuzione delle rinomine (default: 1)")
+    parser.add_argument("--no-syscalls", action="store_true", help="non contare le chiamate al filesystem")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    print_table(results)
+    output = args.output or f"bench_suite_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nRisultati: {os.path.abspath(output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memoria per voce: albero a oggetti (DirInfo/FileInfo) contro TreeStore colonnare.
+
+Uso:
+    python benchmarks/bench_tree_memory.py [percorso] [--files N]
+
+Senza percorso genera un albero sintetico di N file in una cartella temporanea.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import PathAnalyzer
+
+
+def make_tree(root, files, per_dir=50, fanout=8):
+    # Albero bilanciato: per_dir file per cartella, fanout sottocartelle per livello
+    dirs, made = [root], 0
+    while made < files:
+        parent = dirs.pop(0)
+        for d in range(fanout):
+            sub = os.path.join(parent, f"cartella_di_prova_{d:02d}")
+            os.makedirs(sub, exist_ok=True)
+            dirs.append(sub)
+            for f in range(min(per_dir, files - made)):
+                with open(os.path.join(sub, f"documento_{f:04d}.txt"), "wb") as fh:
+                    fh.write(b"x" * (f % 7))
+                made += 1
+
+
+def measure(path, columnar):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    analyzer = PathAnalyzer(path, columnar=columnar)
+    analyzer.scan()
+    elapsed = time.perf_counter() - start
+    with_tree, peak = tracemalloc.get_traced_memory()
+
+    # Memoria trattenuta dal solo albero: differenza dopo averlo rilasciato
+    entries = analyzer.stats.total_dirs + analyzer.stats.total_files
+    store = analyzer.store
+    analyzer.root_dir = analyzer.tree = analyzer.store = None
+    analyzer.stats.largest_files = []
+    nbytes = store.nbytes() if store is not None else None
+    del store
+    gc.collect()
+    without_tree, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return entries, elapsed, with_tree - without_tree, peak, nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--files", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            print(f"Generazione albero sintetico ({args.files:,} file)...")
+            make_tree(tmp, args.files)
+            path = tmp
+
+        print(f"{'Albero':<12} {'Voci':>10} {'Tempo':>8} {'Albero B/voce':>14} {'Picco B/voce':>13} {'Colonne B/voce':>15}")
+        for label, columnar in (("oggetti", False), ("colonnare", True)):
+            entries, elapsed, tree, peak, nbytes = measure(path, columnar)
+            cols = f"{nbytes / entries:>15.1f}" if nbytes is not None else f"{'—':>15}"
+            print(f"{label:<12} {entries:>10,} {elapsed:>7.2f}s {tree / entries:>14.1f} {peak / entries:>13.1f} {cols}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Albero sintetico su disco, riproducibile: stessi seme e radice, stessi path.
+
+Uso:
+    python benchmarks/synthetic_tree.py DESTINAZIONE [--breadth N] [--depth N] [--files N]
+                                        [--name-length MIN:MAX] [--over-limit QUOTA] [--limit N]
+                                        [--max-entries N] [--seed N]
+
+Ogni cartella fino a --depth ha --breadth sottocartelle e --files file.
+Le lunghezze dei nomi seguono una triangolare tra MIN e MAX (moda a un
+quarto dell'intervallo: molti nomi corti, pochi lunghi, come nelle
+condivisioni reali). I nomi sono composti da parole di SMART_ABBREV, così
+le regole di rinomina trovano davvero qualcosa da accorciare. Una quota
+--over-limit dei file riceve un nome abbastanza lungo da superare --limit.
+
+Senza destinazione esplicita conviene un tmpfs (/dev/shm su Linux): si
+misura lo scanner e non il disco.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer.rules import SMART_ABBREV
+
+# Nomi di file e cartelle oltre questo limite falliscono su quasi tutti i filesystem
+NAME_MAX = 255
+EXTENSIONS = (".pdf", ".docx", ".xlsx", ".txt", ".jpg", ".png", ".zip", ".csv", ".msg", "")
+
+
+def default_root():
+    # tmpfs se disponibile: niente I/O su disco nelle misure
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class TreeSpec:
+    """Parametri dell'albero; dict() li riporta nei risultati dei benchmark."""
+
+    def __init__(self, breadth=10, depth=3, files=20, name_length=(8, 40), over_limit=0.05, limit=260,
+                 max_entries=None, file_size=0, seed=42):
+        self.breadth = breadth
+        self.depth = depth
+        self.files = files
+        self.name_length = name_length
+        self.over_limit = over_limit
+        self.limit = limit
+        self.max_entries = max_entries
+        self.file_size = file_size
+        self.seed = seed
+
+    def expected_entries(self):
+        dirs = sum(self.breadth ** level for level in range(self.depth + 1))
+        total = dirs - 1 + dirs * self.files
+        return min(total, self.max_entries) if self.max_entries else total
+
+    def dict(self):
+        return {"breadth": self.breadth, "depth": self.depth, "files": self.files,
+                "name_length": list(self.name_length), "over_limit": self.over_limit, "limit": self.limit,
+                "max_entries": self.max_entries, "file_size": self.file_size, "seed": self.seed}
+
+
+class NameMaker:
+
+    WORDS = sorted(SMART_ABBREV)
+
+    def __init__(self, spec):
+        self.rng = random.Random(spec.seed)
+        self.low, self.high = spec.name_length
+
+    def length(self):
+        return int(self.rng.triangular(self.low, self.high, self.low + (self.high - self.low) / 4))
+
+    def name(self, length, index, ext="", tag=""):
+        # Parole separate da "_" fino alla lunghezza voluta, poi un numero per l'unicità
+        suffix = f"_{tag}{index:04d}{ext}"
+        words, size = [], 0
+        while size < length - len(suffix):
+            word = self.rng.choice(self.WORDS)
+            if self.rng.random() < 0.5:
+                word = word.capitalize()
+            words.append(word)
+            size += len(word) + 1
+        base = "_".join(words)[:max(1, length - len(suffix))].rstrip("_") or "x"
+        return base + suffix
+
+
+def generate(root, spec):
+    """
+    Crea l'albero descritto da spec sotto root (che non deve esistere) e
+    restituisce (cartelle, file, file oltre soglia) effettivamente creati.
+    """
+    os.makedirs(root)
+    names = NameMaker(spec)
+    payload = b"x" * spec.file_size
+    dirs = files = over = 0
+    budget = spec.max_entries if spec.max_entries else float("inf")
+    stack = [(root, 0)]
+    while stack and budget > 0:
+        path, level = stack.pop()
+        base = len(path) + 1
+        for i in range(spec.files):
+            if budget <= 0:
+                break
+            ext = names.rng.choice(EXTENSIONS)
+            length = names.length()
+            if names.rng.random() < spec.over_limit:
+                # Abbastanza lungo da superare la soglia, entro il limite del filesystem
+                length = max(length, spec.limit - base + 1 + names.rng.randint(0, 20))
+            name = names.name(min(length, NAME_MAX), i, ext)
+            full = os.path.join(path, name)
+            fd = os.open(full, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            if payload:
+                os.write(fd, payload)
+            os.close(fd)
+            files += 1
+            budget -= 1
+            over += len(full) > spec.limit
+        if level < spec.depth:
+            children = []
+            for i in range(spec.breadth):
+                if budget <= 0:
+                    break
+                sub = os.path.join(path, names.name(min(names.length(), NAME_MAX), i, tag="d"))
+                os.mkdir(sub)
+                dirs += 1
+                budget -= 1
+                children.append((sub, level + 1))
+            stack.extend(reversed(children))
+    return dirs, files, over
+
+
+def parse_range(text):
+    low, _, high = text.partition(":")
+    low, high = int(low), int(high or low)
+    if not 1 <= low <= high:
+        raise argparse.ArgumentTypeError(f"intervallo non valido: {text}")
+    return low, high
+
+
+def add_spec_arguments(parser):
+    group = parser.add_argument_group("albero sintetico")
+    group.add_argument("--breadth", type=int, default=10, metavar="N", help="sottocartelle per cartella (default: 10)")
+    group.add_argument("--depth", type=int, default=3, metavar="N", help="livelli di sottocartelle (default: 3)")
+    group.add_argument("--files", type=int, default=20, metavar="N", help="file per cartella (default: 20)")
+    group.add_argument("--name-length", type=parse_range, default=(8, 40), metavar="MIN:MAX",
+                       help="lunghezza dei nomi (default: 8:40)")
+    group.add_argument("--over-limit", type=float, default=0.05, metavar="QUOTA",
+                       help="quota di file con path oltre --limit (default: 0.05)")
+    group.add_argument("--limit", type=int, default=260, metavar="N", help="soglia dei path (default: 260)")
+    group.add_argument("--max-entries", type=int, metavar="N", help="ferma la generazione dopo N voci")
+    group.add_argument("--file-size", type=int, default=0, metavar="BYTE", help="contenuto di ogni file (default: 0)")
+    group.add_argument("--seed", type=int, default=42, help="seme del generatore (default: 42)")
+    return group
+
+
+def spec_from_args(args):
+    return TreeSpec(args.breadth, args.depth, args.files, args.name_length, args.over_limit, args.limit,
+                    args.max_entries, args.file_size, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", help="cartella da creare (non deve esistere)")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+    print(f"Generazione di ~{spec.expected_entries():,} voci in {args.root}...")
+    start = time.perf_counter()
+    dirs, files, over = generate(args.root, spec)
+    elapsed = time.perf_counter() - start
+    print(f"{dirs:,} cartelle, {files:,} file ({over:,} oltre {spec.limit}) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
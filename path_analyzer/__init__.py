@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Path Analyzer — motore di scansione, senza interfaccia grafica.
+
+Usato da path_analyzer_gui.py, path_analyzer_editor.py e dalla riga di comando:
+
+    python -m path_analyzer <percorso> [opzioni]
+
+AsyncPathAnalyzer, ScanSnapshot, gli esportatori e il confronto si
+caricano al primo accesso: asyncio e sqlite3 non pesano sull'avvio di
+chi non li usa.
+"""
+
+from .listing import ListingPool, read_entry
+from .models import (DirInfo, DirSummary, EntryInfo, FileInfo, Listing, PathLengthStats,
+                     ScanFrame, ScanStats, TopK)
+from .rename import RenameEngine, RenameOperation, RenamePlan
+from .rules import SMART_ABBREV, RenameRule, RuleProcessor, RuleType
+from .scanner import CHECKPOINT_VERSION, DEFAULT_CHECKPOINT_DIR, PathAnalyzer, default_checkpoint_path
+from .timing import PhaseTimes, PhaseTiming
+from .tree import NodeView, ObjectTree, TreeStore
+from .utils import format_date, format_size, get_file_icon, get_path_length_range, write_lines
+
+_LAZY = {
+    "AsyncPathAnalyzer": "aio",
+    "ScanSnapshot": "snapshot",
+    "DEFAULT_SNAPSHOT_DB": "snapshot",
+    "export_results": "export",
+    "export_sqlite": "export",
+    "export_csv": "export",
+    "export_ndjson": "export",
+    "diff_scans": "diff",
+    "ScanDiff": "diff",
+}
+
+__all__ = [
+    "PathAnalyzer", "AsyncPathAnalyzer", "ScanSnapshot", "DEFAULT_SNAPSHOT_DB",
+    "CHECKPOINT_VERSION", "DEFAULT_CHECKPOINT_DIR", "default_checkpoint_path",
+    "DirInfo", "FileInfo", "DirSummary", "EntryInfo", "Listing", "ScanFrame",
+    "PathLengthStats", "ScanStats", "PhaseTimes", "PhaseTiming", "TopK", "ObjectTree", "TreeStore", "NodeView",
+    "RuleType", "RenameRule", "RuleProcessor", "SMART_ABBREV", "RenameEngine", "RenameOperation", "RenamePlan",
+    "ListingPool", "read_entry", "format_size", "format_date", "get_file_icon", "get_path_length_range",
+    "write_lines", "export_results", "export_sqlite", "export_csv", "export_ndjson", "diff_scans", "ScanDiff",
+]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
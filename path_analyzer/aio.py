@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Scanner asyncio (modulo separato: asyncio pesa sull'avvio della riga di comando)."""
+
+import asyncio
+import time
+from concurrent.futures import CancelledError as FutureCancelled
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .models import DirInfo, Listing
+from .scanner import PathAnalyzer
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCANNER ASINCRONO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AsyncPathAnalyzer(PathAnalyzer):
+    """
+    Variante asyncio di PathAnalyzer.
+
+    Le letture delle directory (os.scandir + stat) passano da un executor
+    sotto un semaforo asyncio: al file server non arrivano mai più di
+    max_in_flight letture contemporanee. Passando lo stesso semaforo a più
+    istanze il limite vale per tutte le radici scansionate dallo stesso loop:
+
+        sem = asyncio.Semaphore(8)
+        roots = await asyncio.gather(*(AsyncPathAnalyzer(p, semaphore=sem).scan() for p in paths))
+
+    Le letture avviate e non ancora consumate dal costruttore dell'albero
+    sono al massimo read_ahead (default 4 × max_in_flight): le sottocartelle
+    scoperte aspettano in uno stack, nell'ordine in cui serviranno, e la
+    memoria non cresce con il numero di cartelle della share.
+
+    L'albero viene costruito da un thread dedicato nello stesso ordine della
+    scansione seriale, quindi DirInfo e ScanStats sono identici a PathAnalyzer.
+    Il progresso si legge con `async for dirs, files in analyzer.progress()`.
+    """
+
+    def __init__(self, root_path, max_depth=-1, exclude_dirs=None,
+                 show_hidden=True, top_n_files=15, path_limit=260,
+                 max_in_flight=8, semaphore=None, executor=None, columnar=False, read_ahead=None,
+                 top_n_paths=10, top_n_deep_dirs=10, top_n_large_dirs=10,
+                 snapshot=None, incremental=False, checkpoint=None, checkpoint_interval=60.0,
+                 on_entry=None):
+        super().__init__(root_path, max_depth=max_depth, exclude_dirs=exclude_dirs,
+                         show_hidden=show_hidden, top_n_files=top_n_files, path_limit=path_limit,
+                         progress_callback=self._post_progress, columnar=columnar,
+                         top_n_paths=top_n_paths, top_n_deep_dirs=top_n_deep_dirs,
+                         top_n_large_dirs=top_n_large_dirs, snapshot=snapshot, incremental=incremental,
+                         checkpoint=checkpoint, checkpoint_interval=checkpoint_interval,
+                         on_entry=on_entry)
+        self.max_in_flight = max_in_flight
+        self.read_ahead = max(1, read_ahead or 4 * max_in_flight)
+        self.semaphore = semaphore
+        self.executor = executor
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._listings: dict = {}   # letture avviate e non ancora consumate
+        self._pending: list = []    # (path, depth) scoperte, da avviare: in cima la prossima richiesta
+        self._started: set = set()  # avviate su richiesta prima di uscire da _pending
+        self._progress_queue: Optional[asyncio.Queue] = None
+
+    async def scan(self) -> Optional[DirInfo]:
+        self.stats.scan_start = time.time()
+        return await self._run_async()
+
+    async def resume(self, checkpoint) -> Optional[DirInfo]:
+        stack = self._restore_checkpoint(checkpoint)
+        return await self._run_async(stack)
+
+    async def _run_async(self, stack=None):
+        self._cancel = False
+        self._check_root()
+        self._next_checkpoint = time.monotonic() + self.checkpoint_interval
+
+        self._loop = asyncio.get_running_loop()
+        self._limit = self.semaphore or asyncio.Semaphore(self.max_in_flight)
+        progress = self._progress()
+        self._open_snapshot()
+        if stack:
+            self._pending.extend(reversed(self._pending_dirs(stack)))
+        else:
+            self._pending.append((self.root_path, 0))
+        self._fill_listings()
+        # Thread riservato: il builder resta in attesa delle letture e non deve
+        # occupare i thread dell'executor che le esegue.
+        builder = ThreadPoolExecutor(max_workers=1)
+        # Tempi della visita misurati nel thread del builder (vedi PathAnalyzer._timed_visit)
+        if stack:
+            visit = builder.submit(self._timed_visit, self._walk, stack)
+        else:
+            visit = builder.submit(self._timed_visit, self._scan_directory, self.root_path, 0)
+        try:
+            try:
+                self.root_dir = await asyncio.wrap_future(visit)
+            except asyncio.CancelledError:
+                # Anche annullata dall'esterno (task.cancel()): il builder si ferma
+                # come con cancel() e salva il checkpoint; lo snapshot si chiude dopo
+                external = not self._cancel
+                self._cancel = True
+                self._cancel_listings()
+                await self._wait_builder(visit)
+                if external:
+                    raise
+            if not self._cancel and stack is None:
+                self._save_snapshot()
+        finally:
+            self._cancel_listings()
+            builder.shutdown(wait=False)
+            self._close_snapshot()
+            progress.put_nowait(None)
+
+        if self._cancel:
+            return None
+
+        self.stats.scan_end = time.time()
+        with self.stats.phases.measure("stats"):
+            self.stats.finalize()
+        self._remove_checkpoint()
+        return self.root_dir
+
+    def cancel(self):
+        # Thread-safe: annulla le letture in corso, il builder si ferma alla prossima
+        self._cancel = True
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._cancel_listings)
+
+    async def progress(self):
+        queue_ = self._progress()
+        while True:
+            item = await queue_.get()
+            if item is None:
+                return
+            yield item
+
+    # ─── Letture Asincrone ───────────────────────────────────────────────
+
+    def _start_listing(self, dir_path, depth):
+        task = self._listings[dir_path] = asyncio.ensure_future(self._fetch_listing(dir_path, depth))
+        return task
+
+    def _fill_listings(self):
+        # Avvia le sottocartelle in attesa finché c'è posto nella lettura anticipata
+        while self._pending and len(self._listings) < self.read_ahead:
+            dir_path, depth = self._pending.pop()
+            if dir_path in self._started:
+                self._started.discard(dir_path)  # già letta su richiesta del builder
+                continue
+            self._start_listing(dir_path, depth)
+
+    async def _fetch_listing(self, dir_path, depth):
+        async with self._limit:
+            listing = await self._loop.run_in_executor(self.executor, self._read_listing, dir_path)
+        # Le sottocartelle partono prima che il builder consumi questa lettura,
+        # entro read_ahead: in cima allo stack la prima, che servirà per prima
+        self._pending.extend(reversed(self._subdirs_to_scan(listing, depth)))
+        self._fill_listings()
+        return listing
+
+    async def _take_listing(self, dir_path, depth):
+        if self._cancel:
+            return Listing(None, None, 0)
+        task = self._listings.pop(dir_path, None)
+        if task is None:
+            # Non ancora avviata (lettura anticipata piena): parte subito, fuori dal conteggio
+            self._started.add(dir_path)
+            task = asyncio.ensure_future(self._fetch_listing(dir_path, depth))
+            self._listings[None] = task  # annullabile come le altre finché non finisce
+            try:
+                return await task
+            finally:
+                self._listings.pop(None, None)
+        self._fill_listings()
+        return await task
+
+    def _cancel_listings(self):
+        for task in self._listings.values():
+            task.cancel()
+        self._listings.clear()
+        self._pending.clear()
+        self._started.clear()
+
+    @staticmethod
+    async def _wait_builder(visit):
+        # Il builder finisce la cartella in corso e scrive il checkpoint.
+        # Un altro task.cancel() non interrompe l'attesa
+        while not visit.done():
+            try:
+                await asyncio.wrap_future(visit)
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                break
+
+    def _read_entries(self, dir_path, depth):
+        # Chiamato dal thread del builder
+        try:
+            return asyncio.run_coroutine_threadsafe(self._take_listing(dir_path, depth), self._loop).result()
+        except (asyncio.CancelledError, FutureCancelled):
+            if not self._cancel:
+                raise
+            return Listing(None, None, 0)  # scartata: il builder si ferma e salva il checkpoint
+
+    def _progress(self):
+        # La coda nasce dentro il loop (su Python 3.8/3.9 si lega al loop corrente)
+        if self._progress_queue is None:
+            self._progress_queue = asyncio.Queue()
+        return self._progress_queue
+
+    def _post_progress(self, dirs, files):
+        self._loop.call_soon_threadsafe(self._progress_queue.put_nowait, (dirs, files))
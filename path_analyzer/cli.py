@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Riga di comando: scansione senza GUI, voci in NDJSON su stdout, report Markdown.
+
+    python -m path_analyzer "\\\\server\\share\\Progetti" --limit 240 --ndjson over-limit
+
+Ogni riga NDJSON è un oggetto {"type", "path", "length", "depth", "over_limit"}
+(più "size" per i file), emesso durante la visita nello stesso ordine del
+report. Riepilogo e progresso vanno su stderr, così stdout resta leggibile
+da un altro programma.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import signal
+import sys
+
+from .scanner import PathAnalyzer, default_checkpoint_path
+from .utils import EXPORT_FORMATS, format_size
+
+DEFAULT_EXCLUDE = ".git, node_modules, __pycache__, .vs, .vscode"
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_CANCELLED = 130
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m path_analyzer",
+        description="Analizza la struttura di una directory senza interfaccia grafica.",
+    )
+    parser.add_argument("path", help="cartella da analizzare (locale o UNC)")
+
+    scan = parser.add_argument_group("scansione")
+    scan.add_argument("-l", "--limit", type=int, default=260, metavar="N",
+                      help="soglia di lunghezza dei path in caratteri (default: 260)")
+    scan.add_argument("-d", "--depth", type=int, default=-1, metavar="N",
+                      help="profondità massima, -1 = illimitata (default: -1)")
+    scan.add_argument("-e", "--exclude", action="append", metavar="NOMI",
+                      help=f"cartelle da escludere, separate da virgola; ripetibile "
+                           f"(default: {DEFAULT_EXCLUDE!r}, '' per nessuna)")
+    scan.add_argument("--no-hidden", dest="show_hidden", action="store_false",
+                      help="salta file e cartelle nascosti")
+    scan.add_argument("--top", type=int, default=15, metavar="N",
+                      help="numero di file più grandi nel report (default: 15)")
+    scan.add_argument("-w", "--workers", type=int, default=8, metavar="N",
+                      help="thread di lettura delle directory (default: 8)")
+    scan.add_argument("-p", "--processes", type=int, default=1, metavar="N",
+                      help="processi di scansione, uno per sotto-albero di primo livello (default: 1)")
+    scan.add_argument("--columnar", action="store_true",
+                      help="albero colonnare compatto, per scansioni molto grandi")
+
+    state = parser.add_argument_group("snapshot e ripresa")
+    state.add_argument("--snapshot", nargs="?", const="", metavar="DB",
+                       help="salva la scansione in uno snapshot SQLite (default: ~/.path_analyzer/snapshots.db)")
+    state.add_argument("--incremental", action="store_true",
+                       help="rilegge solo le cartelle modificate dall'ultimo snapshot")
+    state.add_argument("--checkpoint", nargs="?", const="", metavar="FILE",
+                       help="salva periodicamente lo stato della visita (default: ~/.path_analyzer/checkpoints/)")
+    state.add_argument("--checkpoint-interval", type=float, default=60.0, metavar="SEC",
+                       help="secondi tra due checkpoint, di più se il salvataggio è lento (default: 60)")
+    state.add_argument("--resume", action="store_true",
+                       help="riprende dal checkpoint, se esiste (implica --checkpoint)")
+
+    out = parser.add_argument_group("output")
+    out.add_argument("--ndjson", choices=("all", "over-limit", "none"),
+                     help="voci da scrivere su stdout durante la scansione (default: over-limit, none con --tree)")
+    out.add_argument("--tree", choices=("clean", "detail"),
+                     help="a fine scansione scrive su stdout l'albero, vista pulita o dettagliata")
+    out.add_argument("-o", "--report", metavar="FILE",
+                     help="file del report: Markdown, o HTML con estensione .html "
+                          "(default: path_report_<data>_<ora>.md)")
+    out.add_argument("--no-report", action="store_true", help="non scrivere il report Markdown")
+    out.add_argument("--shard-size", type=float, metavar="MB",
+                     help="report a pezzi: -o è una cartella con un riepilogo e, per ogni cartella "
+                          "di primo livello, albero e indice in file da al massimo MB megabyte")
+    out.add_argument("--shard-processes", type=int, metavar="N",
+                     help="processi per il report a pezzi (default: uno per CPU)")
+    out.add_argument("--export", action="append", metavar="FILE",
+                     help="esporta una riga per voce; formato dall'estensione "
+                          "(.db/.sqlite, .csv, .ndjson/.jsonl); ripetibile")
+    out.add_argument("--compare", metavar="FILE",
+                     help="confronta con una scansione esportata in precedenza (.db, .csv, .ndjson): "
+                          "sezione in più nel report")
+    out.add_argument("--changes", metavar="FILE",
+                     help="con --compare, scrive una riga NDJSON per ogni differenza")
+    out.add_argument("-q", "--quiet", action="store_true", help="niente progresso né riepilogo su stderr")
+    return parser
+
+
+def parse_exclude(values):
+    if values is None:
+        values = [DEFAULT_EXCLUDE]
+    return [name.strip() for value in values for name in value.split(",") if name.strip()]
+
+
+class NdjsonWriter:
+    """Scrive su stdout le voci ricevute da PathAnalyzer.on_entry."""
+
+    def __init__(self, stream, path_limit, over_limit_only):
+        self.stream = stream
+        self.path_limit = path_limit
+        self.over_limit_only = over_limit_only
+        self.broken = False
+        self.on_broken = None
+
+    def __call__(self, ptype, path, length, depth, size):
+        over = length > self.path_limit
+        if self.broken or (self.over_limit_only and not over):
+            return
+        record = {"type": "dir" if ptype == "DIR" else "file", "path": path,
+                  "length": length, "depth": depth, "over_limit": over}
+        if size is not None:
+            record["size"] = size
+        try:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except BrokenPipeError:
+            self._broken()
+
+    def flush(self):
+        # Chiamata col progresso: le righe arrivano a blocchi, non una write per voce
+        if not self.broken:
+            try:
+                self.stream.flush()
+            except BrokenPipeError:
+                self._broken()
+
+    def _broken(self):
+        # Chi legge ha chiuso la pipe (es. `| head`): inutile proseguire
+        self.broken = True
+        if self.on_broken:
+            self.on_broken()
+
+
+def _configure_streams():
+    # I nomi non decodificabili (surrogati) diventano escape \udcXX: JSON valido
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, "reconfigure"):
+            if stream is sys.stdout:
+                stream.reconfigure(encoding="utf-8", errors="backslashreplace")
+            else:
+                stream.reconfigure(errors="backslashreplace")
+
+
+def _silence_stdout():
+    # Nessun altro output su una pipe chiusa, nemmeno alla chiusura dell'interprete
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for path in args.export or ():
+        if os.path.splitext(path)[1].lower() not in EXPORT_FORMATS:
+            parser.error(f"--export {path}: estensione non riconosciuta ({', '.join(EXPORT_FORMATS)})")
+    if args.compare and os.path.splitext(args.compare)[1].lower() not in EXPORT_FORMATS:
+        parser.error(f"--compare {args.compare}: estensione non riconosciuta ({', '.join(EXPORT_FORMATS)})")
+    if args.changes and not args.compare:
+        parser.error("--changes richiede --compare")
+    if args.shard_size is not None and args.shard_size <= 0:
+        parser.error("--shard-size deve essere maggiore di zero")
+    if args.ndjson is None:
+        args.ndjson = "none" if args.tree else "over-limit"
+    elif args.tree and args.ndjson != "none":
+        parser.error("--tree e --ndjson scrivono entrambi su stdout: usare --ndjson none")
+    _configure_streams()
+    log = (lambda text: None) if args.quiet else (lambda text: print(text, file=sys.stderr))
+    error = lambda text: print(text, file=sys.stderr)  # anche con --quiet
+    show_progress = not args.quiet and sys.stderr.isatty()
+
+    writer = None
+    if args.ndjson != "none":
+        writer = NdjsonWriter(sys.stdout, args.limit, args.ndjson == "over-limit")
+
+    def on_progress(dirs, files):
+        if writer:
+            writer.flush()
+        if show_progress:
+            sys.stderr.write(f"\r  {dirs:,} cartelle, {files:,} file...")
+            sys.stderr.flush()
+
+    snapshot = args.snapshot
+    if snapshot == "" or (snapshot is None and args.incremental):
+        from .snapshot import DEFAULT_SNAPSHOT_DB
+        snapshot = DEFAULT_SNAPSHOT_DB
+    checkpoint = args.checkpoint
+    if checkpoint == "" or (checkpoint is None and args.resume):
+        checkpoint = default_checkpoint_path(args.path)
+
+    analyzer = PathAnalyzer(
+        args.path, max_depth=args.depth, exclude_dirs=parse_exclude(args.exclude),
+        show_hidden=args.show_hidden, top_n_files=args.top, path_limit=args.limit,
+        progress_callback=on_progress, workers=args.workers, processes=args.processes,
+        columnar=args.columnar, snapshot=snapshot, incremental=args.incremental,
+        checkpoint=checkpoint, checkpoint_interval=args.checkpoint_interval,
+        on_entry=writer,
+    )
+    if writer:
+        writer.on_broken = analyzer.cancel
+
+    # Ctrl+C: la visita si ferma alla prossima voce (e salva il checkpoint)
+    previous = signal.signal(signal.SIGINT, lambda signum, frame: analyzer.cancel())
+    try:
+        if args.resume and os.path.exists(checkpoint):
+            log(f"Ripresa da {checkpoint}")
+            root = analyzer.resume(checkpoint)
+        else:
+            root = analyzer.scan()
+    except (OSError, ValueError) as e:
+        error(f"Errore: {e}")
+        return EXIT_ERROR
+    finally:
+        signal.signal(signal.SIGINT, previous)
+        if show_progress:
+            sys.stderr.write("\n")
+
+    if writer and writer.broken:
+        _silence_stdout()
+        return EXIT_ERROR
+    if root is None:
+        log("Scansione annullata." + (f" Checkpoint: {checkpoint}" if checkpoint else ""))
+        return EXIT_CANCELLED
+    if writer:
+        writer.flush()
+
+    s = analyzer.stats
+    log(f"Scansione completata in {s.scan_end - s.scan_start:.2f}s: "
+        f"{s.total_dirs:,} cartelle, {s.total_files:,} file, {format_size(s.total_size)}, "
+        f"{len(s.path_stats.over_limit):,} path oltre {args.limit} caratteri")
+    if s.errors:
+        log(f"{len(s.errors):,} cartelle non leggibili (dettagli nel report)")
+
+    if args.tree:
+        tree = analyzer.iter_clean_tree if args.tree == "clean" else analyzer.iter_detail_tree
+        try:
+            for line in tree(analyzer.root_dir):
+                sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+        except BrokenPipeError:
+            _silence_stdout()
+            return EXIT_ERROR
+
+    for path in args.export or ():
+        import sqlite3
+        from .export import export_results
+        try:
+            rows = export_results(analyzer, path)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            error(f"Errore nell'esportazione {path}: {e}")
+            return EXIT_ERROR
+        log(f"Esportazione: {os.path.abspath(path)} ({rows:,} voci)")
+
+    if args.compare:
+        # Un'esportazione SQLite appena scritta è già leggibile in ordine: si confronta quella
+        current = next((p for p in args.export or () if EXPORT_FORMATS[os.path.splitext(p)[1].lower()] == "sqlite"),
+                       analyzer)
+        import sqlite3
+        from .diff import diff_scans
+        try:
+            analyzer.scan_diff = diff_scans(args.compare, current, args.changes, args.limit)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            error(f"Errore nel confronto: {e}")
+            return EXIT_ERROR
+        d = analyzer.scan_diff
+        log(f"Confronto con {args.compare}: {d.total_changes:,} differenze "
+            f"({', '.join(f'{n:,} {kind}' for kind, n in d.counts.items() if n)}), "
+            f"{d.newly_over:,} nuovi path oltre {args.limit} caratteri")
+
+    if not args.no_report:
+        stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        try:
+            if args.shard_size:
+                report = analyzer.generate_sharded_report(args.report or f"path_report_{stamp}",
+                                                          int(args.shard_size * 1024 * 1024), args.shard_processes)
+            else:
+                report = args.report or f"path_report_{stamp}.md"
+                analyzer.generate_report(report)
+        except OSError as e:
+            error(f"Errore nella scrittura del report: {e}")
+            return EXIT_ERROR
+        log(f"Report: {os.path.abspath(report)}")
+
+    # Tempo reale contro CPU per fase (anche nel JSON accanto al report)
+    log("Tempi per fase:")
+    for line in analyzer.stats.phases.log_lines():
+        log(f"  {line}")
+    return EXIT_OK
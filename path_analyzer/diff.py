@@ -0,0 +1,466 @@
+# -*- coding: utf-8 -*-
+"""
+Confronto tra due scansioni salvate (esportazioni SQLite, CSV o NDJSON).
+
+    python -m path_analyzer "\\\\nuovo\\share" --export dopo.db --compare prima.db
+    python -m path_analyzer.diff prima.db dopo.db -o confronto.md --changes modifiche.ndjson
+
+Le voci si confrontano per percorso relativo alla radice, quindi le due
+scansioni possono avere radici diverse (prima e dopo una migrazione).
+Entrambe si leggono ordinate per (cartella, nome) e si uniscono in un
+solo passaggio: SQLite ordina su disco, e in memoria restano solo i
+figli di una cartella alla volta e le classifiche del riepilogo.
+
+Cambiamenti riconosciuti:
+    added / removed     voce presente in una sola scansione
+    renamed             rimossa e aggiunta nella stessa cartella con tipo,
+                        dimensione e data (o numero di file) uguali
+    moved               voce dentro una cartella rinominata; il contenuto
+                        non si confronta voce per voce, la coppia di
+                        cartelle ha già gli stessi totali
+    modified            stesso percorso, dimensione o data diverse (per le
+                        cartelle: totali del sotto-albero)
+    limit               nessun'altra differenza, ma il path ha attraversato
+                        la soglia (es. radice più lunga dopo la migrazione)
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from itertools import groupby
+
+from .export import BATCH, _batches, export_sqlite
+from .models import TopK
+from .utils import EXPORT_FORMATS, FOLDER_ICON, format_date, format_size
+
+KINDS = ("added", "removed", "renamed", "moved", "modified", "limit")
+TOP = 50
+
+# Posizioni nelle righe lette da _Scan.groups()
+NAME, TYPE, SIZE, FILES, MODIFIED, LENGTH = range(1, 7)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCANSIONI SALVATE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _Scan:
+    """Una scansione da confrontare: database SQLite in sola lettura, radice e parametri."""
+
+    QUERY = ("SELECT substr(path, 1, length(path) - length(name)) AS parent, name, type, size, files,"
+             " modified, path_length FROM entries WHERE parent_id IS NOT NULL ORDER BY parent, name")
+
+    def __init__(self, source, tmp_dir, label):
+        if hasattr(source, "root_dir"):
+            # Scansione in memoria: passa da un database temporaneo, così si legge ordinata
+            db_path = os.path.join(tmp_dir, f"{label}.db")
+            export_sqlite(source, db_path)
+        else:
+            fmt = EXPORT_FORMATS.get(os.path.splitext(source)[1].lower())
+            if fmt is None:
+                raise ValueError(f"Formato della scansione non riconosciuto: {source} "
+                                 f"(estensioni: {', '.join(EXPORT_FORMATS)})")
+            if not os.path.isfile(source):
+                raise FileNotFoundError(f"Scansione non trovata: {source}")
+            db_path = source
+            if fmt != "sqlite":
+                db_path = os.path.join(tmp_dir, f"{label}.db")
+                _import_text(source, fmt, db_path)
+        self.source = source if isinstance(source, str) else source.root_path
+        self.conn = sqlite3.connect(f"file:{_uri_path(db_path)}?mode=ro", uri=True)
+        self.conn.execute("PRAGMA temp_store=FILE")
+
+        row = self.conn.execute("SELECT id, path, size, files FROM entries WHERE parent_id IS NULL").fetchone()
+        if row is None:
+            raise ValueError(f"Scansione senza radice: {self.source}")
+        root_id, self.root, self.total_size, self.total_files = row
+        child = self.conn.execute("SELECT path, name FROM entries WHERE parent_id = ? LIMIT 1", (root_id,)).fetchone()
+        self.prefix = child[0][:len(child[0]) - len(child[1])] if child else os.path.join(self.root, "")
+        self.sep = self.prefix[-1:] or os.sep
+
+        self.info = {}
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'scan'").fetchone():
+            self.info = dict(self.conn.execute("SELECT key, value FROM scan"))
+        self.entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def groups(self):
+        # (cartella relativa, righe dei figli ordinate per nome), cartelle in ordine di percorso
+        skip = len(self.prefix)
+        for parent, rows in groupby(self.conn.execute(self.QUERY), key=lambda row: row[0]):
+            yield parent[skip:], list(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+def _uri_path(path):
+    path = os.path.abspath(path).replace("\\", "/").replace("?", "%3f").replace("#", "%23")
+    return path if path.startswith("/") else "/" + path
+
+
+def _import_text(path, fmt, db_path):
+    # CSV e NDJSON non si possono leggere ordinati: si caricano in un database temporaneo
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("CREATE TABLE entries (id INTEGER PRIMARY KEY, parent_id INTEGER, type TEXT, name TEXT,"
+                     " path TEXT, size INTEGER, files INTEGER, modified REAL, path_length INTEGER)")
+        with open(path, encoding="utf-8", newline="" if fmt == "csv" else None) as f:
+            if fmt == "csv":
+                import csv
+                records = csv.DictReader(f)
+            else:
+                records = (json.loads(line) for line in f if line.strip())
+            rows = ((_number(r["id"]), _number(r["parent_id"]), r["type"], r["name"], r["path"],
+                     _number(r["size"]), _number(r["files"]), _number(r["modified"], float),
+                     _number(r["path_length"])) for r in records)
+            with conn:
+                for chunk in _batches(rows, BATCH):
+                    conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", chunk)
+    finally:
+        conn.close()
+
+
+def _number(value, kind=int):
+    # Nel CSV tutto è testo e il valore assente è la stringa vuota
+    if value is None or value == "":
+        return None
+    return kind(value)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFRONTO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Change:
+    """Una differenza tra le due scansioni; path è quello nuovo (il vecchio per removed)."""
+
+    __slots__ = ("kind", "type", "path", "old_path", "old_size", "size", "old_length", "length")
+
+    def __init__(self, kind, type, path, old_path, old_size, size, old_length, length):
+        self.kind = kind
+        self.type = type
+        self.path = path
+        self.old_path = old_path
+        self.old_size = old_size
+        self.size = size
+        self.old_length = old_length
+        self.length = length
+
+    def as_dict(self, limit):
+        record = {"change": self.kind, "type": self.type, "path": self.path}
+        if self.old_path is not None:
+            record["old_path"] = self.old_path
+        record.update(old_size=self.old_size, size=self.size, old_length=self.old_length, length=self.length,
+                      newly_over_limit=self.newly_over(limit), no_longer_over_limit=self.no_longer_over(limit))
+        return record
+
+    def newly_over(self, limit):
+        return self.length is not None and self.length > limit and (self.old_length is None or self.old_length <= limit)
+
+    def no_longer_over(self, limit):
+        # Solo voci ancora presenti: una voce rimossa non "rientra" nella soglia
+        return self.old_length is not None and self.old_length > limit and self.length is not None \
+            and self.length <= limit
+
+
+def _merge(old, new, key):
+    # Unione di due sequenze ordinate per key: coppie (vecchio, nuovo), None dal lato mancante
+    old, new = iter(old), iter(new)
+    a, b = next(old, None), next(new, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and key(a) < key(b)):
+            yield a, None
+            a = next(old, None)
+        elif a is None or key(b) < key(a):
+            yield None, b
+            b = next(new, None)
+        else:
+            yield a, b
+            a, b = next(old, None), next(new, None)
+
+
+def _signature(row):
+    # Rinomina riconosciuta solo se il contenuto coincide
+    if row[TYPE] == "dir":
+        return ("dir", row[SIZE], row[FILES])
+    return ("file", row[SIZE], row[MODIFIED])
+
+
+def _renamed_ancestor(parent, renamed, sep):
+    # Prefisso (con separatore finale) della cartella rinominata che contiene parent
+    if not renamed:
+        return None
+    i = parent.find(sep)
+    while i >= 0:
+        if parent[:i + 1] in renamed:
+            return parent[:i + 1]
+        i = parent.find(sep, i + 1)
+    return None
+
+
+def iter_changes(old, new, limit):
+    """
+    Differenze tra due _Scan in un solo passaggio, cartella per cartella.
+    limit serve solo a riconoscere i path che attraversano la soglia.
+    """
+    renamed_old = {}      # prefisso vecchio -> prefisso nuovo delle cartelle rinominate
+    renamed_new = set()
+    sep = old.sep
+    new_base = len(new.prefix)  # lunghezza del path = radice nuova + percorso relativo
+    by_name = lambda row: row[NAME]
+
+    for (old_group, new_group) in _merge(old.groups(), new.groups(), key=lambda g: g[0]):
+        parent = (old_group or new_group)[0]
+        old_rows = old_group[1] if old_group else ()
+        new_rows = new_group[1] if new_group else ()
+
+        # Dentro una cartella rinominata: spostate con lei, senza confronto
+        moved_from = _renamed_ancestor(parent, renamed_old, sep)
+        if moved_from is not None:
+            target = renamed_old[moved_from] + parent[len(moved_from):]
+            for row in old_rows:
+                path = target + row[NAME]
+                yield Change("moved", row[TYPE], path, parent + row[NAME], row[SIZE], row[SIZE],
+                             row[LENGTH], new_base + len(path))
+            old_rows = ()
+        if new_rows and _renamed_ancestor(parent, renamed_new, sep) is not None:
+            new_rows = ()
+
+        removed, added = [], []
+        for a, b in _merge(old_rows, new_rows, by_name):
+            if b is None:
+                removed.append(a)
+            elif a is None:
+                added.append(b)
+            elif (a[TYPE] != b[TYPE] or a[SIZE] != b[SIZE]
+                  or (a[MODIFIED] != b[MODIFIED] if a[TYPE] == "file" else a[FILES] != b[FILES])):
+                yield Change("modified", b[TYPE], parent + b[NAME], None, a[SIZE], b[SIZE], a[LENGTH], b[LENGTH])
+            elif (a[LENGTH] > limit) != (b[LENGTH] > limit):
+                yield Change("limit", b[TYPE], parent + b[NAME], None, a[SIZE], b[SIZE], a[LENGTH], b[LENGTH])
+
+        if removed and added:
+            candidates = {}
+            for row in reversed(removed):
+                candidates.setdefault(_signature(row), []).append(row)
+            unmatched = []
+            for b in added:
+                same = candidates.get(_signature(b))
+                if not same:
+                    unmatched.append(b)
+                    continue
+                a = same.pop()
+                if a[TYPE] == "dir":
+                    renamed_old[parent + a[NAME] + sep] = parent + b[NAME] + sep
+                    renamed_new.add(parent + b[NAME] + sep)
+                yield Change("renamed", b[TYPE], parent + b[NAME], parent + a[NAME], a[SIZE], b[SIZE],
+                             a[LENGTH], b[LENGTH])
+            removed = [row for rows in candidates.values() for row in rows]
+            removed.sort(key=by_name)
+            added = unmatched
+
+        for a in removed:
+            yield Change("removed", a[TYPE], parent + a[NAME], None, a[SIZE], None, a[LENGTH], None)
+        for b in added:
+            yield Change("added", b[TYPE], parent + b[NAME], None, None, b[SIZE], None, b[LENGTH])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RIEPILOGO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ScanDiff:
+    """
+    Riepilogo del confronto: conteggi per tipo di cambiamento e classifiche
+    limitate a `top` voci. L'elenco completo è nel file di changes_path.
+    """
+
+    def __init__(self, old, new, path_limit, top=TOP, changes_path=None):
+        self.old_root, self.new_root = old.root, new.root
+        self.old_info, self.new_info = old.info, new.info
+        self.old_entries, self.new_entries = old.entries, new.entries
+        self.old_size, self.new_size = old.total_size, new.total_size
+        self.old_files, self.new_files = old.total_files, new.total_files
+        self.path_limit = path_limit
+        self.changes_path = changes_path
+        self.counts = dict.fromkeys(KINDS, 0)
+        self.newly_over = 0
+        self.no_longer_over = 0
+        self.top_added = TopK(top)
+        self.top_removed = TopK(top)
+        self.top_renamed = TopK(top)
+        self.top_deltas = TopK(top)
+        self.top_newly_over = TopK(top)
+
+    def add(self, change):
+        kind = change.kind
+        self.counts[kind] += 1
+        limit = self.path_limit
+        if change.newly_over(limit):
+            self.newly_over += 1
+            if self.top_newly_over.accepts(change.length):
+                self.top_newly_over.push(change.length, change)
+        elif change.no_longer_over(limit):
+            self.no_longer_over += 1
+        if kind == "added":
+            if self.top_added.accepts(change.size):
+                self.top_added.push(change.size, change)
+        elif kind == "removed":
+            if self.top_removed.accepts(change.old_size):
+                self.top_removed.push(change.old_size, change)
+        elif kind == "renamed":
+            # Prima le cartelle, poi nell'ordine di visita
+            self.top_renamed.push(change.type == "dir", change)
+        elif kind == "modified":
+            delta = abs(change.size - change.old_size)
+            if self.top_deltas.accepts(delta):
+                self.top_deltas.push(delta, change)
+
+    @property
+    def total_changes(self):
+        return sum(self.counts.values())
+
+    def report_lines(self):
+        """Sezione Markdown del report, da accodare a summary_lines."""
+        limit = self.path_limit
+        yield "## 🔀 Confronto con la Scansione Precedente"
+        yield ""
+        yield "| Scansione | Radice | Data | Voci | File | Dimensione |"
+        yield "|-----------|--------|------|------|------|------------|"
+        for label, root, info, entries, files, size in (
+                ("Prima", self.old_root, self.old_info, self.old_entries, self.old_files, self.old_size),
+                ("Dopo", self.new_root, self.new_info, self.new_entries, self.new_files, self.new_size)):
+            date = format_date(info["scan_start"]) if info.get("scan_start") else "—"
+            yield f"| {label} | `{root}` | {date} | {entries:,} | {files or 0:,} | {format_size(size or 0)} |"
+        delta = (self.new_size or 0) - (self.old_size or 0)
+        yield ""
+        yield f"> Variazione di dimensione: **{_signed_size(delta)}**"
+        yield ""
+
+        yield "| Cambiamento | Voci |"
+        yield "|-------------|------|"
+        labels = {"added": "➕ Aggiunte", "removed": "➖ Rimosse", "renamed": "✏️ Rinominate",
+                  "moved": "📦 Spostate con una cartella rinominata", "modified": "🔄 Modificate",
+                  "limit": "📐 Solo lunghezza del path"}
+        for kind in KINDS:
+            yield f"| {labels[kind]} | {self.counts[kind]:,} |"
+        yield f"| 🔴 Nuovi path oltre {limit} caratteri | **{self.newly_over:,}** |"
+        yield f"| ✅ Path rientrati entro {limit} caratteri | {self.no_longer_over:,} |"
+        yield ""
+        if not self.total_changes:
+            yield "> ✅ Nessuna differenza tra le due scansioni."
+            yield ""
+            return
+        if self.changes_path:
+            yield f"> Elenco completo delle differenze: `{self.changes_path}`"
+            yield ""
+
+        sections = (
+            (f"### 🔴 Nuovi Path Oltre Soglia ({limit} caratteri)", self.top_newly_over, self.newly_over),
+            ("### 🔄 Variazioni di Dimensione più Grandi", self.top_deltas, self.counts["modified"]),
+            ("### ➕ Aggiunte più Grandi", self.top_added, self.counts["added"]),
+            ("### ➖ Rimosse più Grandi", self.top_removed, self.counts["removed"]),
+            ("### ✏️ Rinominate", self.top_renamed, self.counts["renamed"]),
+        )
+        for title, top, total in sections:
+            if not len(top):
+                continue
+            yield title
+            yield ""
+            yield "| # | Tipo | Prima | Dopo | Path Len | Percorso |"
+            yield "|---|------|-------|------|----------|----------|"
+            for i, c in enumerate(top.items(), 1):
+                tipo = FOLDER_ICON if c.type == "dir" else "📄"
+                before = "—" if c.old_size is None else format_size(c.old_size)
+                after = "—" if c.size is None else format_size(c.size)
+                if c.old_size is not None and c.size is not None and c.size != c.old_size:
+                    after += f" ({_signed_size(c.size - c.old_size)})"
+                length = c.length if c.length is not None else c.old_length
+                w = " 🔴" if length > limit else ""
+                path = f"`{c.old_path}` → `{c.path}`" if c.old_path is not None else f"`{c.path}`"
+                yield f"| {i} | {tipo} | {before} | {after} | {length}{w} | {path} |"
+            if total > len(top):
+                yield ""
+                yield f"> *+{total - len(top):,} altre*"
+            yield ""
+
+
+def _signed_size(delta):
+    return ("+" if delta >= 0 else "−") + format_size(abs(delta))
+
+
+def diff_scans(old, new, changes_path=None, path_limit=None, top=TOP):
+    """
+    Confronta due scansioni e restituisce uno ScanDiff.
+
+    old e new: file di esportazione (.db/.sqlite, .csv, .ndjson/.jsonl) o
+    PathAnalyzer con una scansione completata. Con changes_path ogni
+    differenza diventa una riga NDJSON (vedi Change.as_dict). path_limit:
+    di default quello della scansione nuova.
+    """
+    with tempfile.TemporaryDirectory(prefix="path_analyzer_diff_") as tmp:
+        old_scan = _Scan(old, tmp, "old")
+        try:
+            new_scan = _Scan(new, tmp, "new")
+            try:
+                if path_limit is None:
+                    path_limit = new.path_limit if hasattr(new, "path_limit") else new_scan.info.get("path_limit", 260)
+                result = ScanDiff(old_scan, new_scan, path_limit, top, changes_path)
+                changes = iter_changes(old_scan, new_scan, path_limit)
+                if changes_path is None:
+                    for change in changes:
+                        result.add(change)
+                else:
+                    dumps = json.JSONEncoder(ensure_ascii=False).encode
+                    with open(changes_path, "w", encoding="utf-8", errors="backslashreplace",
+                              buffering=1 << 20) as f:
+                        for change in changes:
+                            result.add(change)
+                            f.write(dumps(change.as_dict(path_limit)) + "\n")
+                return result
+            finally:
+                new_scan.close()
+        finally:
+            old_scan.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RIGA DI COMANDO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    from .utils import write_lines
+
+    parser = argparse.ArgumentParser(prog="python -m path_analyzer.diff",
+                                     description="Confronta due scansioni esportate con --export.")
+    parser.add_argument("old", help="scansione precedente (.db/.sqlite, .csv, .ndjson/.jsonl)")
+    parser.add_argument("new", help="scansione successiva")
+    parser.add_argument("-l", "--limit", type=int, metavar="N",
+                        help="soglia di lunghezza dei path (default: quella della scansione successiva)")
+    parser.add_argument("-o", "--report", metavar="FILE", help="scrive il confronto in un file Markdown")
+    parser.add_argument("--changes", metavar="FILE", help="una riga NDJSON per differenza")
+    parser.add_argument("--top", type=int, default=TOP, metavar="N",
+                        help=f"voci per classifica nel report (default: {TOP})")
+    args = parser.parse_args(argv)
+
+    try:
+        result = diff_scans(args.old, args.new, args.changes, args.limit, args.top)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 1
+    if args.report:
+        write_lines(args.report, result.report_lines())
+    else:
+        sys.stdout.reconfigure(errors="backslashreplace")
+        for line in result.report_lines():
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Esportazione dei risultati: una riga per cartella o file, in SQLite, CSV o NDJSON.
+
+    from path_analyzer import PathAnalyzer, export_results
+    analyzer = PathAnalyzer(r"\\\\server\\share")
+    analyzer.scan()
+    export_results(analyzer, "scansione.db")   # formato dall'estensione
+
+Le righe si generano dall'albero in memoria durante la scrittura, a blocchi
+di BATCH: nessun formato passa per una lista completa delle voci.
+"""
+
+import csv
+import datetime
+import json
+import os
+import sqlite3
+from itertools import islice
+
+from .tree import FLAG_DIR, FLAG_HIDDEN, NodeView
+from .utils import EXPORT_FORMATS
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RIGHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+COLUMNS = ("id", "parent_id", "type", "name", "path", "extension", "depth", "path_length",
+           "size", "files", "modified", "hidden", "over_limit", "error")
+
+BATCH = 50_000
+
+
+def iter_rows(analyzer):
+    """
+    Righe dell'albero in pre-ordine, una tupla per voce nell'ordine di COLUMNS.
+
+    id è la posizione della voce nella visita (la radice è 0), parent_id
+    quello della cartella che la contiene (None per la radice). Per le
+    cartelle size e files sono i totali del sotto-albero; modified è
+    None perché lo scanner non legge la data delle cartelle.
+    """
+    root = analyzer.root_dir
+    if isinstance(root, NodeView):
+        return _store_rows(root.store, analyzer.path_limit)
+    return _object_rows(root, analyzer.path_limit)
+
+
+def _object_rows(root, limit):
+    # Stesso pre-ordine di TreeStore (la visita dello scanner): la cartella,
+    # i sotto-alberi delle sottocartelle, poi i suoi file. Con o senza
+    # --columnar gli id coincidono. Sullo stack, (False, cartella, id del
+    # padre) da aprire o (True, cartella, suo id) per i file rimasti
+    next_id = 0
+    stack = [(False, root, None)]
+    while stack:
+        files_of, dir_info, ref = stack.pop()
+        if files_of:
+            depth = dir_info.depth + 1
+            for f in dir_info.files:
+                yield (next_id, ref, "file", f.name, f.path, f.extension, depth, f.path_length,
+                       f.size, None, f.modified, f.is_hidden, f.path_length > limit, None)
+                next_id += 1
+            continue
+        dir_id = next_id
+        next_id += 1
+        yield (dir_id, ref, "dir", dir_info.name, dir_info.path, "", dir_info.depth,
+               dir_info.path_length, dir_info.total_size, dir_info.total_files, None, False,
+               dir_info.path_length > limit, dir_info.error)
+        stack.append((True, dir_info, dir_id))
+        stack.extend((False, sub, dir_id) for sub in reversed(dir_info.subdirs))
+
+
+def _store_rows(store, limit):
+    # Le colonne sono già in pre-ordine con l'indice del padre: nessun NodeView,
+    # e il path di ogni voce è il prefisso della cartella più il nome
+    parent, flags, size, modified = store.parent, store.flags, store.size, store.modified
+    path_length, depth, total_files, total_size = store.path_length, store.depth, store.total_files, store.total_size
+    offsets, names, errors = store.name_offset, bytes(store.names), store.errors
+    # Nomi tutti ASCII (il caso comune): offset in byte = offset in caratteri
+    ascii_names = names.decode("ascii") if names.isascii() else None
+    prefixes = {}
+    for i in range(len(store)):
+        if ascii_names is not None:
+            name = ascii_names[offsets[i]:offsets[i + 1]]
+        else:
+            name = names[offsets[i]:offsets[i + 1]].decode("utf-8", "surrogatepass")
+        p = parent[i]
+        path = prefixes[p] + name if p >= 0 else store.root_path
+        length = path_length[i]
+        flag = flags[i]
+        if flag & FLAG_DIR:
+            prefixes[i] = os.path.join(path, "")
+            yield (i, p if p >= 0 else None, "dir", name, path, "", depth[i], length,
+                   total_size[i], total_files[i], None, bool(flag & FLAG_HIDDEN),
+                   length > limit, errors.get(i))
+        else:
+            yield (i, p, "file", name, path, _extension(name), depth[i], length,
+                   size[i], None, modified[i], bool(flag & FLAG_HIDDEN), length > limit, None)
+
+
+def _extension(name):
+    # Come os.path.splitext(name)[1].lower(), senza passare per os.path
+    dot = name.rfind(".")
+    if dot <= 0 or (name[0] == "." and not name[:dot].lstrip(".")):
+        return ""
+    return name[dot:].lower()
+
+
+def _batches(rows, batch):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, batch))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _clean_text(row):
+    # Nomi non decodificabili (surrogati): in SQLite come escape \udcXX, come nella CLI
+    return tuple(v.encode("utf-8", "backslashreplace").decode("utf-8") if isinstance(v, str) else v for v in row)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FORMATI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def export_sqlite(analyzer, db_path, batch=BATCH):
+    """
+    Scrive le righe nella tabella `entries` di un nuovo database SQLite
+    (un file esistente viene sostituito), più la tabella `scan` con i
+    parametri e i totali della scansione. Restituisce il numero di righe.
+
+    L'inserimento avviene in un'unica transazione con journal e sync
+    disattivati; gli indici su path_length, depth, extension e parent_id
+    si costruiscono alla fine, in un solo passaggio ciascuno.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(
+            "CREATE TABLE entries ("
+            " id INTEGER PRIMARY KEY, parent_id INTEGER, type TEXT NOT NULL, name TEXT NOT NULL,"
+            " path TEXT NOT NULL, extension TEXT NOT NULL, depth INTEGER NOT NULL,"
+            " path_length INTEGER NOT NULL, size INTEGER NOT NULL, files INTEGER,"
+            " modified REAL, hidden INTEGER NOT NULL, over_limit INTEGER NOT NULL, error TEXT)")
+        conn.execute("CREATE TABLE scan (key TEXT PRIMARY KEY, value) WITHOUT ROWID")
+        insert = f"INSERT INTO entries VALUES ({', '.join('?' * len(COLUMNS))})"
+
+        count = 0
+        with conn:
+            for chunk in _batches(iter_rows(analyzer), batch):
+                try:
+                    conn.executemany(insert, chunk)
+                except UnicodeEncodeError:
+                    # Le righe prima di quella non codificabile sono già inserite
+                    conn.executemany(insert.replace("INSERT", "INSERT OR REPLACE", 1),
+                                     [_clean_text(row) for row in chunk])
+                count += len(chunk)
+            conn.executemany("INSERT INTO scan VALUES (?, ?)", [_clean_text(item) for item in _scan_info(analyzer)])
+
+        with conn:
+            for column in ("path_length", "depth", "extension", "parent_id"):
+                conn.execute(f"CREATE INDEX idx_entries_{column} ON entries ({column})")
+        return count
+    finally:
+        conn.close()
+
+
+def export_csv(analyzer, csv_path, batch=BATCH):
+    """Righe in CSV (UTF-8, intestazione COLUMNS). Restituisce il numero di righe."""
+    count = 0
+    with open(csv_path, "w", encoding="utf-8", errors="backslashreplace", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for chunk in _batches(iter_rows(analyzer), batch):
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def export_ndjson(analyzer, ndjson_path, batch=BATCH):
+    """Un oggetto JSON per riga con le chiavi di COLUMNS. Restituisce il numero di righe."""
+    count = 0
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    with open(ndjson_path, "w", encoding="utf-8", errors="backslashreplace") as f:
+        for chunk in _batches(iter_rows(analyzer), batch):
+            f.write("".join(dumps(dict(zip(COLUMNS, row))) + "\n" for row in chunk))
+            count += len(chunk)
+    return count
+
+
+def export_results(analyzer, path, fmt=None, batch=BATCH):
+    """Esporta nel formato indicato ("sqlite", "csv", "ndjson") o dedotto dall'estensione."""
+    if fmt is None:
+        fmt = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"Formato di esportazione non riconosciuto: {path} "
+                             f"(estensioni: {', '.join(EXPORT_FORMATS)})")
+    exporters = {"sqlite": export_sqlite, "csv": export_csv, "ndjson": export_ndjson}
+    if fmt not in exporters:
+        raise ValueError(f"Formato di esportazione sconosciuto: {fmt}")
+    return exporters[fmt](analyzer, path, batch)
+
+
+def _scan_info(analyzer):
+    s = analyzer.stats
+    return [
+        ("root", analyzer.root_path),
+        ("path_limit", analyzer.path_limit),
+        ("scan_start", s.scan_start),
+        ("scan_end", s.scan_end),
+        ("exported", datetime.datetime.now().isoformat(timespec="seconds")),
+        ("total_dirs", s.total_dirs),
+        ("total_files", s.total_files),
+        ("total_size", s.total_size),
+        ("over_limit", len(s.path_stats.over_limit)),
+        ("errors", len(s.errors)),
+    ]
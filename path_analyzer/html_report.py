@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""
+Report HTML statico con caricamento a richiesta.
+
+    report.html         riepilogo (le sezioni di summary_lines) e l'interfaccia
+    report_files/
+        tree/000000.js  figli delle cartelle, a pagine di TREE_PAGE voci
+        over/000000.js  path oltre soglia, a pagine di TABLE_PAGE righe
+        index/000000.js indice dei file, a pagine di TABLE_PAGE righe
+
+I pezzi sono file JavaScript (JSONP) che chiamano PA.add(...): il browser
+li carica con un <script> anche da file://, dove fetch() non è ammesso.
+La pagina scarica un pezzo solo quando si espande una cartella o si
+sfoglia una tabella, quindi si apre subito anche con milioni di voci.
+"""
+
+import datetime
+import errno
+import html
+import json
+import os
+import re
+import shutil
+from array import array
+
+from .utils import FILE_ICONS, FOLDER_ICON, UNKNOWN_ICON
+
+TREE_PAGE = 1000      # voci per pagina di una cartella
+TREE_CHUNK = 5000     # voci (di più pagine) per file dell'albero
+TABLE_PAGE = 1000     # righe per pagina delle tabelle
+CHUNK_MARKER = ".path_analyzer"  # segna una cartella di pezzi scritta da ChunkWriter
+
+_CHUNK_NAME = re.compile(r"\d{6}\.js\Z")
+_INLINE = re.compile(r"\*\*(.+?)\*\*|`([^`]+)`|\[([^\]]+)\]\(([^)]+)\)|\*([^*]+)\*")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PEZZI JSONP
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ChunkWriter:
+    """Scrive <files_dir>/<kind>/NNNNNN.js, ognuno con una chiamata PA.add(kind, n, dati)."""
+
+    def __init__(self, files_dir, kind):
+        self.kind = kind
+        self.directory = os.path.join(files_dir, kind)
+        # Pezzi di un report precedente con lo stesso nome: non devono restare.
+        # Si cancella solo una cartella scritta da ChunkWriter, mai una dell'utente
+        if os.path.lexists(self.directory):
+            if not _is_chunk_dir(self.directory):
+                raise FileExistsError(errno.EEXIST, "Cartella esistente non creata dal report, non la sovrascrivo",
+                                      self.directory)
+            shutil.rmtree(self.directory)
+        os.makedirs(self.directory)
+        open(os.path.join(self.directory, CHUNK_MARKER), "w").close()
+        self.count = 0
+
+    def write(self, number, data):
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        path = os.path.join(self.directory, f"{number:06d}.js")
+        # Surrogati dei nomi non decodificabili: escape \udcXX, validi in JavaScript
+        with open(path, "w", encoding="utf-8", errors="backslashreplace") as f:
+            f.write(f"PA.add({json.dumps(self.kind)},{number},{payload});\n")
+        self.count += 1
+
+
+def _is_chunk_dir(directory):
+    # Con il segno di ChunkWriter, o (report precedenti al segno) solo pezzi NNNNNN.js
+    if os.path.islink(directory) or not os.path.isdir(directory):
+        return False
+    names = os.listdir(directory)
+    return CHUNK_MARKER in names or all(_CHUNK_NAME.match(name) for name in names)
+
+
+def _walk_dirs(root):
+    # Pre-ordine; l'id di una cartella si assegna quando compare tra i figli
+    # del padre, così il padre può già citarlo. Stesso ordine in ogni passaggio.
+    next_id = 1
+    stack = [(root, 0)]
+    while stack:
+        dir_info, dir_id = stack.pop()
+        subdirs, files = dir_info.subdirs, dir_info.files
+        ids = range(next_id, next_id + len(subdirs))
+        next_id += len(subdirs)
+        yield dir_id, dir_info, subdirs, files, ids
+        stack.extend(reversed(list(zip(subdirs, ids))))
+
+
+def _plan_tree(root):
+    """
+    Primo passaggio: numero di figli di ogni cartella e pezzo di ogni sua
+    pagina. Le pagine riempiono i pezzi nell'ordine in cui verranno scritte.
+    """
+    counts = array("i", [0])
+    first = array("i", [-1])
+    multi = {}  # cartelle con più pagine: id -> pezzo di ogni pagina
+    chunk, fill = 0, 0
+    for dir_id, _, subdirs, files, ids in _walk_dirs(root):
+        counts.extend([0] * len(ids))
+        first.extend([-1] * len(ids))
+        n = len(subdirs) + len(files)
+        counts[dir_id] = n
+        pages = []
+        for start in range(0, n, TREE_PAGE):
+            size = min(TREE_PAGE, n - start)
+            if fill and fill + size > TREE_CHUNK:
+                chunk, fill = chunk + 1, 0
+            pages.append(chunk)
+            fill += size
+        if pages:
+            first[dir_id] = pages[0]
+        if len(pages) > 1:
+            multi[dir_id] = pages
+    return counts, first, multi
+
+
+def write_tree_chunks(root, files_dir):
+    counts, first, multi = _plan_tree(root)
+
+    def ref(dir_id):
+        # Pezzo della prima pagina, o di ogni pagina; None se la cartella è vuota
+        if dir_id in multi:
+            return multi[dir_id]
+        return first[dir_id] if first[dir_id] >= 0 else None
+
+    writer = ChunkWriter(files_dir, "tree")
+    current, pages = 0, {}
+    for dir_id, _, subdirs, files, ids in _walk_dirs(root):
+        records = []
+        for sub, sub_id in zip(subdirs, ids):
+            record = ["d", sub.name, sub.total_size, sub.total_files, sub.path_length,
+                      sub_id, ref(sub_id), counts[sub_id]]
+            if sub.error:
+                record.append(sub.error)
+            records.append(record)
+        for f in files:
+            records.append(["f", f.name, f.size, f.path_length])
+        chunks = multi.get(dir_id, [first[dir_id]])
+        for page, start in enumerate(range(0, len(records), TREE_PAGE)):
+            if chunks[page] != current:
+                writer.write(current, pages)
+                current, pages = chunks[page], {}
+            pages[f"{dir_id}:{page}"] = records[start:start + TREE_PAGE]
+    if pages:
+        writer.write(current, pages)
+    return {"name": root.name, "size": root.total_size, "files": root.total_files, "plen": root.path_length,
+            "id": 0, "ref": ref(0), "count": counts[0], "error": root.error}
+
+
+def write_table_chunks(rows, files_dir, kind, page_fn=None):
+    # Righe a pagine di TABLE_PAGE; page_fn(righe) -> dati della pagina
+    writer = ChunkWriter(files_dir, kind)
+    total, page = 0, []
+    for row in rows:
+        page.append(row)
+        if len(page) == TABLE_PAGE:
+            writer.write(writer.count, page_fn(page) if page_fn else page)
+            total += len(page)
+            page = []
+    if page:
+        writer.write(writer.count, page_fn(page) if page_fn else page)
+        total += len(page)
+    return {"pages": writer.count, "rows": total}
+
+
+def _index_rows(root):
+    # Stesso ordine di _file_index: cartelle in pre-ordine, file per nome
+    stack = [(root, "")]
+    while stack:
+        dir_info, rel_prefix = stack.pop()
+        current = os.path.join(rel_prefix, dir_info.name) if rel_prefix else dir_info.name
+        for f in sorted(dir_info.files, key=lambda x: x.name.lower()):
+            yield current, f.name, f.extension, f.size, f.path_length, f.modified
+        stack.extend((sub, current) for sub in reversed(dir_info.subdirs))
+
+
+def _index_page(rows):
+    # Cartella scritta una volta per pagina, le righe ne citano la posizione
+    dirs, rows_out, last = [], [], None
+    for current, name, ext, size, path_length, modified in rows:
+        if current != last:
+            dirs.append(current)
+            last = current
+        rows_out.append([len(dirs) - 1, name, ext, size, path_length, modified])
+    return {"d": dirs, "r": rows_out}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RIEPILOGO (Markdown di summary_lines -> HTML)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _inline(text):
+    out, pos = [], 0
+    for m in _INLINE.finditer(text):
+        out.append(html.escape(text[pos:m.start()]))
+        bold, code, label, href, italic = m.groups()
+        if bold is not None:
+            out.append(f"<strong>{_inline(bold)}</strong>")
+        elif code is not None:
+            out.append(f"<code>{html.escape(code)}</code>")
+        elif label is not None:
+            out.append(f'<a href="{html.escape(href)}">{html.escape(label)}</a>')
+        else:
+            out.append(f"<em>{_inline(italic)}</em>")
+        pos = m.end()
+    out.append(html.escape(text[pos:]))
+    return "".join(out)
+
+
+def markdown_to_html(lines):
+    """Il sottoinsieme di Markdown usato dal report: titoli, tabelle, citazioni, elenchi, codice."""
+    table, code, items = None, None, None
+    for line in list(lines) + [""]:
+        if code is not None:
+            if line.startswith("```"):
+                yield f"<pre>{html.escape(chr(10).join(code))}</pre>"
+                code = None
+            else:
+                code.append(line)
+            continue
+        if table is not None and not line.startswith("|"):
+            yield table_html(table)
+            table = None
+        if items is not None and not line.startswith("- "):
+            yield "<ul>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + "</ul>"
+            items = None
+        if line.startswith("```"):
+            code = []
+        elif line.startswith("|"):
+            table = (table or []) + [line]
+        elif line.startswith("- "):
+            items = (items or []) + [line[2:]]
+        elif line.startswith("#"):
+            level = len(line) - len(line.lstrip("#"))
+            text = line[level:].strip()
+            yield f'<h{level} id="{_anchor(text)}">{_inline(text)}</h{level}>'
+        elif line.startswith("> "):
+            yield f"<blockquote>{_inline(line[2:])}</blockquote>"
+        elif line == "---":
+            yield "<hr>"
+        elif line:
+            yield f"<p>{_inline(line)}</p>"
+
+
+def table_html(rows):
+    cells = [[c.strip() for c in row.strip().strip("|").split("|")] for row in rows
+             if not set(row.replace("|", "").strip()) <= set("-: ")]
+    if not cells:
+        return ""
+    head = "".join(f"<th>{_inline(c)}</th>" for c in cells[0])
+    body = "".join("<tr>" + "".join(f"<td>{_inline(c)}</td>" for c in row) + "</tr>" for row in cells[1:])
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def _anchor(text):
+    return re.sub(r"[^\w]+", "-", text.lower()).strip("-")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def write_html_report(analyzer, output_path, now=None):
+    """Scrive output_path e la cartella <nome>_files con i pezzi; restituisce output_path."""
+    if now is None:
+        now = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    files_dir = os.path.splitext(output_path)[0] + "_files"
+    os.makedirs(files_dir, exist_ok=True)
+    root = analyzer.root_dir
+    ps = analyzer.stats.path_stats
+
+    config = {
+        "base": os.path.basename(files_dir),
+        "limit": analyzer.path_limit,
+        "treePage": TREE_PAGE,
+        "tablePage": TABLE_PAGE,
+        "root": write_tree_chunks(root, files_dir),
+        "over": write_table_chunks(([p, length, "D" if ptype == "DIR" else "F"]
+                                    for p, length, ptype in ps.over_limit), files_dir, "over"),
+        "index": write_table_chunks(_index_rows(root), files_dir, "index", _index_page),
+        "icons": FILE_ICONS,
+        "folderIcon": FOLDER_ICON,
+        "unknownIcon": UNKNOWN_ICON,
+    }
+    summary = "\n".join(markdown_to_html(analyzer.summary_lines(now, "#oltre-soglia" if ps.over_limit else None)))
+    # "</" dentro un <script> chiuderebbe il tag
+    config_js = json.dumps(config, ensure_ascii=False).replace("</", "<\\/")
+
+    with open(output_path, "w", encoding="utf-8", errors="backslashreplace") as f:
+        f.write(HTML_TEMPLATE.format(
+            title=html.escape(f"Path Analyzer Report — {analyzer.root_path}"),
+            summary=summary,
+            footer=html.escape(f"Path Analyzer v3.0 GUI — {now} — Soglia: {analyzer.path_limit} chars"),
+            limit=analyzer.path_limit,
+            config=config_js,
+            script=SCRIPT,
+            style=STYLE,
+        ))
+    return output_path
+
+
+STYLE = """
+body { font-family: Segoe UI, Roboto, sans-serif; margin: 0 auto; max-width: 1200px; padding: 0 24px 48px; color: #222; }
+table { border-collapse: collapse; margin: 8px 0 16px; font-size: 13px; }
+th, td { border: 1px solid #ddd; padding: 3px 8px; text-align: left; vertical-align: top; }
+th { background: #f4f4f4; }
+code, pre, .tree { font-family: Consolas, Menlo, monospace; font-size: 13px; }
+pre { background: #f7f7f7; padding: 8px; overflow-x: auto; }
+blockquote { border-left: 4px solid #ccc; margin: 8px 0; padding: 2px 12px; color: #555; }
+.tree ul { list-style: none; margin: 0; padding-left: 22px; }
+.tree > ul { padding-left: 0; }
+.tree li { white-space: nowrap; }
+.toggle { cursor: pointer; display: inline-block; width: 16px; user-select: none; }
+.meta { color: #888; }
+.over { color: #c0392b; font-weight: bold; }
+.more { cursor: pointer; color: #2980b9; }
+.pager { margin: 8px 0; }
+.pager button { margin-right: 4px; }
+.pager input { width: 64px; }
+"""
+
+SCRIPT = r"""
+var PA = (function () {
+  var store = {tree: {}, over: {}, index: {}}, waiting = {}, C = PA_CONFIG;
+
+  function pad(n) { return ("00000" + n).slice(-6); }
+
+  function need(kind, n, cb) {
+    if (store[kind][n] !== undefined) { cb(store[kind][n]); return; }
+    var key = kind + "/" + n;
+    if (waiting[key]) { waiting[key].push(cb); return; }
+    waiting[key] = [cb];
+    var s = document.createElement("script");
+    s.src = C.base + "/" + kind + "/" + pad(n) + ".js";
+    s.onerror = function () { alert("Impossibile caricare " + s.src); };
+    document.head.appendChild(s);
+  }
+
+  function add(kind, n, data) {
+    store[kind][n] = data;
+    var key = kind + "/" + n, cbs = waiting[key] || [];
+    delete waiting[key];
+    cbs.forEach(function (cb) { cb(data); });
+  }
+
+  function size(b) {
+    var units = ["B", "KB", "MB", "GB", "TB"];
+    for (var i = 0; i < units.length; i++) {
+      if (b < 1024) return i ? b.toFixed(2) + " " + units[i] : b + " " + units[i];
+      b /= 1024;
+    }
+    return b.toFixed(2) + " PB";
+  }
+
+  function date(ts) {
+    var d = new Date(ts * 1000), p = function (v) { return ("0" + v).slice(-2); };
+    return p(d.getDate()) + "/" + p(d.getMonth() + 1) + "/" + d.getFullYear() + " " + p(d.getHours()) + ":" + p(d.getMinutes());
+  }
+
+  function ext(name) {
+    var dot = name.lastIndexOf(".");
+    if (dot <= 0 || /^\.+$/.test(name.slice(0, dot))) return "";
+    return name.slice(dot).toLowerCase();
+  }
+
+  function el(tag, cls, text) {
+    var e = document.createElement(tag);
+    if (cls) e.className = cls;
+    if (text !== undefined) e.textContent = text;
+    return e;
+  }
+
+  function over(len) { return len > C.limit ? el("span", "over", " ❌ " + len) : el("span", "meta", " " + len); }
+
+  // ─── Albero ───────────────────────────────────────────────────────────
+  // Cartella: [nome, dimensione, file, path len, id, pezzi, figli, errore]
+
+  function dirItem(d) {
+    var li = el("li"), t = el("span", "toggle", d.count ? "▸" : " ");
+    li.appendChild(t);
+    li.appendChild(document.createTextNode(C.folderIcon + " " + d.name + "/"));
+    li.appendChild(el("span", "meta", "  [" + size(d.size) + ", " + d.files.toLocaleString() + " file]"));
+    li.appendChild(over(d.plen));
+    if (d.error) li.appendChild(el("span", "over", "  ⚠️ " + d.error));
+    if (d.count) {
+      var ul = null;
+      t.onclick = function () {
+        if (ul) { li.removeChild(ul); ul = null; t.textContent = "▸"; return; }
+        ul = el("ul"); li.appendChild(ul); t.textContent = "▾";
+        loadPage(d, 0, ul);
+      };
+    }
+    return li;
+  }
+
+  function fileItem(r) {
+    var li = el("li");
+    li.appendChild(el("span", "toggle", " "));
+    li.appendChild(document.createTextNode((C.icons[ext(r[1])] || C.unknownIcon) + " " + r[1]));
+    li.appendChild(el("span", "meta", "  (" + size(r[2]) + ")"));
+    li.appendChild(over(r[3]));
+    return li;
+  }
+
+  function loadPage(d, page, ul) {
+    var chunk = Array.isArray(d.ref) ? d.ref[page] : d.ref;
+    var loading = ul.appendChild(el("li", "meta", "caricamento…"));
+    need("tree", chunk, function (data) {
+      ul.removeChild(loading);
+      data[d.id + ":" + page].forEach(function (r) {
+        ul.appendChild(r[0] === "d"
+          ? dirItem({name: r[1], size: r[2], files: r[3], plen: r[4], id: r[5], ref: r[6], count: r[7], error: r[8]})
+          : fileItem(r));
+      });
+      var rest = d.count - (page + 1) * C.treePage;
+      if (rest > 0) {
+        var more = ul.appendChild(el("li", "more", "… altri " + rest.toLocaleString() + " elementi"));
+        more.onclick = function () { ul.removeChild(more); loadPage(d, page + 1, ul); };
+      }
+    });
+  }
+
+  // ─── Tabelle a pagine ────────────────────────────────────────────────
+
+  function pager(kind, info, table, render) {
+    var tbody = table.querySelector("tbody"), bar = el("div", "pager"), page = 0;
+    var prev = bar.appendChild(el("button", "", "◀")), input = bar.appendChild(el("input"));
+    var label = bar.appendChild(el("span", "meta", " / " + info.pages)), next = bar.appendChild(el("button", "", "▶"));
+    input.type = "number"; input.min = 1; input.max = info.pages;
+    table.parentNode.insertBefore(bar, table);
+    function show(p) {
+      if (!info.pages) return;
+      page = Math.max(0, Math.min(info.pages - 1, p));
+      input.value = page + 1;
+      need(kind, page, function (data) {
+        tbody.textContent = "";
+        render(data, page).forEach(function (tr) { tbody.appendChild(tr); });
+      });
+    }
+    prev.onclick = function () { show(page - 1); };
+    next.onclick = function () { show(page + 1); };
+    input.onchange = function () { show(parseInt(input.value, 10) - 1); };
+    if (info.pages) show(0); else label.textContent = " nessuna riga";
+  }
+
+  function row(cells) {
+    var tr = el("tr");
+    cells.forEach(function (c) { tr.appendChild(typeof c === "object" ? wrap(c) : el("td", "", String(c))); });
+    return tr;
+  }
+
+  function wrap(node) { var td = el("td"); td.appendChild(node); return td; }
+
+  function init() {
+    var root = C.root, ul = el("ul");
+    document.getElementById("tree").appendChild(ul);
+    var li = dirItem(root);
+    ul.appendChild(li);
+    if (root.count) li.firstChild.onclick();
+
+    pager("over", C.over, document.getElementById("over-table"), function (rows, page) {
+      return rows.map(function (r, i) {
+        return row([page * C.tablePage + i + 1, r[2] === "D" ? "📁" : "📄", over(r[1]), "+" + (r[1] - C.limit), el("code", "", r[0])]);
+      });
+    });
+    pager("index", C.index, document.getElementById("index-table"), function (data) {
+      return data.r.map(function (r) {
+        return row([data.d[r[0]], (C.icons[r[2]] || C.unknownIcon) + " " + r[1], r[2] || "—", size(r[3]), over(r[4]), date(r[5])]);
+      });
+    });
+  }
+
+  return {add: add, init: init};
+})();
+document.addEventListener("DOMContentLoaded", PA.init);
+"""
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="it">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>{style}</style>
+</head>
+<body>
+{summary}
+<hr>
+<h2 id="oltre-soglia">🔴 Percorsi Oltre la Soglia ({limit} caratteri)</h2>
+<table id="over-table"><thead><tr><th>#</th><th>Tipo</th><th>Lunghezza</th><th>Eccesso</th><th>Percorso</th></tr></thead><tbody></tbody></table>
+<hr>
+<h2 id="struttura">🌳 Struttura Directory</h2>
+<p class="meta">Clic su ▸ per espandere: i figli di ogni cartella si caricano solo quando servono.</p>
+<div class="tree" id="tree"></div>
+<hr>
+<h2 id="indice">📋 Indice Completo</h2>
+<table id="index-table"><thead><tr><th>Cartella</th><th>File</th><th>Ext</th><th>Dimensione</th><th>Path Len</th><th>Modificato</th></tr></thead><tbody></tbody></table>
+<hr>
+<p><em>{footer}</em></p>
+<script>var PA_CONFIG = {config};</script>
+<script>{script}</script>
+</body>
+</html>
+"""
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Lettura delle directory: una voce per DirEntry e lettura parallela in anticipo."""
+
+import os
+import threading
+
+from .models import EntryInfo
+
+
+FILE_ATTRIBUTE_HIDDEN = 0x2
+# Su Windows DirEntry.stat() usa i dati già restituiti da FindNextFile:
+# nessuna chiamata di sistema in più. Su POSIX costa una lstat.
+STAT_FROM_LISTING = os.name == "nt"
+
+def read_entry(entry: os.DirEntry) -> EntryInfo:
+    is_dir = entry.is_dir(follow_symlinks=False)
+    is_file = not is_dir and entry.is_file(follow_symlinks=False)
+    size, modified, attrs = 0, 0, 0
+    if is_file or STAT_FROM_LISTING:
+        try:
+            stat = entry.stat(follow_symlinks=False)
+            size, modified = stat.st_size, stat.st_mtime
+            attrs = getattr(stat, "st_file_attributes", 0)
+        except OSError:
+            pass
+    hidden = entry.name.startswith('.') or bool(attrs & FILE_ATTRIBUTE_HIDDEN)
+    return EntryInfo(entry.name, entry.path, is_dir, is_file, size, modified, hidden)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LETTURA PARALLELA DIRECTORY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ListingPool:
+    # Pool di thread che legge le directory in anticipo rispetto allo scanner.
+    # Le directory in attesa stanno in uno stack LIFO condiviso: ogni worker
+    # preleva la più recente, la legge e accoda subito le sue sottocartelle,
+    # così il lavoro si distribuisce da solo tra i thread. Lo scanner consuma
+    # i risultati nell'ordine deterministico della visita; se chiede una
+    # directory ancora in coda la "ruba" e la legge da sé invece di attendere.
+    # Letture finite e non ancora consumate: al massimo max_ready (default
+    # 4 per worker); oltre, i worker aspettano che lo scanner ne prenda una.
+
+    _QUEUED = 0
+    _RUNNING = 1
+
+    def __init__(self, read_fn, expand_fn, workers, max_ready=None):
+        self._read = read_fn          # path -> (entries, errore)
+        self._expand = expand_fn      # (Listing, depth) -> [(path, depth)]
+        self._workers = max(1, workers)
+        self._max_ready = max(1, max_ready or 4 * self._workers)
+        self._running = 0
+        self._cond = threading.Condition()
+        self._stack = []
+        self._state = {}
+        self._results = {}
+        self._closed = False
+
+    def start(self, items):
+        # items: [(path, depth)] da leggere per prime, nell'ordine di visita
+        self._push(items)
+        for i in range(self._workers):
+            threading.Thread(target=self._worker, name=f"ListingPool-{i}", daemon=True).start()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._stack.clear()
+            self._results.clear()
+            self._cond.notify_all()
+
+    def take(self, path, depth):
+        with self._cond:
+            while True:
+                if path in self._results:
+                    self._cond.notify_all()  # un posto libero per i worker
+                    return self._results.pop(path)
+                if self._state.get(path) != self._RUNNING:
+                    # Ancora in coda (o mai accodata): la legge il chiamante
+                    self._state.pop(path, None)
+                    break
+                self._cond.wait()
+        return self._read_and_expand(path, depth)
+
+    def _push(self, items):
+        with self._cond:
+            if self._closed:
+                return
+            # Ordine inverso: il primo figlio finisce in cima allo stack
+            for path, depth in reversed(items):
+                self._state[path] = self._QUEUED
+                self._stack.append((path, depth))
+            self._cond.notify_all()
+
+    def _read_and_expand(self, path, depth):
+        result = self._read(path)
+        self._push(self._expand(result, depth))
+        return result
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                # Le letture in corso finiranno comunque tra i risultati: contano nel limite
+                while (not self._stack or len(self._results) + self._running >= self._max_ready) \
+                        and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                path, depth = self._stack.pop()
+                if self._state.get(path) != self._QUEUED:
+                    continue  # già presa dallo scanner
+                self._state[path] = self._RUNNING
+                self._running += 1
+            result = self._read_and_expand(path, depth)
+            with self._cond:
+                self._running -= 1
+                self._state.pop(path, None)
+                if not self._closed:
+                    self._results[path] = result
+                self._cond.notify_all()
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""Modello dati della scansione: voci lette, albero a oggetti e statistiche."""
+
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
+
+from .timing import PhaseTimes
+from .utils import get_path_length_range
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DATA CLASSES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class EntryInfo(NamedTuple):
+    """Voce di directory con i metadati letti una sola volta dal DirEntry."""
+    name: str
+    path: str
+    is_dir: bool
+    is_file: bool
+    size: int
+    modified: float
+    hidden: bool
+
+class ScanFrame:
+    """Cartella aperta nella visita: voci lette e indice della prossima da elaborare."""
+
+    __slots__ = ("dir_info", "path", "depth", "entries", "index")
+
+    def __init__(self, dir_info, path, depth, entries, index=0):
+        self.dir_info = dir_info
+        self.path = path
+        self.depth = depth
+        self.entries = entries
+        self.index = index
+
+class Listing(NamedTuple):
+    entries: Optional[list]
+    error: Optional[OSError]
+    syscalls: int
+    cached: bool = False  # elenco riusato da uno snapshot
+    # (secondi, CPU) della lettura della directory e dei metadati delle voci
+    timing: Optional[tuple] = None
+
+@dataclass
+class FileInfo:
+    name: str
+    path: str
+    extension: str
+    size: int
+    modified: float
+    path_length: int = 0
+    is_hidden: bool = False
+
+@dataclass
+class DirInfo:
+    name: str
+    path: str
+    files: list = field(default_factory=list)
+    subdirs: list = field(default_factory=list)
+    total_files: int = 0
+    total_size: int = 0
+    depth: int = 0
+    path_length: int = 0
+    error: Optional[str] = None
+
+class DirSummary(NamedTuple):
+    path: str
+    depth: int
+    total_files: int
+    total_size: int
+
+class TopK:
+    """
+    Primi K elementi per chiave, con un min-heap limitato: O(log K) per
+    inserimento e memoria O(K). A parità di chiave resta l'elemento
+    inserito per primo, come in un ordinamento stabile.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def accepts(self, key):
+        # Vero se push(key, ...) entrerebbe adesso nella classifica
+        heap = self._heap
+        return len(heap) < self.k or key > heap[0][0]
+
+    def push(self, key, item):
+        seq = self._seq
+        self._seq += 1
+        self._offer(key, seq, item)
+
+    def _offer(self, key, seq, item):
+        heap = self._heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, (key, -seq, item))
+        elif key > heap[0][0] or (key == heap[0][0] and -seq > heap[0][1]):
+            heapq.heapreplace(heap, (key, -seq, item))
+
+    def merge(self, other):
+        # Gli elementi di other seguono, in ordine di inserimento, tutti i propri
+        base = self._seq
+        for key, neg_seq, item in other._heap:
+            self._offer(key, base - neg_seq, item)
+        self._seq += other._seq
+
+    def convert(self, fn):
+        self._heap = [(key, neg_seq, fn(item)) for key, neg_seq, item in self._heap]
+
+    def items(self):
+        # Dalla chiave più alta; a parità, nell'ordine di inserimento
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (e[0], e[1]), reverse=True)]
+
+
+@dataclass
+class PathLengthStats:
+    # Accumulatori aggiornati durante la scansione: memoria O(lunghezza max + K),
+    # non O(voci). histogram[n] = numero di percorsi lunghi n caratteri.
+    total_paths: int = 0
+    total_length: int = 0
+    histogram: list = field(default_factory=list)
+    over_limit: list = field(default_factory=list)
+    longest_file_path: str = ""
+    longest_file_length: int = 0
+    longest_dir_path: str = ""
+    longest_dir_length: int = 0
+    avg_length: float = 0
+    median_length: int = 0
+    distribution: dict = field(default_factory=lambda: defaultdict(int))
+    longest_paths: list = field(default_factory=list)
+    top_paths: TopK = field(default_factory=lambda: TopK(10), repr=False)
+
+    def add(self, path, length, ptype):
+        if length >= len(self.histogram):
+            self.histogram.extend([0] * (length + 1 - len(self.histogram)))
+        self.histogram[length] += 1
+        self.total_length += length
+        self.total_paths += 1
+        if self.top_paths.accepts(length):
+            self.top_paths.push(length, (path, length, ptype))
+        if ptype == "FILE":
+            if length > self.longest_file_length:
+                self.longest_file_path, self.longest_file_length = path, length
+        elif length > self.longest_dir_length:
+            self.longest_dir_path, self.longest_dir_length = path, length
+
+    def merge(self, other):
+        # other segue, in ordine di visita, tutti i percorsi già contati
+        if len(other.histogram) > len(self.histogram):
+            self.histogram.extend([0] * (len(other.histogram) - len(self.histogram)))
+        for length, count in enumerate(other.histogram):
+            self.histogram[length] += count
+        self.top_paths.merge(other.top_paths)
+        self.total_paths += other.total_paths
+        self.total_length += other.total_length
+        if other.longest_file_length > self.longest_file_length:
+            self.longest_file_path, self.longest_file_length = other.longest_file_path, other.longest_file_length
+        if other.longest_dir_length > self.longest_dir_length:
+            self.longest_dir_path, self.longest_dir_length = other.longest_dir_path, other.longest_dir_length
+        self.over_limit.extend(other.over_limit)
+
+    def length_at(self, rank):
+        # rank-esima lunghezza (da 0) in ordine crescente, esatta: counting sort
+        seen = 0
+        for length, count in enumerate(self.histogram):
+            seen += count
+            if seen > rank:
+                return length
+        return 0
+
+    def percentile(self, q):
+        return self.length_at(min(self.total_paths - 1, int(self.total_paths * q / 100)))
+
+    def finalize(self):
+        if not self.total_paths:
+            return
+        self.avg_length = self.total_length / self.total_paths
+        self.median_length = self.length_at(self.total_paths // 2)
+        for length, count in enumerate(self.histogram):
+            if count:
+                self.distribution[get_path_length_range(length)] += count
+        self.longest_paths = self.top_paths.items()
+        self.over_limit.sort(key=lambda x: x[1], reverse=True)
+
+@dataclass
+class ScanStats:
+    total_dirs: int = 0
+    syscalls: int = 0
+    dirs_reused: int = 0
+    dirs_relisted: int = 0
+    total_files: int = 0
+    total_size: int = 0
+    max_depth: int = 0
+    extensions: dict = field(default_factory=lambda: defaultdict(int))
+    ext_sizes: dict = field(default_factory=lambda: defaultdict(int))
+    # Classifiche finali (liste) e relativi accumulatori TopK usati in scansione
+    largest_files: list = field(default_factory=list)
+    deepest_dirs: list = field(default_factory=list)
+    largest_dirs: list = field(default_factory=list)
+    top_files: TopK = field(default_factory=lambda: TopK(15), repr=False)
+    top_deep_dirs: TopK = field(default_factory=lambda: TopK(10), repr=False)
+    top_large_dirs: TopK = field(default_factory=lambda: TopK(10), repr=False)
+    errors: list = field(default_factory=list)
+    path_stats: PathLengthStats = field(default_factory=PathLengthStats)
+    scan_start: float = 0
+    scan_end: float = 0
+    # Tempo reale, CPU e memoria per fase (timing.py): scansione, report, ...
+    phases: PhaseTimes = field(default_factory=PhaseTimes)
+
+    def merge(self, other):
+        # Accoda i risultati parziali di un sotto-albero scansionato altrove
+        self.total_dirs += other.total_dirs
+        self.total_files += other.total_files
+        self.total_size += other.total_size
+        self.syscalls += other.syscalls
+        self.dirs_reused += other.dirs_reused
+        self.dirs_relisted += other.dirs_relisted
+        self.max_depth = max(self.max_depth, other.max_depth)
+        for ext, count in other.extensions.items():
+            self.extensions[ext] += count
+        for ext, size in other.ext_sizes.items():
+            self.ext_sizes[ext] += size
+        self.top_files.merge(other.top_files)
+        self.top_deep_dirs.merge(other.top_deep_dirs)
+        self.top_large_dirs.merge(other.top_large_dirs)
+        self.errors.extend(other.errors)
+        self.path_stats.merge(other.path_stats)
+        self.phases.merge(other.phases)
+
+    def finalize(self):
+        self.largest_files = self.top_files.items()
+        self.deepest_dirs = self.top_deep_dirs.items()
+        self.largest_dirs = self.top_large_dirs.items()
+        self.path_stats.finalize()
@@ -0,0 +1,668 @@
+# -*- coding: utf-8 -*-
+"""
+Piano ed esecuzione delle rinomine per accorciare i path oltre soglia.
+
+    from path_analyzer import RenameEngine, RenameRule, RuleType
+    engine = RenameEngine(r"\\\\server\\share", path_limit=240)
+    plan = engine.create_plan([RenameRule(RuleType.SMART_ABBREVIATE)])
+    if plan.is_valid:
+        engine.execute()
+
+Con una scansione gia fatta il piano si calcola dall'albero in memoria,
+senza rileggere il filesystem:
+
+    plan = engine.create_plan(rules, scan=analyzer, verify=True)
+"""
+
+import datetime
+import json
+import os
+import stat
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple
+
+from .rules import RenameRule, RuleProcessor
+from .timing import PhaseTimes
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PIANO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class RenameOperation:
+    """Una singola operazione di rinomina pianificata."""
+    old_path: str
+    new_path: str
+    old_name: str
+    new_name: str
+    depth: int
+    is_dir: bool
+    old_length: int = 0
+    new_length: int = 0
+    savings: int = 0
+    status: str = "pending"  # pending, done, error, skipped
+    error_msg: str = ""
+    final_path: str = ""  # path a piano completato, con le cartelle padre gia rinominate
+
+    def __post_init__(self):
+        if not self.final_path:
+            self.final_path = self.new_path
+        # Lunghezza e risparmio si riferiscono al path finale
+        self.old_length = len(self.old_path)
+        self.new_length = len(self.final_path)
+        self.savings = self.old_length - self.new_length
+
+
+@dataclass
+class RenamePlan:
+    """Piano completo di rinomina con tutte le operazioni ordinate."""
+    operations: List[RenameOperation] = field(default_factory=list)
+    conflicts: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    total_savings: int = 0
+    paths_fixed: int = 0        # path oltre soglia che a piano completato rientrano
+    fixed_by_parent: int = 0    # di cui senza rinomina, grazie a una cartella padre
+    still_over: int = 0         # path che restano oltre soglia
+    is_valid: bool = True
+
+
+class _NameIndex:
+    """
+    Nomi esistenti per cartella, in casefold come li confronta Windows:
+    costruiti una volta per cartella dai nomi gia letti (scansione o
+    os.walk), poi ogni controllo di conflitto e O(1).
+    """
+
+    def __init__(self, folders):
+        self._folders = folders  # path cartella -> DirInfo/NodeView o lista di nomi
+        self._names = {}
+
+    def taken(self, folder, old_name, new_name):
+        # Come os.path.exists(nuovo path): la sola rinomina del case e ammessa
+        names = self._names.get(folder)
+        if names is None:
+            names = self._names[folder] = self._read(folder)
+        key = new_name.casefold()
+        return key in names and key != old_name.casefold()
+
+    def _read(self, folder):
+        content = self._folders.get(folder, ())
+        if isinstance(content, list):
+            return {name.casefold() for name in content}
+        names = {d.name.casefold() for d in content.subdirs}
+        names.update(f.name.casefold() for f in content.files)
+        return names
+
+
+class _PathRewriter:
+    """
+    Trie delle rinomine di cartelle gia pianificate, per componenti del path
+    relativo alla radice: il path finale di una cartella, con tutte le
+    rinomine dei suoi antenati e sua, costa O(profondita) qualunque sia il
+    numero di rinomine nel piano.
+    """
+
+    def __init__(self, root_path):
+        self._prefix = os.path.join(root_path, "")
+        self._nodes = {}  # componente -> [nuovo nome o None, figli]
+
+    def add(self, dir_path, new_name):
+        nodes = self._nodes
+        for part in dir_path[len(self._prefix):].split(os.sep):
+            node = nodes.get(part)
+            if node is None:
+                node = nodes[part] = [None, {}]
+            nodes = node[1]
+        node[0] = new_name
+
+    def rewrite(self, dir_path):
+        if not self._nodes or not dir_path.startswith(self._prefix):
+            return dir_path
+        parts = dir_path[len(self._prefix):].split(os.sep)
+        nodes, changed = self._nodes, False
+        for i, part in enumerate(parts):
+            node = nodes.get(part)
+            if node is None:
+                break
+            if node[0] is not None:
+                parts[i] = node[0]
+                changed = True
+            nodes = node[1]
+        return self._prefix + os.sep.join(parts) if changed else dir_path
+
+
+def _minimal_renames(entries, saving, limit):
+    """
+    Cartelle da rinominare per riportare entro la soglia tutti i path, con
+    il minor numero di rinomine (programmazione dinamica sull'albero).
+
+    entries: voci oltre soglia e cartelle che le contengono, come in
+    _build_plan. saving: path -> caratteri risparmiati dalle regole (solo
+    le voci rinominabili senza conflitti).
+
+    Per ogni cartella servono l'eccedenza massima nel suo sottoalbero (m)
+    e, per ogni risparmio s = 0..m gia ottenuto dalle cartelle padre, il
+    minimo di rinomine nel sottoalbero. Un path che resta oltre soglia
+    costa piu di tutte le rinomine insieme, quindi prima si riportano
+    entro la soglia piu path possibile, poi si minimizzano le rinomine. I
+    file che restano oltre si rinominano poi con le regole in _build_plan.
+    """
+    penalty = len(entries) + 1
+    dirs = [e for e in entries if e[3]]
+    excess = {path: len(path) - limit for path, _, _, is_dir in dirs}
+    children = defaultdict(list)
+    files = defaultdict(list)
+    for path, _, _, is_dir in entries:
+        parent = os.path.dirname(path)
+        if is_dir:
+            children[parent].append(path)
+        elif len(path) > limit:
+            files[parent].append((len(path) - limit, saving.get(path, 0)))
+
+    # Dal basso: top[d] eccedenza massima, cost[d][s] rinomine nel contenuto
+    # di d con risparmio s dai padri, best[d][s] lo stesso includendo d
+    top, cost, best = {}, {}, {}
+    for path, _, _, _ in sorted(dirs, key=lambda e: -e[2]):
+        m = max([excess[path], 0] + [e for e, _ in files[path]] + [top[c] for c in children[path]])
+        top[path] = m
+        # File: oltre soglia (penalty) finche s < e - risparmio, poi una rinomina, poi niente
+        steps = [0] * (m + 2)
+        for e, gain in files[path]:
+            steps[0] += penalty
+            steps[max(0, e - gain)] += 1 - penalty
+            steps[e] -= 1
+        g, total = [], 0
+        for step in steps[:m + 1]:
+            total += step
+            g.append(total)
+        for c in children[path]:
+            for s, value in enumerate(best.pop(c)):
+                g[s] += value
+        cost[path] = g
+        own, gain = excess[path], saving.get(path, 0)
+        row = []
+        for s in range(m + 1):
+            value = g[s] + (penalty if s < own else 0)
+            if gain:
+                value = min(value, 1 + g[min(s + gain, m)] + (penalty if s + gain < own else 0))
+            row.append(value)
+        best[path] = row
+
+    # Dall'alto: a parita di costo la cartella resta com'e; una cartella
+    # ancora oltre soglia si accorcia comunque, come i file
+    chosen = set()
+    stack = [(path, 0) for path in best]
+    while stack:
+        path, s = stack.pop()
+        m = top[path]
+        if s >= m:
+            continue  # tutto il sottoalbero e gia entro la soglia
+        g, own, gain = cost[path], excess[path], saving.get(path, 0)
+        if gain:
+            keep = g[s] + (penalty if s < own else 0)
+            rename = 1 + g[min(s + gain, m)] + (penalty if s + gain < own else 0)
+            if rename < keep or s < own:
+                chosen.add(path)
+                s += gain
+        stack.extend((c, s) for c in children[path])
+    return chosen
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RENAME ENGINE — Il cuore del sistema
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RenameEngine:
+    """
+    Motore di rinomina con esecuzione bottom-up.
+
+    STRATEGIA CHIAVE:
+    1. Raccoglie tutti i path problematici
+    2. Applica le regole IN MEMORIA per calcolare i nuovi nomi
+    3. Ordina le operazioni per profondita DECRESCENTE (bottom-up)
+    4. Esegue le rinominazioni dal piu profondo al meno profondo
+    5. In questo modo, quando rinomini una cartella, tutti i suoi figli
+       sono gia stati rinominati e il vecchio path e' ancora valido
+    """
+
+    def __init__(self, root_path: str, path_limit: int = 260):
+        self.root_path = root_path
+        self.path_limit = path_limit
+        self.plan = RenamePlan()
+        self.executed_ops: List[RenameOperation] = []  # Per rollback
+        # Tempi di piano, esecuzione e rollback (timing.py): azzerati a ogni nuovo piano
+        self.phases = PhaseTimes()
+
+    def create_plan(self, rules: List[RenameRule],
+                    only_over_limit: bool = True,
+                    progress_cb: Callable = None,
+                    scan=None, verify: bool = False,
+                    minimal: bool = False) -> RenamePlan:
+        """
+        Crea il piano di rinomina senza toccare il filesystem.
+        Applica le regole in memoria.
+
+        scan: PathAnalyzer gia eseguito (o la radice DirInfo/NodeView del
+        suo albero). Il piano si calcola dall'albero in memoria, con i
+        conflitti verificati sui nomi letti dalla scansione; valgono quindi
+        esclusioni, file nascosti e profondita della scansione. Senza scan
+        l'albero si rilegge con os.walk.
+
+        verify: controlla sul filesystem, solo per le voci da rinominare,
+        che esistano ancora come nella scansione e che la destinazione
+        sia libera. Le voci non piu valide diventano conflitti.
+
+        minimal: rinomina il minor numero di voci che riporta tutti i path
+        entro la soglia. Accorcia prima le cartelle comuni a molti path
+        oltre soglia (anche se la cartella in se e entro la soglia), poi
+        rinomina con le regole solo i file e le cartelle ancora oltre.
+        Implica only_over_limit.
+        """
+        self.phases = PhaseTimes()
+        with self.phases.measure("plan") as phase:
+            plan = self._build_plan(rules, only_over_limit or minimal, progress_cb, scan, verify, minimal)
+            phase.items = len(plan.operations)
+        return plan
+
+    def _build_plan(self, rules, only_over_limit, progress_cb, scan, verify, minimal):
+        self.plan = RenamePlan()
+        ops = []
+
+        # Elementi bottom-up: le cartelle figlio vengono PRIMA dei genitori.
+        # (path, nome, profondita, is_dir); in folders il contenuto delle
+        # cartelle che li contengono, per i conflitti senza toccare il filesystem
+        folders = {}
+        if scan is not None:
+            root = getattr(scan, "root_dir", scan)
+            if root is None:
+                raise ValueError("La scansione non e' completa: nessun albero da cui calcolare il piano.")
+            all_entries = list(self._scanned_entries(root, only_over_limit, folders, minimal))
+        else:
+            all_entries = list(self._walked_entries(only_over_limit, folders, minimal))
+        existing = _NameIndex(folders)
+
+        # Piano minimo: nuovi nomi calcolati una volta, poi la scelta delle
+        # cartelle da accorciare sull'albero delle voci oltre soglia
+        new_names = {}
+        if minimal:
+            saving = {}
+            for full_path, name, depth, is_dir in all_entries:
+                new_name = new_names[full_path] = RuleProcessor.apply_rules(name, rules, is_dir)
+                if new_name != name and not existing.taken(os.path.dirname(full_path), name, new_name):
+                    saving[full_path] = len(name) - len(new_name)
+            chosen = _minimal_renames(all_entries, saving, self.path_limit)
+
+        if progress_cb:
+            progress_cb(0, len(all_entries))
+
+        # Le regole si applicano dall'alto: quando si arriva a una voce le
+        # rinomine delle cartelle che la contengono sono gia pianificate e il
+        # trie ne da il path finale. A parita di profondita la cartella viene
+        # prima dei suoi file (che hanno la sua stessa profondita)
+        all_entries.sort(key=lambda e: (e[2], not e[3]))
+        renamed = _PathRewriter(root.path if scan is not None else self.root_path)
+        limit = self.path_limit
+        last_parent = final_parent = None
+
+        for idx, (full_path, name, depth, is_dir) in enumerate(all_entries):
+            if progress_cb and idx % 100 == 0:
+                progress_cb(idx, len(all_entries))
+
+            parent = os.path.dirname(full_path)
+            if parent != last_parent:  # i file di una cartella sono consecutivi
+                last_parent, final_parent = parent, renamed.rewrite(parent)
+            over = len(full_path) > limit
+            fits = len(final_parent) + 1 + len(name) <= limit
+            if minimal and is_dir and full_path not in chosen:
+                # Cartella non scelta dal piano minimo: resta com'e
+                self.plan.fixed_by_parent += over and fits
+                self.plan.paths_fixed += over and fits
+                self.plan.still_over += over and not fits
+                continue
+            if only_over_limit and fits and not (minimal and is_dir):
+                # Gia rientrato grazie alla rinomina di una cartella padre
+                self.plan.fixed_by_parent += 1
+                self.plan.paths_fixed += 1
+                continue
+
+            new_name = new_names.get(full_path) or RuleProcessor.apply_rules(name, rules, is_dir)
+
+            if new_name == name:
+                self.plan.still_over += over
+                continue  # Nessun cambiamento
+
+            # Il nuovo path resta nel vecchio padre: l'esecuzione e bottom-up,
+            # la cartella padre si rinomina dopo
+            new_path = os.path.join(parent, new_name)
+
+            # Controlla conflitti
+            if existing.taken(parent, name, new_name):
+                self.plan.conflicts.append(
+                    f"Conflitto: '{new_name}' esiste gia in {parent}"
+                )
+                self.plan.still_over += over
+                continue
+
+            op = RenameOperation(
+                old_path=full_path, new_path=new_path,
+                old_name=name, new_name=new_name,
+                depth=depth, is_dir=is_dir,
+                final_path=os.path.join(final_parent, new_name)
+            )
+            if verify and not self._is_fresh(op):
+                self.plan.still_over += over
+                continue
+            ops.append(op)
+
+            if over and op.new_length <= limit:
+                self.plan.paths_fixed += 1
+            else:
+                self.plan.still_over += over
+            if is_dir:
+                renamed.add(full_path, new_name)
+
+        # Ordina per profondita DECRESCENTE (bottom-up)
+        # A parita di profondita, i file prima delle cartelle
+        ops.sort(key=lambda o: (-o.depth, o.is_dir))
+
+        self.plan.operations = ops
+        self.plan.total_savings = sum(o.savings for o in ops)
+        self.plan.is_valid = len(self.plan.conflicts) == 0
+
+        # Warnings
+        if not ops and not self.plan.fixed_by_parent:
+            self.plan.warnings.append("Nessuna modifica necessaria con le regole attuali.")
+        if self.plan.still_over:
+            self.plan.warnings.append(
+                f"{self.plan.still_over} path restano oltre {limit} caratteri con le regole attuali."
+            )
+
+        # Verifica duplicati nello stesso folder: un passaggio, nomi in casefold
+        planned = set()
+        dupes = defaultdict(set)
+        for op in ops:
+            key = (os.path.dirname(op.old_path), op.new_name.casefold())
+            if key in planned:
+                dupes[key[0]].add(key[1])
+            else:
+                planned.add(key)
+        for folder, names in dupes.items():
+            self.plan.is_valid = False
+            self.plan.conflicts.append(
+                f"Nomi duplicati in {folder}: {names}"
+            )
+
+        return self.plan
+
+    def _walked_entries(self, only_over_limit, folders, ancestors=False):
+        # os.walk bottom-up sul filesystem: una lettura per cartella. Dei nomi
+        # letti si tengono solo le cartelle che contengono voci candidate.
+        # ancestors: anche le cartelle entro la soglia che contengono voci oltre
+        wanted = set()
+        hot = set()
+        for dirpath, dirnames, filenames in os.walk(self.root_path, topdown=False):
+            depth = dirpath.replace(self.root_path, "").count(os.sep)
+            if dirpath in wanted:
+                folders[dirpath] = dirnames + filenames
+
+            # File in questa directory
+            for fname in filenames:
+                full_path = os.path.join(dirpath, fname)
+                if only_over_limit and len(full_path) <= self.path_limit:
+                    continue
+                if dirpath not in folders:
+                    folders[dirpath] = dirnames + filenames
+                    if ancestors:
+                        hot.add(dirpath)
+                yield full_path, fname, depth, False
+
+            # La directory stessa (solo se non e' la root)
+            if os.path.abspath(dirpath) != os.path.abspath(self.root_path):
+                dname = os.path.basename(dirpath)
+                if only_over_limit and len(dirpath) <= self.path_limit and dirpath not in hot:
+                    continue
+                wanted.add(os.path.dirname(dirpath))  # bottom-up: il padre arriva dopo
+                if ancestors:
+                    hot.add(os.path.dirname(dirpath))
+                yield dirpath, dname, depth, True
+
+    def _scanned_entries(self, root, only_over_limit, folders, ancestors=False):
+        # Stesso ordine di os.walk(topdown=False) sull'albero della scansione:
+        # per ogni cartella prima le sottocartelle, poi i file, poi la cartella.
+        # Profondita come in _walked_entries: un file ha quella della sua cartella
+        limit = self.path_limit
+        hot = set()
+        stack = [(root, None, False)]
+        while stack:
+            dir_info, parent, expanded = stack.pop()
+            if not expanded:
+                stack.append((dir_info, parent, True))
+                stack.extend((sub, dir_info, False) for sub in reversed(dir_info.subdirs))
+                continue
+            depth = dir_info.depth
+            for f in dir_info.files:
+                if only_over_limit and f.path_length <= limit:
+                    continue
+                folders[dir_info.path] = dir_info
+                if ancestors:
+                    hot.add(dir_info.path)
+                yield f.path, f.name, depth, False
+            if parent is None:
+                continue
+            if not (only_over_limit and dir_info.path_length <= limit and dir_info.path not in hot):
+                folders[parent.path] = parent
+                if ancestors:
+                    hot.add(parent.path)
+                yield dir_info.path, dir_info.name, depth, True
+
+    def _is_fresh(self, op):
+        # Controllo di freschezza: una lstat per voce da rinominare e una per la destinazione
+        try:
+            st = os.lstat(op.old_path)
+        except OSError:
+            self.plan.conflicts.append(f"Non piu presente dalla scansione: {op.old_path}")
+            return False
+        if stat.S_ISDIR(st.st_mode) != op.is_dir:
+            self.plan.conflicts.append(f"Tipo cambiato dalla scansione: {op.old_path}")
+            return False
+        if os.path.lexists(op.new_path) and op.new_path.lower() != op.old_path.lower():
+            self.plan.conflicts.append(
+                f"Conflitto: '{op.new_name}' esiste gia in {os.path.dirname(op.old_path)}"
+            )
+            return False
+        return True
+
+    def execute(self, on_error: str = "skip",
+                progress_cb: Callable = None, workers: int = 1) -> Tuple[int, int, List[str]]:
+        """
+        Esegue il piano di rinomina.
+        Le operazioni sono GIA ordinate bottom-up dal create_plan().
+
+        on_error: "skip" = continua, "stop" = ferma tutto
+
+        workers: con piu di 1 le rinomine girano su un pool di thread, in
+        parallelo tra sottoalberi indipendenti. Ogni cartella aspetta solo
+        le operazioni sulle voci che contiene: la garanzia bottom-up resta.
+        Con "stop" non si avviano altre operazioni dopo il primo errore;
+        quelle gia in corso finiscono. Su una condivisione di rete ogni
+        rinomina costa alcuni round-trip: il tempo si divide per i thread.
+
+        Returns: (successi, errori, lista_errori)
+        """
+        with self.phases.measure("execute") as phase:
+            if workers > 1:
+                success, errors, error_list = self._execute_parallel(on_error, progress_cb, workers)
+            else:
+                success, errors, error_list = self._execute(on_error, progress_cb)
+            phase.items = success + errors
+        return success, errors, error_list
+
+    def _apply(self, op):
+        # Una rinomina con i suoi controlli: None se riuscita, altrimenti il messaggio d'errore
+        try:
+            # Verifica che il path sorgente esista ancora
+            if not os.path.exists(op.old_path):
+                # Il path potrebbe essere cambiato da un'operazione precedente
+                # su una cartella genitore. Ma con bottom-up non dovrebbe succedere.
+                op.status = "skipped"
+                op.error_msg = "Path non trovato (possibile rinomina genitore)"
+                return f"SKIP: {op.old_path} non trovato"
+
+            # Verifica che il target non esista
+            if os.path.exists(op.new_path) and op.new_path.lower() != op.old_path.lower():
+                op.status = "skipped"
+                op.error_msg = "Destinazione gia esistente"
+                return f"SKIP: {op.new_path} esiste gia"
+
+            # Esegui la rinomina
+            os.rename(op.old_path, op.new_path)
+            op.status = "done"
+            return None
+
+        except PermissionError:
+            op.status = "error"
+            op.error_msg = "Permesso negato"
+            return f"ERRORE permesso: {op.old_path}"
+
+        except OSError as e:
+            op.status = "error"
+            op.error_msg = str(e)
+            return f"ERRORE: {op.old_path}: {e}"
+
+    def _execute(self, on_error, progress_cb):
+        self.executed_ops = []
+        success = 0
+        errors = 0
+        error_list = []
+        total = len(self.plan.operations)
+
+        for idx, op in enumerate(self.plan.operations):
+            if progress_cb and idx % 10 == 0:
+                progress_cb(idx, total, success, errors)
+
+            message = self._apply(op)
+            if message is None:
+                self.executed_ops.append(op)
+                success += 1
+                continue
+            error_list.append(message)
+            errors += 1
+            if on_error == "stop":
+                break
+
+        if progress_cb:
+            progress_cb(total, total, success, errors)
+
+        return success, errors, error_list
+
+    def _execute_parallel(self, on_error, progress_cb, workers):
+        # Grafo delle dipendenze: ogni operazione sblocca la rinomina della
+        # cartella pianificata piu vicina che la contiene. Una cartella parte
+        # quando tutte le operazioni al suo interno sono finite (anche con
+        # errore: la voce resta col vecchio nome nella cartella rinominata)
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        ops = self.plan.operations
+        total = len(ops)
+        folders = {op.old_path: i for i, op in enumerate(ops) if op.is_dir}
+        unlocks = [None] * total
+        pending = [0] * total
+        for i, op in enumerate(ops):
+            path = os.path.dirname(op.old_path)
+            while folders:
+                j = folders.get(path)
+                if j is not None:
+                    unlocks[i] = j
+                    pending[j] += 1
+                    break
+                up = os.path.dirname(path)
+                if up == path:
+                    break
+                path = up
+
+        # Ordine del piano tra le operazioni pronte: le piu profonde prima
+        ready = deque(i for i in range(total) if not pending[i])
+        self.executed_ops = []
+        success = errors = finished = 0
+        error_list = []
+        stopped = False
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while running or (ready and not stopped):
+                while ready and not stopped and len(running) < workers:
+                    i = ready.popleft()
+                    running[pool.submit(self._apply, ops[i])] = i
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    message = future.result()
+                    # Ordine di completamento: una cartella segue sempre il suo
+                    # contenuto, il rollback a ritroso resta top-down
+                    if message is None:
+                        self.executed_ops.append(ops[i])
+                        success += 1
+                    else:
+                        error_list.append(message)
+                        errors += 1
+                        stopped = stopped or on_error == "stop"
+                    j = unlocks[i]
+                    if j is not None:
+                        pending[j] -= 1
+                        if not pending[j]:
+                            ready.append(j)
+                    finished += 1
+                    if progress_cb and finished % 10 == 0:
+                        progress_cb(finished, total, success, errors)
+
+        if progress_cb:
+            progress_cb(total, total, success, errors)
+
+        return success, errors, error_list
+
+    def rollback(self, progress_cb: Callable = None) -> Tuple[int, int]:
+        """
+        Annulla le operazioni eseguite in ordine INVERSO (top-down).
+        Questo e' l'opposto dell'esecuzione: prima le cartelle piu alte,
+        poi quelle piu profonde, poi i file.
+        """
+        with self.phases.measure("rollback") as phase:
+            phase.items = len(self.executed_ops)
+            return self._rollback(progress_cb)
+
+    def _rollback(self, progress_cb):
+        # Inverti l'ordine: le ultime eseguite (le piu alte) vanno rollbackate per prime
+        to_undo = list(reversed(self.executed_ops))
+        success = 0
+        errors = 0
+        total = len(to_undo)
+
+        for idx, op in enumerate(to_undo):
+            if progress_cb and idx % 10 == 0:
+                progress_cb(idx, total)
+
+            try:
+                if os.path.exists(op.new_path):
+                    os.rename(op.new_path, op.old_path)
+                    success += 1
+            except OSError:
+                errors += 1
+
+        self.executed_ops.clear()
+        return success, errors
+
+    def save_undo_log(self, path: str):
+        """Salva il log delle operazioni per undo futuro."""
+        data = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "root_path": self.root_path,
+            "operations": [
+                {"old": op.old_path, "new": op.new_path, "is_dir": op.is_dir,
+                 "depth": op.depth, "status": op.status}
+                for op in self.executed_ops
+            ]
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Regole di rinomina: tipi, configurazione e applicazione a un singolo nome.
+
+Nessuna dipendenza dal filesystem: RuleProcessor.apply_rules lavora solo
+su stringhe, quindi il piano di rinomina si calcola tutto in memoria.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REGOLE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RuleType(Enum):
+    FIND_REPLACE = "Trova e Sostituisci"
+    TRUNCATE = "Tronca a N caratteri"
+    REMOVE_CHARS = "Rimuovi caratteri"
+    REMOVE_PREFIX = "Rimuovi prefisso"
+    REMOVE_SUFFIX = "Rimuovi suffisso"
+    COMPRESS_SEPARATORS = "Comprimi separatori"
+    REGEX_REPLACE = "Regex"
+    SMART_ABBREVIATE = "Abbreviazione smart"
+
+
+@dataclass
+class RenameRule:
+    """Una singola regola di rinomina configurata dall'utente."""
+    rule_type: RuleType
+    params: dict = field(default_factory=dict)
+    apply_to_files: bool = True
+    apply_to_dirs: bool = True
+    enabled: bool = True
+
+    def describe(self) -> str:
+        t = self.rule_type.value
+        p = self.params
+        if self.rule_type == RuleType.FIND_REPLACE:
+            return f'{t}: "{p.get("find","")}" -> "{p.get("replace","")}"'
+        elif self.rule_type == RuleType.TRUNCATE:
+            return f'{t}: max {p.get("max_chars",50)} caratteri'
+        elif self.rule_type == RuleType.REMOVE_CHARS:
+            return f'{t}: "{p.get("chars","")}"'
+        elif self.rule_type == RuleType.REMOVE_PREFIX:
+            return f'{t}: "{p.get("prefix","")}"'
+        elif self.rule_type == RuleType.REMOVE_SUFFIX:
+            return f'{t}: "{p.get("suffix","")}"'
+        elif self.rule_type == RuleType.COMPRESS_SEPARATORS:
+            return f'{t}: comprimi ripetizioni di "{p.get("char","_")}"'
+        elif self.rule_type == RuleType.REGEX_REPLACE:
+            return f'{t}: /{p.get("pattern","")}/ -> "{p.get("replace","")}"'
+        elif self.rule_type == RuleType.SMART_ABBREVIATE:
+            return f'{t}: abbreviazioni comuni'
+        return t
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SMART ABBREVIATIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SMART_ABBREV = {
+    "documents": "docs", "document": "doc", "documentation": "docs",
+    "configuration": "cfg", "config": "cfg", "configure": "cfg",
+    "application": "app", "applications": "apps",
+    "development": "dev", "developer": "dev",
+    "production": "prod", "environment": "env",
+    "temporary": "tmp", "temp": "tmp",
+    "library": "lib", "libraries": "libs",
+    "resource": "res", "resources": "res",
+    "information": "info", "images": "img", "image": "img",
+    "source": "src", "sources": "src",
+    "package": "pkg", "packages": "pkgs",
+    "component": "cmp", "components": "cmps",
+    "database": "db", "backup": "bak", "backups": "bak",
+    "directory": "dir", "directories": "dirs",
+    "template": "tpl", "templates": "tpls",
+    "utilities": "util", "utility": "util",
+    "download": "dl", "downloads": "dl",
+    "attachment": "att", "attachments": "att",
+    "administration": "admin", "administrator": "admin",
+    "management": "mgmt", "manager": "mgr",
+    "project": "prj", "projects": "prjs",
+    "specification": "spec", "specifications": "specs",
+    "presentation": "pres", "presentations": "pres",
+    "reference": "ref", "references": "refs",
+    "description": "desc", "version": "ver",
+    "original": "orig", "screenshot": "scrn", "screenshots": "scrn",
+    "communication": "comm", "communications": "comms",
+    "repository": "repo", "repositories": "repos",
+    "attachment": "att", "implementation": "impl",
+    "maintenance": "maint", "certificate": "cert", "certificates": "certs",
+    "documento": "doc", "documenti": "docs", "documentazione": "docs",
+    "configurazione": "cfg", "applicazione": "app", "applicazioni": "apps",
+    "sviluppo": "dev", "produzione": "prod", "ambiente": "env",
+    "temporaneo": "tmp", "libreria": "lib", "librerie": "libs",
+    "risorsa": "res", "risorse": "res", "informazioni": "info",
+    "immagine": "img", "immagini": "img", "sorgente": "src",
+    "componente": "cmp", "componenti": "cmps",
+    "progetto": "prj", "progetti": "prjs",
+    "presentazione": "pres", "presentazioni": "pres",
+    "amministrazione": "admin", "gestione": "mgmt",
+    "archivio": "arch", "comunicazione": "comm", "comunicazioni": "comms",
+    "manutenzione": "maint", "certificato": "cert", "certificati": "certs",
+}
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RULE PROCESSOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RuleProcessor:
+    """Applica le regole di rinomina a un nome di file/cartella."""
+
+    @staticmethod
+    def apply_rules(name: str, rules: List[RenameRule], is_dir: bool) -> str:
+        for rule in rules:
+            if not rule.enabled:
+                continue
+            if is_dir and not rule.apply_to_dirs:
+                continue
+            if not is_dir and not rule.apply_to_files:
+                continue
+
+            # Per i file, separa nome ed estensione
+            if not is_dir:
+                base, ext = os.path.splitext(name)
+            else:
+                base, ext = name, ""
+
+            base = RuleProcessor._apply_single(base, rule)
+
+            # Sicurezza: non permettere nomi vuoti
+            if not base.strip():
+                base = "_renamed"
+
+            name = base + ext
+
+        return name
+
+    @staticmethod
+    def _apply_single(base: str, rule: RenameRule) -> str:
+        p = rule.params
+        rt = rule.rule_type
+
+        if rt == RuleType.FIND_REPLACE:
+            find = p.get("find", "")
+            repl = p.get("replace", "")
+            case_sensitive = p.get("case_sensitive", False)
+            if find:
+                if case_sensitive:
+                    base = base.replace(find, repl)
+                else:
+                    base = re.sub(re.escape(find), repl, base, flags=re.IGNORECASE)
+
+        elif rt == RuleType.TRUNCATE:
+            max_c = p.get("max_chars", 50)
+            if len(base) > max_c:
+                base = base[:max_c]
+
+        elif rt == RuleType.REMOVE_CHARS:
+            chars = p.get("chars", "")
+            for c in chars:
+                base = base.replace(c, "")
+
+        elif rt == RuleType.REMOVE_PREFIX:
+            prefix = p.get("prefix", "")
+            if prefix and base.startswith(prefix):
+                base = base[len(prefix):]
+
+        elif rt == RuleType.REMOVE_SUFFIX:
+            suffix = p.get("suffix", "")
+            if suffix and base.endswith(suffix):
+                base = base[:-len(suffix)]
+
+        elif rt == RuleType.COMPRESS_SEPARATORS:
+            char = p.get("char", "_")
+            if char:
+                pattern = re.escape(char) + "{2,}"
+                base = re.sub(pattern, char, base)
+                base = base.strip(char)
+
+        elif rt == RuleType.REGEX_REPLACE:
+            pattern = p.get("pattern", "")
+            repl = p.get("replace", "")
+            if pattern:
+                try:
+                    base = re.sub(pattern, repl, base)
+                except re.error:
+                    pass  # Regex invalida, skip
+
+        elif rt == RuleType.SMART_ABBREVIATE:
+            words = re.split(r'([_\-\s.]+)', base)
+            result = []
+            for w in words:
+                low = w.lower()
+                if low in SMART_ABBREV:
+                    abbr = SMART_ABBREV[low]
+                    # Mantieni il case originale se era capitalizzato
+                    if w[0].isupper() and len(w) > 0:
+                        abbr = abbr.capitalize()
+                    result.append(abbr)
+                else:
+                    result.append(w)
+            base = "".join(result)
+
+        return base
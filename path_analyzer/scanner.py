@@ -0,0 +1,980 @@
+# -*- coding: utf-8 -*-
+"""
+Scanner: visita dell'albero, statistiche, checkpoint e report Markdown.
+
+multiprocessing, pickle e sqlite3 si importano solo quando servono
+(processi, checkpoint, snapshot): la riga di comando parte più in fretta.
+"""
+
+import datetime
+import os
+import queue
+import signal
+import time
+from typing import TYPE_CHECKING, Optional
+
+from .listing import STAT_FROM_LISTING, ListingPool, read_entry
+from .models import DirInfo, DirSummary, Listing, PathLengthStats, ScanFrame, ScanStats, TopK
+from .timing import PhaseTiming, timing_path, write_timing
+from .tree import NodeView, ObjectTree, TreeStore, _pack_dir, _unpack_dir
+from .utils import ELBOW, FOLDER_ICON, PIPE, SPACE, TEE, format_date, format_size, get_file_icon, write_lines
+
+if TYPE_CHECKING:
+    from .snapshot import ScanSnapshot
+
+
+# ─── Checkpoint ──────────────────────────────────────────────────────────────
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.expanduser("~"), ".path_analyzer", "checkpoints")
+CHECKPOINT_VERSION = 3
+CHECKPOINT_COST_FACTOR = 10  # tra due checkpoint almeno 10 volte il tempo dell'ultima scrittura
+
+def default_checkpoint_path(root_path):
+    # Un checkpoint per radice, con un nome valido anche per path lunghi o UNC
+    import hashlib
+    digest = hashlib.sha1(os.path.abspath(root_path).encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    return os.path.join(DEFAULT_CHECKPOINT_DIR, f"{digest}.ckpt")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCANNER ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PathAnalyzer:
+
+    def __init__(self, root_path, max_depth=-1, exclude_dirs=None,
+                 show_hidden=True, top_n_files=15, path_limit=260,
+                 progress_callback=None, workers=1, processes=1, columnar=False,
+                 top_n_paths=10, top_n_deep_dirs=10, top_n_large_dirs=10,
+                 snapshot=None, incremental=False, checkpoint=None, checkpoint_interval=60.0,
+                 on_entry=None):
+        self.root_path = os.path.abspath(root_path)
+        self.max_depth = max_depth
+        self.exclude_dirs = set(exclude_dirs or [])
+        self.show_hidden = show_hidden
+        self.top_n_files = top_n_files
+        self.top_n_paths = top_n_paths
+        self.top_n_deep_dirs = top_n_deep_dirs
+        self.top_n_large_dirs = top_n_large_dirs
+        self.path_limit = path_limit
+        self.progress_callback = progress_callback
+        self.workers = workers
+        self.processes = processes
+        self.columnar = columnar
+        # snapshot: file SQLite in cui salvare la scansione; con incremental=True
+        # le cartelle non modificate dall'ultimo salvataggio non vengono rilette
+        self.snapshot = snapshot
+        self.incremental = incremental
+        # checkpoint: file in cui salvare periodicamente lo stato della visita
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        # on_entry(tipo, path, lunghezza, profondità, dimensione): chiamata per ogni
+        # voce nell'ordine della visita, anche con più processi ("DIR" senza dimensione)
+        self.on_entry = on_entry
+        # Con columnar=True l'albero sta in un TreeStore e root_dir è un NodeView
+        self.store: Optional[TreeStore] = TreeStore(self.root_path) if columnar else None
+        self.tree = self.store if columnar else ObjectTree()
+        # Classifiche a heap limitato: costo O(log K) per voce anche con K grandi
+        self.stats = ScanStats(
+            top_files=TopK(top_n_files),
+            top_deep_dirs=TopK(top_n_deep_dirs),
+            top_large_dirs=TopK(top_n_large_dirs),
+            path_stats=PathLengthStats(top_paths=TopK(top_n_paths)),
+        )
+        self.root_dir: Optional[DirInfo] = None
+        # Confronto con una scansione precedente (diff.ScanDiff): sezione in più nel report
+        self.scan_diff = None
+        self._cancel = False
+        self._pool: Optional[ListingPool] = None
+        self._shards: Optional[dict] = None
+        self._snapshot: Optional["ScanSnapshot"] = None
+        self._next_checkpoint = 0.0
+        # Attesa delle letture e dei sotto-alberi in altri processi durante la visita
+        self._waited = PhaseTiming()
+
+    def cancel(self):
+        self._cancel = True
+
+    def scan(self) -> Optional[DirInfo]:
+        self.stats.scan_start = time.time()
+        return self._run()
+
+    def resume(self, checkpoint) -> Optional[DirInfo]:
+        """
+        Riprende una scansione interrotta o annullata dal file di checkpoint.
+
+        L'analyzer deve avere la stessa radice e le stesse opzioni che
+        influenzano il risultato; thread, processi e callback possono
+        cambiare. Il checkpoint è un pickle: caricare solo file propri.
+        """
+        stack = self._restore_checkpoint(checkpoint)
+        return self._run(stack)
+
+    def _run(self, stack=None):
+        self._cancel = False
+        self._check_root()
+        self._next_checkpoint = time.monotonic() + self.checkpoint_interval
+
+        self._open_snapshot()
+        try:
+            if self.processes > 1:
+                self.root_dir = self._timed_visit(self._scan_sharded, stack)
+            else:
+                self.root_dir = self._timed_visit(self._scan_tree, self.root_path, 0, stack)
+            # Una scansione ripresa non ha riletto le cartelle già fatte:
+            # lo snapshot resta quello precedente
+            if not self._cancel and stack is None:
+                self._save_snapshot()
+        finally:
+            self._close_snapshot()
+
+        if self._cancel:
+            return None
+
+        self.stats.scan_end = time.time()
+        with self.stats.phases.measure("stats"):
+            self.stats.finalize()
+        self._remove_checkpoint()
+        return self.root_dir
+
+    def _timed_visit(self, visit, *args):
+        # Tempo della visita meno l'attesa delle letture (fasi "listing" e
+        # "stat", misurate da _list_directory) e dei sotto-alberi scansionati
+        # in altri processi: quel che resta è albero e statistiche, CPU nostra
+        self._waited = PhaseTiming()
+        start, cpu = time.perf_counter(), time.thread_time()
+        entries = self.stats.total_dirs + self.stats.total_files
+        try:
+            return visit(*args)
+        finally:
+            wall, cpu = time.perf_counter() - start, time.thread_time() - cpu
+            self.stats.phases.phase("stats").add(
+                max(0.0, wall - self._waited.wall), max(0.0, cpu - self._waited.cpu),
+                self.stats.total_dirs + self.stats.total_files - entries)
+
+    def _check_root(self):
+        if not os.path.exists(self.root_path):
+            raise FileNotFoundError(f"Il percorso '{self.root_path}' non esiste.")
+        if not os.path.isdir(self.root_path):
+            raise NotADirectoryError(f"'{self.root_path}' non è una directory.")
+
+    def _open_snapshot(self):
+        if self.snapshot:
+            from .snapshot import ScanSnapshot
+            self._snapshot = ScanSnapshot(self.snapshot, self.root_path, self.incremental)
+
+    def _save_snapshot(self):
+        if self._snapshot:
+            self._snapshot.save()
+
+    def _close_snapshot(self):
+        if self._snapshot:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def _scan_tree(self, dir_path, depth, stack=None):
+        # Con più worker le directory vengono lette in parallelo e in anticipo;
+        # l'albero e le statistiche restano costruiti in ordine deterministico.
+        if self.workers > 1:
+            self._pool = ListingPool(self._read_listing, self._subdirs_to_scan, self.workers)
+            self._pool.start(self._pending_dirs(stack) if stack else [(dir_path, depth)])
+        try:
+            if stack:
+                return self._walk(stack)
+            return self._scan_directory(dir_path, depth)
+        finally:
+            if self._pool:
+                self._pool.close()
+                self._pool = None
+
+    # ─── Visita ──────────────────────────────────────────────────────────
+    # Visita in profondità con uno stack esplicito di ScanFrame al posto
+    # della ricorsione: nessun limite di profondità e uno stato (stack,
+    # albero parziale, statistiche) che si può salvare e riprendere.
+
+    def _scan_directory(self, dir_path, depth):
+        start = self._open_frame(dir_path, depth)
+        if start is None:
+            return DirInfo(name="", path="")
+        if not isinstance(start, ScanFrame):
+            return start  # cartella illeggibile: già chiusa
+        return self._walk([start])
+
+    def _open_frame(self, dir_path, depth):
+        # Legge la cartella e la apre nell'albero. Restituisce il frame da
+        # visitare, la cartella già chiusa se illeggibile, None se annullata.
+        if self._cancel:
+            return None
+        start, cpu = time.perf_counter(), time.thread_time()
+        entries, error, syscalls, cached, timing = self._read_entries(dir_path, depth)
+        self._waited.add(time.perf_counter() - start, time.thread_time() - cpu)
+        if self._cancel:
+            return None
+
+        dir_name = os.path.basename(dir_path) or dir_path
+        path_len = len(dir_path)
+        tree = self.tree
+        dir_info = tree.open_dir(dir_name, dir_path, depth, path_len)
+
+        self.stats.total_dirs += 1
+        self.stats.max_depth = max(self.stats.max_depth, depth)
+        self.stats.path_stats.add(dir_path, path_len, "DIR")
+        if path_len > self.path_limit:
+            self.stats.path_stats.over_limit.append((dir_path, path_len, "DIR"))
+        if self.on_entry:
+            self.on_entry("DIR", dir_path, path_len, depth, None)
+
+        if self.progress_callback and self.stats.total_dirs % 20 == 0:
+            self.progress_callback(self.stats.total_dirs, self.stats.total_files)
+
+        self.stats.syscalls += syscalls
+        if timing:
+            list_wall, list_cpu, stat_wall, stat_cpu = timing
+            self.stats.phases.phase("listing").add(list_wall, list_cpu, 1)
+            self.stats.phases.phase("stat").add(stat_wall, stat_cpu, len(entries) if entries else 0)
+        if self._snapshot:
+            if cached:
+                self.stats.dirs_reused += 1
+            else:
+                self.stats.dirs_relisted += 1
+        if isinstance(error, PermissionError):
+            tree.set_error(dir_info, "Accesso negato")
+            self.stats.errors.append(f"Accesso negato: {dir_path}")
+            return tree.close_dir(dir_info)
+        if error is not None:
+            tree.set_error(dir_info, str(error))
+            self.stats.errors.append(f"Errore: {dir_path} → {error}")
+            return tree.close_dir(dir_info)
+
+        return ScanFrame(dir_info, dir_path, depth, entries)
+
+    def _walk(self, stack):
+        tree = self.tree
+        root = None
+        while stack:
+            if self._cancel:
+                break
+            if self.checkpoint and time.monotonic() >= self._next_checkpoint:
+                self._write_checkpoint(stack)
+
+            frame = stack[-1]
+            if frame.index == len(frame.entries):
+                stack.pop()
+                dir_info = tree.close_dir(frame.dir_info)
+                if stack:
+                    self._attach_subdir(stack[-1].dir_info, frame.path, frame.depth, dir_info)
+                else:
+                    root = dir_info
+                continue
+
+            entry = frame.entries[frame.index]
+            if (not self.show_hidden and entry.hidden) or entry.name in self.exclude_dirs:
+                frame.index += 1
+                continue
+
+            if entry.is_dir:
+                depth = frame.depth + 1
+                if self.max_depth >= 0 and frame.depth >= self.max_depth:
+                    frame.index += 1
+                    continue
+                if self._shards is not None and entry.path in self._shards:
+                    child = self._collect_shard(entry.path, depth)
+                else:
+                    child = self._open_frame(entry.path, depth)
+                if child is None:
+                    break  # annullata prima di leggerla: la voce resta da fare
+                frame.index += 1
+                if isinstance(child, ScanFrame):
+                    stack.append(child)
+                else:
+                    self._attach_subdir(frame.dir_info, entry.path, depth, child)
+            else:
+                frame.index += 1
+                if entry.is_file:
+                    self._add_file(frame.dir_info, entry, frame.depth + 1)
+
+        if self._cancel:
+            if self.checkpoint and stack:
+                self._write_checkpoint(stack)
+            return DirInfo(name="", path="")
+        return root
+
+    def _add_file(self, dir_info, entry, depth):
+        size = entry.size
+        ext = os.path.splitext(entry.name)[1].lower()
+        file_path_len = len(entry.path)
+
+        file_info = self.tree.add_file(dir_info, entry, ext, file_path_len)
+        self.stats.total_files += 1
+        self.stats.total_size += size
+        self.stats.extensions[ext if ext else "(nessuna)"] += 1
+        self.stats.ext_sizes[ext if ext else "(nessuna)"] += size
+        self.stats.path_stats.add(entry.path, file_path_len, "FILE")
+        if file_path_len > self.path_limit:
+            self.stats.path_stats.over_limit.append((entry.path, file_path_len, "FILE"))
+        self.stats.top_files.push(size, file_info)
+        if self.on_entry:
+            self.on_entry("FILE", entry.path, file_path_len, depth, size)
+
+    def _attach_subdir(self, dir_info, dir_path, depth, subdir):
+        # Classifiche cartelle: riepiloghi leggeri, non l'intero sotto-albero
+        deep, large = self.stats.top_deep_dirs, self.stats.top_large_dirs
+        if deep.accepts(depth) or large.accepts(subdir.total_size):
+            summary = DirSummary(dir_path, depth, subdir.total_files, subdir.total_size)
+            deep.push(depth, summary)
+            large.push(subdir.total_size, summary)
+        self.tree.add_subdir(dir_info, subdir)
+
+    def _pending_dirs(self, stack):
+        # Sottocartelle ancora da visitare, nell'ordine in cui verranno chieste
+        pending = []
+        for frame in reversed(stack):
+            remaining = Listing(frame.entries[frame.index:], None, 0)
+            pending.extend(self._subdirs_to_scan(remaining, frame.depth))
+        return pending
+
+    # ─── Checkpoint ──────────────────────────────────────────────────────
+
+    def _checkpoint_options(self):
+        # Opzioni che cambiano il risultato: devono coincidere per riprendere
+        return dict(
+            max_depth=self.max_depth, exclude_dirs=sorted(self.exclude_dirs),
+            show_hidden=self.show_hidden, path_limit=self.path_limit,
+            top_n_files=self.top_n_files, top_n_paths=self.top_n_paths,
+            top_n_deep_dirs=self.top_n_deep_dirs, top_n_large_dirs=self.top_n_large_dirs,
+            columnar=self.columnar,
+        )
+
+    def _write_checkpoint(self, stack):
+        import pickle
+        # Cartelle aperte in forma piatta (_pack_dir): un DirInfo con i
+        # sotto-alberi già chiusi è annidato per livello e pickle ricorrerebbe
+        # su ognuno. Nell'albero colonnare la vista è solo un indice nello store
+        frames = [(frame.path, frame.depth, frame.entries, frame.index,
+                   frame.dir_info if self.columnar else _pack_dir(frame.dir_info))
+                  for frame in stack]
+        state = dict(
+            version=CHECKPOINT_VERSION, root_path=self.root_path,
+            options=self._checkpoint_options(), elapsed=time.time() - self.stats.scan_start,
+            frames=frames, tree=self.tree, stats=self.stats,
+        )
+        # Scrittura atomica: un'interruzione durante il salvataggio lascia il checkpoint precedente
+        started = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint)), exist_ok=True)
+        tmp_path = self.checkpoint + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.checkpoint)
+        # Ogni scrittura costa quanto l'albero parziale: l'intervallo cresce con
+        # lei, così i checkpoint non prendono più di ~1/10 della scansione
+        now = time.monotonic()
+        self._next_checkpoint = now + max(self.checkpoint_interval, CHECKPOINT_COST_FACTOR * (now - started))
+
+    def _restore_checkpoint(self, checkpoint):
+        import pickle
+        with open(checkpoint, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Checkpoint '{checkpoint}' non compatibile con questa versione.")
+        if state["root_path"] != self.root_path:
+            raise ValueError(f"Il checkpoint riguarda '{state['root_path']}', non '{self.root_path}'.")
+        if state["options"] != self._checkpoint_options():
+            raise ValueError("Il checkpoint è stato creato con opzioni di scansione diverse.")
+
+        self.tree = state["tree"]
+        self.store = self.tree if self.columnar else None
+        self.stats = state["stats"]
+        # Il tempo già speso conta, l'interruzione no
+        self.stats.scan_start = time.time() - state["elapsed"]
+        self.checkpoint = self.checkpoint or checkpoint
+        return [ScanFrame(dir_info if self.columnar else _unpack_dir(dir_info, path, depth),
+                          path, depth, entries, index)
+                for path, depth, entries, index, dir_info in state["frames"]]
+
+    def _remove_checkpoint(self):
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+    # ─── Scansione Multiprocesso ─────────────────────────────────────────
+    # Ogni sotto-albero di primo livello viene scansionato in un processo
+    # separato; il processo principale legge solo la root e unisce i
+    # risultati nell'ordine della visita seriale.
+
+    def _scan_sharded(self, stack=None):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        ctx = multiprocessing.get_context("spawn")
+        self._cancel_event = ctx.Event()
+        self._progress_queue = ctx.Queue()
+        self._shard_progress = {}
+        self._shard_executor = ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=ctx,
+            initializer=_init_shard_worker, initargs=(self._cancel_event, self._progress_queue),
+        )
+        self._shards = {}
+        try:
+            if stack:
+                # Ripresa: in processi separati le cartelle di primo livello non ancora visitate
+                self._submit_shards(Listing(stack[0].entries[stack[0].index:], None, 0))
+                return self._walk(stack)
+            return self._scan_directory(self.root_path, 0)
+        finally:
+            if self._cancel:
+                self._cancel_event.set()
+            # cancel_futures di shutdown() richiede Python 3.9
+            for future in self._shards.values():
+                future.cancel()
+            self._shard_executor.shutdown(wait=True)
+            self._shards = None
+
+    def _submit_shards(self, listing):
+        options = dict(
+            max_depth=self.max_depth, exclude_dirs=list(self.exclude_dirs),
+            show_hidden=self.show_hidden, top_n_files=self.top_n_files, top_n_paths=self.top_n_paths,
+            top_n_deep_dirs=self.top_n_deep_dirs, top_n_large_dirs=self.top_n_large_dirs,
+            path_limit=self.path_limit, workers=self.workers, columnar=self.columnar,
+        )
+        snapshot = (self.snapshot, self.root_path, self.incremental) if self._snapshot else None
+        for path, depth in self._subdirs_to_scan(listing, 0):
+            self._shards[path] = self._shard_executor.submit(_scan_shard, options, path, depth, snapshot)
+
+    def _collect_shard(self, dir_path, depth):
+        from concurrent.futures import TimeoutError as FutureTimeout
+        future = self._shards.pop(dir_path)
+        start, cpu = time.perf_counter(), time.thread_time()
+        while True:
+            if self._cancel:
+                self._cancel_event.set()
+                return None
+            try:
+                packed, stats, snapshot_rows = future.result(timeout=0.2)
+                break
+            except FutureTimeout:
+                self._report_shard_progress()
+        self._waited.add(time.perf_counter() - start, time.thread_time() - cpu)
+
+        self._shard_progress.pop(dir_path, None)
+        self.stats.merge(stats)
+        if self._snapshot:
+            self._snapshot.extend(snapshot_rows)
+        subdir = self.tree.unpack(packed, dir_path, depth)
+        if self.on_entry:
+            self._replay_entries(subdir)
+        return subdir
+
+    def _replay_entries(self, dir_info):
+        # Voci di un sotto-albero già scansionato, nello stesso ordine della
+        # visita seriale: la cartella, i suoi sotto-alberi, poi i suoi file
+        stack = [dir_info]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, tuple):
+                depth, f = item
+                self.on_entry("FILE", f.path, f.path_length, depth, f.size)
+                continue
+            self.on_entry("DIR", item.path, item.path_length, item.depth, None)
+            stack.extend((item.depth + 1, f) for f in reversed(item.files))
+            stack.extend(reversed(item.subdirs))
+
+    def _report_shard_progress(self):
+        try:
+            while True:
+                path, dirs, files = self._progress_queue.get_nowait()
+                if path in self._shards:
+                    self._shard_progress[path] = (dirs, files)
+        except queue.Empty:
+            pass
+        if self.progress_callback:
+            dirs = self.stats.total_dirs + sum(d for d, _ in self._shard_progress.values())
+            files = self.stats.total_files + sum(f for _, f in self._shard_progress.values())
+            self.progress_callback(dirs, files)
+
+    # ─── Lettura Directory ───────────────────────────────────────────────
+
+    def _read_entries(self, dir_path, depth):
+        if self._pool:
+            listing = self._pool.take(dir_path, depth)
+        else:
+            listing = self._read_listing(dir_path)
+        if self._shards is not None and depth == 0:
+            self._submit_shards(listing)
+        return listing
+
+    def _read_listing(self, dir_path):
+        if self._snapshot:
+            return self._snapshot.list_directory(dir_path, self._list_directory)
+        return self._list_directory(dir_path)
+
+    @staticmethod
+    def _list_directory(dir_path):
+        # Tipo, dimensione, data e attributo nascosto arrivano tutti dal
+        # DirEntry: una lettura della directory più, su POSIX, una lstat per file.
+        # Prima l'elenco, poi i metadati: i due tempi finiscono in fasi diverse.
+        entries, syscalls = [], 1
+        start, cpu = time.perf_counter(), time.thread_time()
+        try:
+            with os.scandir(dir_path) as it:
+                listed = list(it)
+        except OSError as e:
+            return Listing(None, e, syscalls, timing=(time.perf_counter() - start, time.thread_time() - cpu, 0.0, 0.0))
+        list_end, list_cpu = time.perf_counter(), time.thread_time()
+        for entry in listed:
+            try:
+                info = read_entry(entry)
+            except OSError:
+                continue
+            entries.append(info)
+            if info.is_file and not STAT_FROM_LISTING:
+                syscalls += 1
+        entries.sort(key=lambda e: (not e.is_dir, e.name.lower()))
+        timing = (list_end - start, list_cpu - cpu, time.perf_counter() - list_end, time.thread_time() - list_cpu)
+        return Listing(entries, None, syscalls, timing=timing)
+
+    def _subdirs_to_scan(self, listing, depth):
+        # Stessi filtri di _scan_directory: usata dai worker per sapere
+        # quali sottocartelle leggere in anticipo.
+        if listing.error is not None or self._cancel:
+            return []
+        if self.max_depth >= 0 and depth >= self.max_depth:
+            return []
+        subdirs = []
+        for entry in listing.entries:
+            if not self.show_hidden and entry.hidden:
+                continue
+            if entry.name in self.exclude_dirs:
+                continue
+            if entry.is_dir:
+                subdirs.append((entry.path, depth + 1))
+        return subdirs
+
+    # ─── Albero Pulito ───────────────────────────────────────────────────
+    # I renderer sono generatori con uno stack esplicito: ogni riga viene
+    # prodotta una sola volta, senza limiti di profondità, e chi li usa
+    # (report, GUI, riga di comando) la consuma man mano.
+
+    def iter_clean_tree(self, dir_info):
+        yield dir_info.name
+        for prefix, connector, is_dir, item in self._walk_tree(dir_info):
+            yield f"{prefix}{connector}{item.name}"
+
+    def build_clean_tree(self, dir_info):
+        return list(self.iter_clean_tree(dir_info))
+
+    # ─── Albero Dettagliato ──────────────────────────────────────────────
+
+    def iter_detail_tree(self, dir_info):
+        yield f"{FOLDER_ICON} {dir_info.name}/  [{format_size(dir_info.total_size)}] (path: {dir_info.path_length} chars)"
+        for prefix, connector, is_dir, item in self._walk_tree(dir_info):
+            if is_dir:
+                size_str = f"  [{format_size(item.total_size)}]" if item.total_size > 0 else ""
+                error_str = f"  ⚠️ {item.error}" if item.error else ""
+                warn = " ❌" if item.path_length > self.path_limit else ""
+                yield f"{prefix}{connector}{FOLDER_ICON} {item.name}/{size_str}  (path: {item.path_length} chars){warn}{error_str}"
+            else:
+                icon = get_file_icon(item.extension)
+                warn = " ❌" if item.path_length > self.path_limit else ""
+                yield f"{prefix}{connector}{icon} {item.name}  ({format_size(item.size)}, path: {item.path_length} chars){warn}"
+
+    def build_detail_tree(self, dir_info):
+        return list(self.iter_detail_tree(dir_info))
+
+    def _walk_tree(self, dir_info):
+        # Pre-ordine (prefisso, connettore, is_dir, voce): sottocartelle prima dei file
+        stack = [(self._tree_children(dir_info), "")]
+        while stack:
+            children, prefix = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+            is_dir, is_last, item = child
+            yield prefix, ELBOW if is_last else TEE, is_dir, item
+            if is_dir:
+                stack.append((self._tree_children(item), prefix + (SPACE if is_last else PIPE)))
+
+    @staticmethod
+    def _tree_children(dir_info):
+        subdirs, files = dir_info.subdirs, dir_info.files
+        last = len(subdirs) + len(files) - 1
+        for i, sub in enumerate(subdirs):
+            yield True, i == last, sub
+        for i, f in enumerate(files, len(subdirs)):
+            yield False, i == last, f
+
+    # ─── Genera Report MD ────────────────────────────────────────────────
+
+    def generate_report(self, output_path, fmt=None, timing=True):
+        # fmt: "md" o "html"; di default dall'estensione di output_path.
+        # timing: tempi per fase anche in un JSON accanto (report.timing.json)
+        if self.root_dir is None:
+            return None
+        if fmt is None:
+            fmt = "html" if output_path.lower().endswith((".html", ".htm")) else "md"
+        # Scrittura su file misurata a parte: il resto è rendering delle righe.
+        # Ogni report sostituisce i tempi del precedente
+        self._reset_report_phases()
+        written = PhaseTiming()
+        with self.stats.phases.measure("render", self.stats.total_dirs + self.stats.total_files):
+            if fmt == "html":
+                from .html_report import write_html_report
+                write_html_report(self, output_path)
+            else:
+                write_lines(output_path, self.report_lines(), timing=written)
+        if written.wall:
+            self.stats.phases.move("render", "write", written)
+        if timing:
+            self.write_timing(timing_path(output_path))
+        return output_path
+
+    def _reset_report_phases(self):
+        for name in ("render", "write"):
+            self.stats.phases.pop(name, None)
+
+    def write_timing(self, path):
+        """Tempi per fase in JSON (timing.py), accanto al report o dove serve."""
+        s = self.stats
+        return write_timing(
+            path, s.phases, root_path=self.root_path, scan_seconds=round(s.scan_end - s.scan_start, 4),
+            dirs=s.total_dirs, files=s.total_files, total_size=s.total_size, syscalls=s.syscalls,
+            workers=self.workers, processes=self.processes, columnar=self.columnar)
+
+    def generate_sharded_report(self, output_dir, max_shard_bytes=None, processes=None):
+        """
+        Report a pezzi in output_dir: un riepilogo (index.md) e, per ogni
+        cartella di primo livello, albero e indice dei file in file separati
+        di al massimo max_shard_bytes, generati in parallelo. Vedi shards.py.
+        """
+        if self.root_dir is None:
+            return None
+        from .shards import DEFAULT_SHARD_BYTES, write_sharded_report
+        self._reset_report_phases()
+        with self.stats.phases.measure("render", self.stats.total_dirs + self.stats.total_files):
+            result = write_sharded_report(self, output_dir, max_shard_bytes or DEFAULT_SHARD_BYTES, processes)
+        self.write_timing(os.path.join(output_dir, "timing.json"))
+        return result
+
+    def report_lines(self, now=None):
+        # Righe del report, sezione per sezione: generate_report le scrive
+        # man mano, senza comporre l'intero documento in memoria
+        if now is None:
+            now = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        yield from self.summary_lines(now)
+
+        # ALBERO PULITO
+        yield "---"
+        yield ""
+        yield "## 🌳 Struttura Directory"
+        yield ""
+        yield "### Vista Pulita"
+        yield ""
+        yield "```"
+        yield from self.iter_clean_tree(self.root_dir)
+        yield "```"
+        yield ""
+
+        # ALBERO DETTAGLIATO
+        yield "### Vista Dettagliata"
+        yield ""
+        yield "```"
+        yield from self.iter_detail_tree(self.root_dir)
+        yield "```"
+        yield ""
+        yield f"> ❌ = path oltre {self.path_limit} caratteri"
+        yield ""
+
+        # INDICE FILE
+        yield "---"
+        yield ""
+        yield "## 📋 Indice Completo"
+        yield ""
+        yield from self._file_index(self.root_dir)
+        yield ""
+
+        # TEMPI (il report stesso è ancora in corso: le sue fasi sono nel JSON accanto)
+        if self.stats.phases:
+            yield "---"
+            yield ""
+            yield from self.stats.phases.report_lines()
+
+        # FOOTER
+        yield "---"
+        yield f"*Path Analyzer v3.0 GUI — {now} — Soglia: {self.path_limit} chars*"
+        yield ""
+
+    def compare_with(self, previous, changes_path=None):
+        """
+        Confronta la scansione con una precedente esportata (.db, .csv,
+        .ndjson) e aggiunge il risultato al report. Vedi diff.py.
+        """
+        if self.root_dir is None:
+            return None
+        from .diff import diff_scans
+        self.scan_diff = diff_scans(previous, self, changes_path, self.path_limit)
+        return self.scan_diff
+
+    def summary_lines(self, now, over_limit_link=None):
+        # Tutte le sezioni prima della struttura: intestazione, statistiche, top ed errori.
+        # Con over_limit_link la tabella dei path oltre soglia è un file a parte (report a pezzi)
+        elapsed = self.stats.scan_end - self.stats.scan_start
+        ps = self.stats.path_stats
+        path_type = "🌐 Percorso di rete (UNC)" if self.root_path.startswith("\\\\") else "💻 Percorso locale"
+
+        # HEADER
+        yield "# 📂 Path Analyzer Report"
+        yield ""
+        yield f"> Report generato il **{now}** — Path Analyzer v3.0 GUI"
+        yield ""
+        yield "---"
+        yield ""
+
+        # INFO
+        yield "## ℹ️ Informazioni Percorso"
+        yield ""
+        yield "| Proprietà | Valore |"
+        yield "|-----------|--------|"
+        yield f"| **Percorso analizzato** | `{self.root_path}` |"
+        yield f"| **Tipo** | {path_type} |"
+        yield f"| **Lunghezza percorso root** | {len(self.root_path)} caratteri |"
+        yield f"| **Tempo di scansione** | {elapsed:.2f} secondi |"
+        yield f"| **Profondità massima** | {self.stats.max_depth} livelli |"
+        yield f"| **Soglia lunghezza path** | {self.path_limit} caratteri |"
+        if self.max_depth >= 0:
+            yield f"| **Limite profondità** | {self.max_depth} livelli |"
+        if self.exclude_dirs:
+            yield f"| **Cartelle escluse** | `{'`, `'.join(self.exclude_dirs)}` |"
+        yield f"| **File nascosti** | {'Inclusi' if self.show_hidden else 'Esclusi'} |"
+        if self.workers > 1:
+            yield f"| **Thread di lettura** | {self.workers} |"
+        if self.processes > 1:
+            yield f"| **Processi di scansione** | {self.processes} |"
+        yield ""
+
+        # RIEPILOGO
+        yield "## 📊 Riepilogo Generale"
+        yield ""
+        yield "| Metrica | Valore |"
+        yield "|---------|--------|"
+        yield f"| 📁 **Cartelle totali** | {self.stats.total_dirs:,} |"
+        yield f"| 📄 **File totali** | {self.stats.total_files:,} |"
+        yield f"| 💾 **Dimensione totale** | {format_size(self.stats.total_size)} |"
+        yield f"| 📏 **Profondità albero** | {self.stats.max_depth} livelli |"
+        yield f"| 🏷️ **Tipi di file unici** | {len(self.stats.extensions)} estensioni |"
+        yield f"| 📐 **Path medio** | {ps.avg_length:.0f} caratteri |"
+        yield f"| 📐 **Path mediano** | {ps.median_length} caratteri |"
+        yield f"| 🔴 **Path oltre soglia ({self.path_limit})** | **{len(ps.over_limit)}** |"
+        yield ""
+
+        # ANALISI PATH
+        yield "## 📐 Analisi Lunghezza Percorsi"
+        yield ""
+        yield f"> Soglia: **{self.path_limit} caratteri** (MAX_PATH Windows = 260)"
+        yield ""
+
+        yield "### Distribuzione"
+        yield ""
+        range_order = ["0-50", "51-100", "101-150", "151-200", "201-260", "261-300", "300+"]
+        total_paths = ps.total_paths or 1
+        yield "| Range | Conteggio | % | Distribuzione |"
+        yield "|-------|-----------|---|---------------|"
+        for r in range_order:
+            count = ps.distribution.get(r, 0)
+            pct = count / total_paths * 100
+            bar = "█" * max(0, int(pct / 2))
+            marker = " 🔴" if r in ("261-300", "300+") and count > 0 else ""
+            yield f"| `{r}` | {count:,} | {pct:.1f}% | {bar}{marker} |"
+        yield ""
+
+        # Top 10 path più lunghi
+        all_sorted = ps.longest_paths
+        if all_sorted:
+            yield f"### 🏆 Top {self.top_n_paths} Percorsi più Lunghi"
+            yield ""
+            yield "| # | Tipo | Lunghezza | Stato | Percorso |"
+            yield "|---|------|-----------|-------|----------|"
+            for i, (path, length, ptype) in enumerate(all_sorted, 1):
+                tipo = "📁 DIR" if ptype == "DIR" else "📄 FILE"
+                stato = "🔴 OLTRE" if length > self.path_limit else "✅ OK"
+                try:
+                    rel = os.path.relpath(path, self.root_path)
+                except ValueError:
+                    rel = path
+                yield f"| {i} | {tipo} | **{length}** | {stato} | `{rel}` |"
+            yield ""
+
+        # Path oltre soglia
+        if ps.over_limit:
+            yield f"### 🔴 Percorsi Oltre la Soglia ({self.path_limit} caratteri)"
+            yield ""
+            yield f"> **{len(ps.over_limit)}** percorsi problematici trovati."
+            yield ""
+            if over_limit_link:
+                yield f"➡️ [Elenco completo dei percorsi oltre soglia]({over_limit_link})"
+                yield ""
+            else:
+                yield from self.over_limit_lines()
+        else:
+            yield "### ✅ Nessun Percorso Oltre la Soglia"
+            yield ""
+            yield f"> Tutti i {ps.total_paths:,} percorsi sono entro {self.path_limit} caratteri."
+            yield ""
+
+        # Path più lunghi per tipo
+        if ps.longest_file_path:
+            w = " 🔴" if ps.longest_file_length > self.path_limit else " ✅"
+            yield f"**File più lungo** ({ps.longest_file_length} chars){w}"
+            yield "```"
+            yield ps.longest_file_path
+            yield "```"
+            yield ""
+        if ps.longest_dir_path:
+            w = " 🔴" if ps.longest_dir_length > self.path_limit else " ✅"
+            yield f"**Cartella più lunga** ({ps.longest_dir_length} chars){w}"
+            yield "```"
+            yield ps.longest_dir_path
+            yield "```"
+            yield ""
+
+        # ESTENSIONI
+        yield "## 🏷️ Distribuzione per Estensione"
+        yield ""
+        sorted_exts = sorted(self.stats.extensions.items(), key=lambda x: x[1], reverse=True)
+        if sorted_exts:
+            yield "| Estensione | Conteggio | Dimensione | % |"
+            yield "|------------|-----------|------------|---|"
+            for ext, count in sorted_exts[:25]:
+                size = self.stats.ext_sizes.get(ext, 0)
+                pct = (count / self.stats.total_files * 100) if self.stats.total_files > 0 else 0
+                icon = get_file_icon(ext) if ext != "(nessuna)" else "❓"
+                bar = "█" * max(1, int(pct / 3))
+                yield f"| {icon} `{ext}` | {count:,} | {format_size(size)} | {bar} {pct:.1f}% |"
+            yield ""
+
+        # FILE PIÙ GRANDI
+        if self.stats.largest_files:
+            yield f"## 📏 Top {len(self.stats.largest_files)} File più Grandi"
+            yield ""
+            yield "| # | File | Dimensione | Path Length | Percorso |"
+            yield "|---|------|------------|------------|----------|"
+            for i, f in enumerate(self.stats.largest_files, 1):
+                icon = get_file_icon(f.extension)
+                try:
+                    rel = os.path.relpath(os.path.dirname(f.path), self.root_path)
+                    rel = "/" if rel == "." else f"/{rel}/"
+                except ValueError:
+                    rel = os.path.dirname(f.path)
+                w = " 🔴" if f.path_length > self.path_limit else ""
+                yield f"| {i} | {icon} `{f.name}` | **{format_size(f.size)}** | {f.path_length}{w} | `{rel}` |"
+            yield ""
+
+        # CARTELLE PIÙ GRANDI
+        if self.stats.largest_dirs:
+            yield f"## 📂 Top {len(self.stats.largest_dirs)} Cartelle più Grandi"
+            yield ""
+            yield "| # | Cartella | Dimensione | File | Profondità |"
+            yield "|---|----------|------------|------|------------|"
+            for i, d in enumerate(self.stats.largest_dirs, 1):
+                try:
+                    rel = os.path.relpath(d.path, self.root_path)
+                except ValueError:
+                    rel = d.path
+                yield f"| {i} | {FOLDER_ICON} `{rel}` | **{format_size(d.total_size)}** | {d.total_files:,} | {d.depth} |"
+            yield ""
+
+        # CARTELLE PIÙ PROFONDE
+        if self.stats.deepest_dirs:
+            yield f"## 🕳️ Top {len(self.stats.deepest_dirs)} Cartelle più Profonde"
+            yield ""
+            yield "| # | Profondità | Path Length | Cartella |"
+            yield "|---|------------|-------------|----------|"
+            for i, d in enumerate(self.stats.deepest_dirs, 1):
+                try:
+                    rel = os.path.relpath(d.path, self.root_path)
+                except ValueError:
+                    rel = d.path
+                w = " 🔴" if len(d.path) > self.path_limit else ""
+                yield f"| {i} | {d.depth} | {len(d.path)}{w} | `{rel}` |"
+            yield ""
+
+        # ERRORI
+        if self.stats.errors:
+            yield "## ⚠️ Errori"
+            yield ""
+            for err in self.stats.errors[:20]:
+                yield f"- {err}"
+            if len(self.stats.errors) > 20:
+                yield f"- *+{len(self.stats.errors) - 20} altri*"
+            yield ""
+
+        # CONFRONTO
+        if self.scan_diff is not None:
+            yield from self.scan_diff.report_lines()
+
+    def over_limit_lines(self):
+        yield "| # | Tipo | Lunghezza | Eccesso | Percorso |"
+        yield "|---|------|-----------|---------|----------|"
+        for i, (path, length, ptype) in enumerate(self.stats.path_stats.over_limit, 1):
+            tipo = "📁" if ptype == "DIR" else "📄"
+            yield f"| {i} | {tipo} | **{length}** | +{length - self.path_limit} | `{path}` |"
+        yield ""
+
+    def _file_index(self, dir_info, rel_prefix=""):
+        # Stack esplicito: stesso ordine della visita ricorsiva, senza limiti di profondità.
+        # rel_prefix: percorso relativo della cartella che contiene dir_info (report a pezzi)
+        stack = [(dir_info, rel_prefix)]
+        while stack:
+            dir_info, rel_prefix = stack.pop()
+            current = os.path.join(rel_prefix, dir_info.name) if rel_prefix else dir_info.name
+            files = dir_info.files
+            if files:
+                yield f"### {FOLDER_ICON} `{current}/`"
+                yield ""
+                yield "| File | Ext | Dimensione | Path Len | Modificato |"
+                yield "|------|-----|------------|----------|------------|"
+                for f in sorted(files, key=lambda x: x.name.lower()):
+                    icon = get_file_icon(f.extension)
+                    ext = f.extension or "—"
+                    w = " 🔴" if f.path_length > self.path_limit else ""
+                    yield f"| {icon} {f.name} | `{ext}` | {format_size(f.size)} | {f.path_length}{w} | {format_date(f.modified)} |"
+                yield ""
+            stack.extend((sub, current) for sub in reversed(dir_info.subdirs))
+
+
+# ─── Worker Multiprocesso ────────────────────────────────────────────────────
+# Funzioni a livello di modulo: devono essere importabili dai processi figli.
+# Evento di annullamento e coda di progresso arrivano una volta per processo.
+
+_shard_cancel_event = None
+_shard_progress_queue = None
+
+def _init_shard_worker(cancel_event, progress_queue):
+    global _shard_cancel_event, _shard_progress_queue
+    _shard_cancel_event = cancel_event
+    _shard_progress_queue = progress_queue
+    # Ctrl+C arriva a tutto il gruppo di processi: l'annullamento passa dal padre
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Il progresso è solo informativo: all'uscita non attendere lo svuotamento
+    progress_queue.cancel_join_thread()
+
+def _scan_shard(options, dir_path, depth, snapshot=None):
+    analyzer = PathAnalyzer(dir_path, **options)
+    if snapshot:
+        # Stesso snapshot del padre, in sola lettura: le righe nuove tornano con il risultato
+        from .snapshot import ScanSnapshot
+        db_path, root_path, incremental = snapshot
+        analyzer._snapshot = ScanSnapshot(db_path, root_path, incremental, shard=True)
+
+    def report(dirs, files):
+        _shard_progress_queue.put((dir_path, dirs, files))
+        if _shard_cancel_event.is_set():
+            analyzer.cancel()
+
+    analyzer.progress_callback = report
+    try:
+        dir_info = analyzer._timed_visit(analyzer._scan_tree, dir_path, depth)
+        snapshot_rows = analyzer._snapshot.take_pending() if analyzer._snapshot else []
+    finally:
+        analyzer._close_snapshot()
+    if analyzer.columnar:
+        # Le viste terrebbero in vita la copia dello store nel processo principale
+        analyzer.stats.top_files.convert(NodeView.to_info)
+    return analyzer.tree.pack(dir_info), analyzer.stats, snapshot_rows
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Report a pezzi per alberi enormi.
+
+Il report Markdown unico, con "Indice Completo" e albero dettagliato,
+supera presto quello che un visualizzatore riesce ad aprire. Qui il
+report diventa una cartella:
+
+    index.md                    riepilogo (le sezioni di summary_lines) e
+                                tabella delle cartelle di primo livello
+    001_Progetti.tree.md        vista pulita e dettagliata di Progetti/
+    001_Progetti.index.md       indice dei file di Progetti/
+    001_Progetti.index.002.md   ... continua, oltre max_shard_bytes
+    000_radice.index.md         file direttamente nella radice
+    oltre_soglia.md             tabella completa dei path oltre soglia
+
+Ogni file resta entro max_shard_bytes: superata la soglia si passa alla
+parte successiva, con i collegamenti avanti e indietro. Le cartelle di
+primo livello si scrivono in parallelo, in processi separati che ricevono
+il sotto-albero come lista piatta in pre-ordine (_pack_dir): qualunque
+profondita, senza ricorsione ne in pickle ne nella ricostruzione.
+"""
+
+import datetime
+import os
+import re
+
+from .models import DirInfo
+from .scanner import PathAnalyzer
+from .tree import _pack_dir, _unpack_dir
+from .utils import FOLDER_ICON, format_size
+
+DEFAULT_SHARD_BYTES = 8 * 1024 * 1024
+MIN_SHARD_BYTES = 64 * 1024
+SUMMARY_NAME = "index.md"
+OVER_LIMIT_BASE = "oltre_soglia"
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCRITTURA A PARTI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ShardWriter:
+    """
+    Scrive righe in <base>.md, <base>.002.md, ... senza superare max_bytes
+    per file. Un blocco ``` aperto al cambio di parte si chiude e si
+    riapre nella parte successiva; una tabella aperta riprende con la
+    sua intestazione.
+    """
+
+    # Spazio tenuto libero per la riga "continua" in fondo alla parte
+    RESERVE = 512
+    FLUSH_BYTES = 1 << 20
+
+    def __init__(self, directory, base, title, back_link, max_bytes):
+        self.directory = directory
+        self.base = base
+        self.title = title
+        self.back_link = back_link
+        self.max_bytes = max(max_bytes, MIN_SHARD_BYTES)
+        self.parts = []
+        self.in_fence = False
+        self._table = None  # intestazione della tabella in corso
+        self._last = ""
+        self._file = None
+        self._open_part()
+
+    def part_name(self, number):
+        return f"{self.base}.md" if number == 1 else f"{self.base}.{number:03d}.md"
+
+    def write(self, line):
+        data = (line + "\n").encode("utf-8", "backslashreplace")
+        if self._size + len(data) > self.max_bytes - self.RESERVE and self._body:
+            self._next_part()
+        self._buffer.append(data)
+        self._pending += len(data)
+        self._size += len(data)
+        self._body += 1
+        if line.startswith("```"):
+            self.in_fence = not self.in_fence
+        elif not line.startswith("|"):
+            self._table = None
+        elif line.startswith("|---") and self._last.startswith("|"):
+            self._table = (self._last, line)
+        self._last = line
+        if self._pending >= self.FLUSH_BYTES:
+            self._flush()
+
+    def write_lines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def close(self):
+        if self._file is not None:
+            self._flush()
+            self._file.close()
+            self._file = None
+        return self.parts
+
+    def _open_part(self):
+        number = len(self.parts) + 1
+        name = self.part_name(number)
+        self.parts.append(name)
+        self._file = open(os.path.join(self.directory, name), "wb")
+        self._buffer, self._pending, self._size, self._body = [], 0, 0, 0
+        links = f"[← Riepilogo]({self.back_link})"
+        if number > 1:
+            links += f" · [← Parte {number - 1}]({self.part_name(number - 1)})"
+        title = self.title if number == 1 else f"{self.title} (parte {number})"
+        for line in (f"# {title}", "", f"> {links}", ""):
+            self._raw(line)
+
+    def _next_part(self):
+        fence = self.in_fence
+        if fence:
+            self._raw("```")
+        self._raw("")
+        self._raw(f"> [Continua → parte {len(self.parts) + 1}]({self.part_name(len(self.parts) + 1)})")
+        self._flush()
+        self._file.close()
+        self._open_part()
+        if fence:
+            self._raw("```")
+        elif self._table:
+            for line in self._table:
+                self._raw(line)
+
+    def _raw(self, line):
+        # Righe di servizio: non contano come contenuto della parte
+        data = (line + "\n").encode("utf-8", "backslashreplace")
+        self._buffer.append(data)
+        self._pending += len(data)
+        self._size += len(data)
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer, self._pending = [], 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORT A PEZZI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def shard_base(number, name):
+    # Nome di file portabile: niente spazi né caratteri riservati nei link Markdown
+    safe = _UNSAFE.sub("_", name).strip("._")[:40] or "cartella"
+    return f"{number:03d}_{safe}"
+
+
+def write_sharded_report(analyzer, output_dir, max_shard_bytes=DEFAULT_SHARD_BYTES, processes=None):
+    """
+    Scrive il report a pezzi di analyzer in output_dir e restituisce il
+    percorso del riepilogo. processes: processi per le cartelle di primo
+    livello (None = uno per CPU, 1 = tutto nel processo corrente).
+    """
+    root = analyzer.root_dir
+    now = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    os.makedirs(output_dir, exist_ok=True)
+
+    subdirs = list(root.subdirs)
+    tasks = [(shard_base(i, sub.name), sub) for i, sub in enumerate(subdirs, 1)]
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+
+    parts = {}
+    if processes > 1:
+        parts.update(_render_parallel(analyzer, tasks, output_dir, max_shard_bytes, now, processes, root))
+    else:
+        for base, sub in tasks:
+            parts[base] = _render_shard(analyzer, sub, base, root.name, output_dir, max_shard_bytes, now)
+        parts.update(_render_local(analyzer, root, output_dir, max_shard_bytes, now))
+
+    summary = os.path.join(output_dir, SUMMARY_NAME)
+    lines = _summary(analyzer, root, tasks, parts, max_shard_bytes, now)
+    with open(summary, "w", encoding="utf-8", errors="backslashreplace", buffering=1 << 20) as f:
+        for line in lines:
+            f.write(line + "\n")
+    return summary
+
+
+def _render_parallel(analyzer, tasks, output_dir, max_bytes, now, processes, root):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    parts = {}
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=ctx) as executor:
+        # Prima i sotto-alberi più grandi: il tempo totale non dipende dall'ultimo arrivato
+        ordered = sorted(tasks, key=lambda task: task[1].total_files, reverse=True)
+        futures = {
+            base: executor.submit(_shard_worker, _pack_dir(sub), sub.path, sub.depth, base, root.name,
+                                  output_dir, max_bytes, now, analyzer.path_limit)
+            for base, sub in ordered
+        }
+        # Intanto il processo principale scrive file della radice e path oltre soglia
+        parts.update(_render_local(analyzer, root, output_dir, max_bytes, now))
+        for base, future in futures.items():
+            parts[base] = future.result()
+    return parts
+
+
+def _shard_worker(packed, dir_path, depth, base, rel_prefix, output_dir, max_bytes, now, path_limit):
+    dir_info = _unpack_dir(packed, dir_path, depth)
+    renderer = PathAnalyzer(dir_path, path_limit=path_limit)
+    return _render_shard(renderer, dir_info, base, rel_prefix, output_dir, max_bytes, now)
+
+
+def _render_shard(renderer, dir_info, base, rel_prefix, output_dir, max_bytes, now):
+    # Albero e indice di una cartella di primo livello; renderer fornisce path_limit e i renderer
+    rel = f"{rel_prefix}/{dir_info.name}"
+    tree = ShardWriter(output_dir, f"{base}.tree", f"🌳 `{rel}/` — Struttura", SUMMARY_NAME, max_bytes)
+    tree.write_lines(["### Vista Pulita", "", "```"])
+    tree.write_lines(renderer.iter_clean_tree(dir_info))
+    tree.write_lines(["```", "", "### Vista Dettagliata", "", "```"])
+    tree.write_lines(renderer.iter_detail_tree(dir_info))
+    tree.write_lines(["```", "", f"> ❌ = path oltre {renderer.path_limit} caratteri",
+                      "", "---", f"*Path Analyzer v3.0 GUI — {now}*"])
+
+    index = ShardWriter(output_dir, f"{base}.index", f"📋 `{rel}/` — Indice File", SUMMARY_NAME, max_bytes)
+    index.write_lines(renderer._file_index(dir_info, rel_prefix))
+    index.write_lines(["---", f"*Path Analyzer v3.0 GUI — {now}*"])
+    return {"tree": tree.close(), "index": index.close()}
+
+
+def _render_local(analyzer, root, output_dir, max_bytes, now):
+    # Pezzi scritti dal processo principale: file della radice e path oltre soglia
+    parts = {}
+    files = list(root.files)
+    if files:
+        # Solo i file della radice: le sottocartelle hanno i loro pezzi
+        shallow = DirInfo(name=root.name, path=root.path, files=files)
+        index = ShardWriter(output_dir, "000_radice.index", f"📋 `{root.name}/` — File nella radice",
+                            SUMMARY_NAME, max_bytes)
+        index.write_lines(analyzer._file_index(shallow))
+        index.write_lines(["---", f"*Path Analyzer v3.0 GUI — {now}*"])
+        parts[None] = {"tree": [], "index": index.close()}
+    if analyzer.stats.path_stats.over_limit:
+        title = f"🔴 Percorsi Oltre la Soglia ({analyzer.path_limit} caratteri)"
+        over = ShardWriter(output_dir, OVER_LIMIT_BASE, title, SUMMARY_NAME, max_bytes)
+        over.write_lines(analyzer.over_limit_lines())
+        over.write_lines(["---", f"*Path Analyzer v3.0 GUI — {now}*"])
+        parts[OVER_LIMIT_BASE] = {"tree": [], "index": over.close()}
+    return parts
+
+
+def _links(names, label):
+    if not names:
+        return "—"
+    if len(names) == 1:
+        return f"[{label}]({names[0]})"
+    return f"[{label}]({names[0]}) " + " · ".join(f"[{i}]({name})" for i, name in enumerate(names[1:], 2))
+
+
+def _summary(analyzer, root, tasks, parts, max_bytes, now):
+    over = parts.get(OVER_LIMIT_BASE)
+    yield from analyzer.summary_lines(now, over["index"][0] if over else None)
+
+    files = sum(len(p["tree"]) + len(p["index"]) for p in parts.values())
+    yield "---"
+    yield ""
+    yield "## 🌳 Struttura Directory"
+    yield ""
+    yield (f"> Report suddiviso in **{files:,}** file da al massimo {format_size(max(max_bytes, MIN_SHARD_BYTES))}: "
+           f"per ogni cartella di primo livello, albero e indice dei file sono in file separati.")
+    yield ""
+    yield "| # | Cartella | File | Dimensione | Path Len | Albero | Indice file |"
+    yield "|---|----------|------|------------|----------|--------|-------------|"
+    if None in parts:
+        root_files = parts[None]["index"]
+        size = sum(f.size for f in root.files)
+        yield (f"| — | 📄 *file nella radice* | {len(root.files):,} | {format_size(size)} | — | — "
+               f"| {_links(root_files, 'indice')} |")
+    for i, (base, sub) in enumerate(tasks, 1):
+        p = parts[base]
+        w = " 🔴" if sub.path_length > analyzer.path_limit else ""
+        yield (f"| {i} | {FOLDER_ICON} `{sub.name}/` | {sub.total_files:,} | {format_size(sub.total_size)} "
+               f"| {sub.path_length}{w} | {_links(p['tree'], 'albero')} | {_links(p['index'], 'indice')} |")
+    yield ""
+
+    yield "---"
+    yield f"*Path Analyzer v3.0 GUI — {now} — Soglia: {analyzer.path_limit} chars*"
+    yield ""
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Snapshot SQLite delle letture di directory per la scansione incrementale."""
+
+import marshal
+import os
+import sqlite3
+import threading
+import time
+
+from .models import EntryInfo, Listing
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SNAPSHOT INCREMENTALE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_SNAPSHOT_DB = os.path.join(os.path.expanduser("~"), ".path_analyzer", "snapshots.db")
+
+class ScanSnapshot:
+    """
+    Snapshot SQLite delle letture di directory, una generazione per radice.
+
+    Per ogni cartella si salvano mtime e dimensione della directory insieme
+    al suo elenco. Nella scansione incrementale una os.stat della cartella
+    basta a decidere: se mtime e dimensione coincidono l'elenco viene dallo
+    snapshot, altrimenti la cartella si rilegge. Creare, eliminare o
+    rinominare una voce aggiorna l'mtime della cartella che la contiene;
+    modificare un file sul posto no, quindi di quei file restano dimensione
+    e data dello snapshot.
+
+    Le nuove righe si scrivono in una generazione separata e diventano lo
+    snapshot corrente solo con save(): una scansione annullata lascia intatto
+    quello precedente.
+    """
+
+    FLUSH_EVERY = 500
+    # Cartelle modificate negli ultimi istanti: l'mtime potrebbe non cambiare
+    # più a una modifica successiva, quindi la prossima volta si rileggono
+    RACY_NS = 2_000_000_000
+
+    def __init__(self, db_path, root_path, incremental=True, shard=False):
+        self.db_path = db_path
+        self.root_path = root_path
+        self.incremental = incremental
+        self.shard = shard  # nei processi figli: sola lettura, righe restituite al padre
+        self._lock = threading.Lock()
+        self._pending = []
+        if not shard:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        if not shard:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS roots ("
+                " id INTEGER PRIMARY KEY, root TEXT UNIQUE NOT NULL,"
+                " generation INTEGER NOT NULL, saved REAL NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dirs ("
+                " root_id INTEGER NOT NULL, generation INTEGER NOT NULL, path TEXT NOT NULL,"
+                " mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, entries BLOB NOT NULL,"
+                " PRIMARY KEY (root_id, generation, path)) WITHOUT ROWID")
+            self._conn.execute("INSERT OR IGNORE INTO roots (root, generation, saved) VALUES (?, 0, 0)", (root_path,))
+            self._conn.commit()
+        self._root_id, self.generation, self.saved = self._conn.execute(
+            "SELECT id, generation, saved FROM roots WHERE root = ?", (root_path,)).fetchone()
+
+    def list_directory(self, dir_path, list_fn):
+        try:
+            st = os.stat(dir_path)
+        except OSError:
+            return list_fn(dir_path)
+
+        if self.incremental and self.generation:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT mtime_ns, size, entries FROM dirs WHERE root_id = ? AND generation = ? AND path = ?",
+                    (self._root_id, self.generation, dir_path)).fetchone()
+            if row is not None and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+                self._record(dir_path, row[0], row[1], row[2])
+                entries = [EntryInfo(name, os.path.join(dir_path, name), *rest) for name, *rest in marshal.loads(row[2])]
+                return Listing(entries, None, 1, True)
+
+        listing = list_fn(dir_path)
+        if listing.error is None:
+            mtime_ns = st.st_mtime_ns
+            if time.time_ns() - mtime_ns < self.RACY_NS:
+                mtime_ns = -1
+            blob = marshal.dumps([(e.name, e.is_dir, e.is_file, e.size, e.modified, e.hidden) for e in listing.entries])
+            self._record(dir_path, mtime_ns, st.st_size, blob)
+        return listing._replace(syscalls=listing.syscalls + 1)
+
+    def _record(self, dir_path, mtime_ns, size, blob):
+        with self._lock:
+            self._pending.append((dir_path, mtime_ns, size, blob))
+            if not self.shard and len(self._pending) >= self.FLUSH_EVERY:
+                self._flush()
+
+    def take_pending(self):
+        # Righe lette da un processo figlio, da passare a extend() nel padre
+        with self._lock:
+            rows, self._pending = self._pending, []
+        return rows
+
+    def extend(self, rows):
+        with self._lock:
+            self._pending.extend(rows)
+            self._flush()
+
+    def _flush(self):
+        generation = self.generation + 1
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO dirs (root_id, generation, path, mtime_ns, size, entries) VALUES (?, ?, ?, ?, ?, ?)",
+            [(self._root_id, generation, *row) for row in self._pending])
+        self._pending = []
+
+    def save(self):
+        # La nuova generazione sostituisce la precedente in un'unica transazione
+        with self._lock:
+            self._flush()
+            self.generation += 1
+            self.saved = time.time()
+            self._conn.execute("DELETE FROM dirs WHERE root_id = ? AND generation <> ?", (self._root_id, self.generation))
+            self._conn.execute("UPDATE roots SET generation = ?, saved = ? WHERE id = ?",
+                               (self.generation, self.saved, self._root_id))
+            self._conn.commit()
+
+    def close(self):
+        # Senza save() le righe non confermate vengono scartate
+        with self._lock:
+            self._conn.rollback()
+            self._conn.close()
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Tempi per fase: tempo reale, tempo di CPU, memoria massima e voci al secondo.
+
+Serve a capire dove va il tempo di una scansione lenta: se nella lettura
+delle directory il tempo reale supera di molto quello di CPU, si aspetta
+il file server; se i due coincidono, il costo è nostro.
+
+Il tempo di CPU è quello del thread che svolge la fase (time.thread_time):
+con più thread di lettura "listing" e "stat" sono somme tra i thread e
+possono superare la durata della scansione. Su Windows thread_time ha una
+risoluzione di circa 15 ms: le somme su molte cartelle restano indicative.
+Con `python -X tracemalloc` si registra anche il picco di memoria Python
+di ogni fase misurata con measure().
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+# Etichette nell'ordine del lavoro: scansione, report, rinomina
+PHASE_LABELS = {
+    "listing": "Lettura directory",
+    "stat": "Metadati (stat)",
+    "stats": "Statistiche e albero",
+    "render": "Rendering report",
+    "write": "Scrittura report",
+    "plan": "Piano di rinomina",
+    "execute": "Esecuzione rinomine",
+    "rollback": "Rollback",
+}
+
+
+def peak_rss():
+    # Massimo della memoria residente del processo finora, in byte (0 se non disponibile)
+    try:
+        import resource
+    except ImportError:
+        return _peak_rss_windows()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def _peak_rss_windows():
+    try:
+        import ctypes
+        from ctypes import wintypes
+    except ImportError:
+        return 0
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    try:
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        kernel32.K32GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+                                                     wintypes.DWORD]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if kernel32.K32GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        pass
+    return 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FASI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class PhaseTiming:
+    wall: float = 0.0       # secondi di tempo reale
+    cpu: float = 0.0        # secondi di CPU del thread che ha svolto la fase
+    items: int = 0          # voci elaborate (cartelle, voci, operazioni)
+    peak_rss: int = 0       # massimo RSS del processo alla fine della fase, in byte
+    peak_traced: int = 0    # picco tracemalloc durante la fase, in byte (0 se non attivo)
+
+    def add(self, wall, cpu, items=0):
+        self.wall += wall
+        self.cpu += cpu
+        self.items += items
+
+    def merge(self, other):
+        self.add(other.wall, other.cpu, other.items)
+        self.peak_rss = max(self.peak_rss, other.peak_rss)
+        self.peak_traced = max(self.peak_traced, other.peak_traced)
+
+    @property
+    def rate(self):
+        return self.items / self.wall if self.wall > 0 else 0.0
+
+    @property
+    def waiting(self):
+        # Tempo reale non speso in CPU: I/O, rete, attese tra thread
+        return max(0.0, self.wall - self.cpu)
+
+    def as_dict(self):
+        return {"wall_seconds": round(self.wall, 4), "cpu_seconds": round(self.cpu, 4),
+                "wait_seconds": round(self.waiting, 4), "items": self.items,
+                "items_per_second": round(self.rate, 1), "peak_rss_bytes": self.peak_rss or None,
+                "peak_traced_bytes": self.peak_traced or None}
+
+
+class PhaseTimes(dict):
+    """Fasi per nome, nell'ordine in cui sono state misurate la prima volta."""
+
+    def phase(self, name):
+        timing = self.get(name)
+        if timing is None:
+            timing = self[name] = PhaseTiming()
+        return timing
+
+    @contextmanager
+    def measure(self, name, items=0):
+        # Tempo reale e di CPU del blocco, sommati alla fase; items si può
+        # aggiornare sull'oggetto restituito. Le misure non vanno annidate.
+        timing = PhaseTiming(items=items)
+        tracing = tracemalloc.is_tracing() and hasattr(tracemalloc, "reset_peak")
+        if tracing:
+            tracemalloc.reset_peak()
+        start, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield timing
+        finally:
+            timing.wall = time.perf_counter() - start
+            timing.cpu = time.thread_time() - cpu
+            timing.peak_rss = peak_rss()
+            if tracing:
+                timing.peak_traced = tracemalloc.get_traced_memory()[1]
+            self.phase(name).merge(timing)
+
+    def move(self, name, part, timing):
+        # Sposta timing (misurato dentro la fase name) nella fase part
+        whole = self.phase(name)
+        whole.wall = max(0.0, whole.wall - timing.wall)
+        whole.cpu = max(0.0, whole.cpu - timing.cpu)
+        self.phase(part).merge(timing)
+
+    def merge(self, other):
+        for name, timing in other.items():
+            self.phase(name).merge(timing)
+
+    # ─── Output ──────────────────────────────────────────────────────────
+
+    def log_lines(self):
+        # Una riga per fase, per il tab Log e il riepilogo della riga di comando
+        for name, t in self.items():
+            rate = f", {t.rate:,.0f} voci/s" if t.items else ""
+            memory = f", RSS max {t.peak_rss / (1 << 20):,.0f} MB" if t.peak_rss else ""
+            yield (f"{PHASE_LABELS.get(name, name)}: {t.wall:.2f}s (CPU {t.cpu:.2f}s, "
+                   f"attesa {t.waiting:.2f}s){rate}{memory}")
+
+    def report_lines(self):
+        yield "## ⏱️ Tempi per Fase"
+        yield ""
+        yield "> Attesa = tempo reale meno CPU: in lettura directory e metadati è il tempo del file server."
+        yield ""
+        yield "| Fase | Tempo | CPU | Attesa | Voci | Voci/s | RSS max |"
+        yield "|------|-------|-----|--------|------|--------|---------|"
+        for name, t in self.items():
+            memory = f"{t.peak_rss / (1 << 20):,.0f} MB" if t.peak_rss else "—"
+            yield (f"| {PHASE_LABELS.get(name, name)} | {t.wall:.2f}s | {t.cpu:.2f}s | {t.waiting:.2f}s "
+                   f"| {t.items:,} | {t.rate:,.0f} | {memory} |")
+        yield ""
+
+    def as_dict(self):
+        return {name: timing.as_dict() for name, timing in self.items()}
+
+
+def timing_path(output_path):
+    # File JSON accanto al report: report.md -> report.timing.json
+    return os.path.splitext(output_path)[0] + ".timing.json"
+
+def write_timing(path, phases, **info):
+    import json
+    data = dict(info, generated=time.strftime("%Y-%m-%dT%H:%M:%S"), phases=phases.as_dict())
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""Rappresentazioni dell'albero scansionato: a oggetti e colonnare."""
+
+import os
+from array import array
+
+from .models import DirInfo, FileInfo
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COSTRUZIONE ALBERO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ObjectTree:
+    """Albero classico: un oggetto DirInfo/FileInfo per ogni voce."""
+
+    def open_dir(self, name, path, depth, path_len):
+        return DirInfo(name=name, path=path, depth=depth, path_length=path_len)
+
+    def set_error(self, dir_info, error):
+        dir_info.error = error
+
+    def add_subdir(self, dir_info, subdir):
+        dir_info.subdirs.append(subdir)
+        dir_info.total_files += subdir.total_files
+        dir_info.total_size += subdir.total_size
+
+    def add_file(self, dir_info, entry, ext, path_len):
+        file_info = FileInfo(
+            name=entry.name, path=entry.path, extension=ext,
+            size=entry.size, modified=entry.modified, path_length=path_len,
+            is_hidden=entry.hidden,
+        )
+        dir_info.files.append(file_info)
+        dir_info.total_files += 1
+        dir_info.total_size += entry.size
+        return file_info
+
+    def close_dir(self, dir_info):
+        return dir_info
+
+    # Trasferimento dei sotto-alberi scansionati in un altro processo
+    def pack(self, dir_info):
+        return _pack_dir(dir_info)
+
+    def unpack(self, packed, dir_path, depth):
+        return _unpack_dir(packed, dir_path, depth)
+
+
+FLAG_DIR    = 0x1
+FLAG_HIDDEN = 0x2
+
+class TreeStore:
+    """
+    Albero colonnare (struct-of-arrays) per scansioni molto grandi.
+
+    Ogni voce è un indice nelle colonne `array`; i nomi stanno in un unico
+    buffer UTF-8 e i path completi si ricostruiscono risalendo i parent.
+    Le voci sono in pre-ordine come la visita dello scanner: una cartella è
+    seguita dal suo sotto-albero, che finisce all'indice end[i]. Si legge
+    tramite NodeView, che espone gli stessi campi di DirInfo/FileInfo.
+    """
+
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self.parent = array("i")
+        self.end = array("i")
+        self.name_offset = array("Q", [0])
+        self.names = bytearray()
+        self.size = array("q")
+        self.modified = array("d")
+        self.path_length = array("i")
+        self.depth = array("H")
+        self.flags = array("B")
+        self.total_files = array("q")
+        self.total_size = array("q")
+        self.errors = {}
+        self._open = []
+
+    def __len__(self):
+        return len(self.parent)
+
+    @property
+    def root(self) -> "NodeView":
+        return NodeView(self, 0)
+
+    # ─── Costruzione (chiamata dallo scanner) ────────────────────────────
+
+    def _append(self, name, flags, depth, path_len, size=0, modified=0.0):
+        index = len(self.parent)
+        self.parent.append(self._open[-1] if self._open else -1)
+        self.end.append(index + 1)
+        # surrogatepass: conserva i nomi non decodificabili restituiti dal SO
+        self.names += name.encode("utf-8", "surrogatepass")
+        self.name_offset.append(len(self.names))
+        self.size.append(size)
+        self.modified.append(modified)
+        self.path_length.append(path_len)
+        self.depth.append(depth)
+        self.flags.append(flags)
+        self.total_files.append(0 if flags & FLAG_DIR else 1)
+        self.total_size.append(size)
+        return index
+
+    def open_dir(self, name, path, depth, path_len):
+        index = self._append(name, FLAG_DIR, depth, path_len)
+        self._open.append(index)
+        return NodeView(self, index)
+
+    def set_error(self, node, error):
+        self.errors[node.index] = error
+
+    def add_subdir(self, node, subdir):
+        pass  # i totali risalgono in close_dir
+
+    def add_file(self, node, entry, ext, path_len):
+        flags = FLAG_HIDDEN if entry.hidden else 0
+        depth = self.depth[node.index] + 1
+        index = self._append(entry.name, flags, depth, path_len, entry.size, entry.modified)
+        self.total_files[node.index] += 1
+        self.total_size[node.index] += entry.size
+        return NodeView(self, index)
+
+    def close_dir(self, node):
+        index = self._open.pop()
+        self.end[index] = len(self.parent)
+        self._add_totals(self.parent[index], index)
+        return node
+
+    def _add_totals(self, parent, index):
+        if parent >= 0:
+            self.total_files[parent] += self.total_files[index]
+            self.total_size[parent] += self.total_size[index]
+
+    def pack(self, node):
+        return self  # lo store del processo figlio contiene solo quel sotto-albero
+
+    def unpack(self, other, dir_path, depth):
+        # Accoda in blocco lo store di un sotto-albero sotto la cartella aperta
+        base, parent, names_base = len(self.parent), self._open[-1], len(self.names)
+        self.parent.extend(array("i", (p + base if p >= 0 else parent for p in other.parent)))
+        self.end.extend(array("i", (e + base for e in other.end)))
+        self.name_offset.extend(array("Q", (o + names_base for o in other.name_offset[1:])))
+        self.names += other.names
+        for column in ("size", "modified", "path_length", "depth", "flags", "total_files", "total_size"):
+            getattr(self, column).extend(getattr(other, column))
+        self.errors.update((index + base, error) for index, error in other.errors.items())
+        self._add_totals(parent, base)
+        return NodeView(self, base)
+
+    # ─── Lettura ─────────────────────────────────────────────────────────
+
+    def name(self, index):
+        start, stop = self.name_offset[index], self.name_offset[index + 1]
+        return self.names[start:stop].decode("utf-8", "surrogatepass")
+
+    def path(self, index):
+        parts = []
+        while index > 0:
+            parts.append(self.name(index))
+            index = self.parent[index]
+        return os.path.join(self.root_path, *reversed(parts))
+
+    def children(self, index):
+        child, stop = index + 1, self.end[index]
+        while child < stop:
+            yield child
+            child = self.end[child]
+
+    def nbytes(self):
+        columns = (self.parent, self.end, self.name_offset, self.size, self.modified,
+                   self.path_length, self.depth, self.flags, self.total_files, self.total_size)
+        return sum(c.itemsize * len(c) for c in columns) + len(self.names)
+
+
+class NodeView:
+    """Vista in sola lettura di una voce di TreeStore (interfaccia di DirInfo/FileInfo)."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __repr__(self):
+        return f"NodeView({self.path!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, NodeView) and other.store is self.store and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.store), self.index))
+
+    @property
+    def name(self):
+        return self.store.name(self.index)
+
+    @property
+    def path(self):
+        return self.store.path(self.index)
+
+    @property
+    def is_dir(self):
+        return bool(self.store.flags[self.index] & FLAG_DIR)
+
+    @property
+    def is_hidden(self):
+        return bool(self.store.flags[self.index] & FLAG_HIDDEN)
+
+    @property
+    def extension(self):
+        return os.path.splitext(self.name)[1].lower()
+
+    @property
+    def size(self):
+        return self.store.size[self.index]
+
+    @property
+    def modified(self):
+        return self.store.modified[self.index]
+
+    @property
+    def path_length(self):
+        return self.store.path_length[self.index]
+
+    @property
+    def depth(self):
+        return self.store.depth[self.index]
+
+    @property
+    def error(self):
+        return self.store.errors.get(self.index)
+
+    @property
+    def total_files(self):
+        return self.store.total_files[self.index]
+
+    @property
+    def total_size(self):
+        return self.store.total_size[self.index]
+
+    @property
+    def subdirs(self):
+        flags = self.store.flags
+        return [NodeView(self.store, i) for i in self.store.children(self.index) if flags[i] & FLAG_DIR]
+
+    @property
+    def files(self):
+        flags = self.store.flags
+        return [NodeView(self.store, i) for i in self.store.children(self.index) if not flags[i] & FLAG_DIR]
+
+    def to_info(self):
+        """Copia la voce (e l'eventuale sotto-albero) in oggetti FileInfo/DirInfo."""
+        if not self.is_dir:
+            return FileInfo(name=self.name, path=self.path, extension=self.extension, size=self.size,
+                            modified=self.modified, path_length=self.path_length, is_hidden=self.is_hidden)
+        # Stack esplicito di (vista, copia): nessun limite di profondita
+        root = self._dir_copy()
+        stack = [(self, root)]
+        while stack:
+            node, dir_info = stack.pop()
+            subdirs = node.subdirs
+            dir_info.subdirs = [sub._dir_copy() for sub in subdirs]
+            dir_info.files = [f.to_info() for f in node.files]
+            stack.extend(zip(subdirs, dir_info.subdirs))
+        return root
+
+    def _dir_copy(self):
+        # La cartella senza contenuto: sottocartelle e file li aggiunge to_info
+        return DirInfo(name=self.name, path=self.path, total_files=self.total_files,
+                       total_size=self.total_size, depth=self.depth,
+                       path_length=self.path_length, error=self.error)
+
+
+
+# ─── Sotto-alberi tra processi ───────────────────────────────────────────────
+
+def _pack_dir(dir_info):
+    # Forma compatta e piatta, in pre-ordine: per ogni cartella (nome, errore,
+    # numero di sottocartelle, file). Path, lunghezze e totali si ricalcolano
+    # in _unpack_dir. Niente tuple annidate: pickle non ricorre per livello
+    packed = []
+    stack = [dir_info]
+    while stack:
+        dir_info = stack.pop()
+        subdirs = dir_info.subdirs
+        packed.append((dir_info.name, dir_info.error, len(subdirs),
+                       [(f.name, f.size, f.modified, f.is_hidden) for f in dir_info.files]))
+        stack.extend(reversed(subdirs))
+    return packed
+
+def _unpack_dir(packed, dir_path, depth):
+    # Ricostruisce l'albero con uno stack di [cartella, sottocartelle ancora da leggere]
+    root = None
+    open_dirs = []
+    for name, error, n_subdirs, files in packed:
+        if open_dirs:
+            parent = open_dirs[-1][0]
+            dir_path, depth = os.path.join(parent.path, name), parent.depth + 1
+        dir_info = DirInfo(name=name, path=dir_path, depth=depth, path_length=len(dir_path), error=error)
+        for file_name, size, modified, hidden in files:
+            file_path = os.path.join(dir_path, file_name)
+            dir_info.files.append(FileInfo(
+                name=file_name, path=file_path, extension=os.path.splitext(file_name)[1].lower(),
+                size=size, modified=modified, path_length=len(file_path), is_hidden=hidden,
+            ))
+            dir_info.total_files += 1
+            dir_info.total_size += size
+        if open_dirs:
+            open_dirs[-1][0].subdirs.append(dir_info)
+            open_dirs[-1][1] -= 1
+        else:
+            root = dir_info
+        open_dirs.append([dir_info, n_subdirs])
+        # Cartelle complete: i totali risalgono al padre
+        while open_dirs and not open_dirs[-1][1]:
+            done = open_dirs.pop()[0]
+            if open_dirs:
+                open_dirs[-1][0].total_files += done.total_files
+                open_dirs[-1][0].total_size += done.total_size
+    return root
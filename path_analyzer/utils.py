@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Costanti di presentazione e funzioni di formattazione condivise."""
+
+import datetime
+import time
+
+
+# ─── Costanti Albero ─────────────────────────────────────────────────────────
+PIPE   = "│   "
+TEE    = "├── "
+ELBOW  = "└── "
+SPACE  = "    "
+
+# ─── Icone per tipo di file ──────────────────────────────────────────────────
+FILE_ICONS = {
+    ".pdf": "📄", ".doc": "📝", ".docx": "📝", ".odt": "📝",
+    ".xls": "📊", ".xlsx": "📊", ".csv": "📊", ".ods": "📊",
+    ".ppt": "📽️", ".pptx": "📽️", ".odp": "📽️",
+    ".txt": "📃", ".rtf": "📃", ".md": "📑", ".log": "📃",
+    ".jpg": "🖼️", ".jpeg": "🖼️", ".png": "🖼️", ".gif": "🖼️",
+    ".bmp": "🖼️", ".svg": "🖼️", ".ico": "🖼️", ".webp": "🖼️",
+    ".psd": "🎨", ".ai": "🎨",
+    ".mp4": "🎬", ".avi": "🎬", ".mkv": "🎬", ".mov": "🎬",
+    ".mp3": "🎵", ".wav": "🎵", ".flac": "🎵", ".ogg": "🎵",
+    ".py": "🐍", ".js": "⚡", ".ts": "⚡", ".jsx": "⚡", ".tsx": "⚡",
+    ".html": "🌐", ".css": "🎨", ".scss": "🎨",
+    ".java": "☕", ".cs": "🔷", ".cpp": "⚙️", ".c": "⚙️", ".h": "⚙️",
+    ".rs": "🦀", ".go": "🐹", ".rb": "💎", ".php": "🐘",
+    ".sql": "🗃️", ".json": "📋", ".xml": "📋", ".yaml": "📋", ".yml": "📋",
+    ".sh": "🐚", ".bat": "🐚", ".ps1": "🐚", ".cmd": "🐚",
+    ".zip": "📦", ".rar": "📦", ".7z": "📦", ".tar": "📦", ".gz": "📦",
+    ".exe": "⚙️", ".msi": "⚙️", ".dll": "🔧", ".sys": "🔧",
+    ".db": "🗄️", ".sqlite": "🗄️", ".mdb": "🗄️", ".accdb": "🗄️",
+    ".ttf": "🔤", ".otf": "🔤", ".woff": "🔤", ".woff2": "🔤",
+    ".ini": "⚙️", ".cfg": "⚙️", ".conf": "⚙️", ".env": "⚙️",
+    ".bak": "💾", ".iso": "💿", ".img": "💿", ".vhd": "💿",
+}
+
+FOLDER_ICON = "📁"
+UNKNOWN_ICON = "📄"
+
+# ─── Formati di esportazione (vedi export.py) ────────────────────────────────
+EXPORT_FORMATS = {".db": "sqlite", ".sqlite": "sqlite", ".sqlite3": "sqlite",
+                  ".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# UTILITY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def format_size(size_bytes: int) -> str:
+    if size_bytes < 0:
+        return "N/A"
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size_bytes < 1024:
+            return f"{size_bytes} {unit}" if unit == 'B' else f"{size_bytes:.2f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.2f} PB"
+
+def format_date(timestamp: float) -> str:
+    try:
+        return datetime.datetime.fromtimestamp(timestamp).strftime("%d/%m/%Y %H:%M")
+    except (OSError, ValueError):
+        return "N/A"
+
+def get_file_icon(extension: str) -> str:
+    return FILE_ICONS.get(extension.lower(), UNKNOWN_ICON)
+
+def get_path_length_range(length: int) -> str:
+    if length <= 50:      return "0-50"
+    elif length <= 100:   return "51-100"
+    elif length <= 150:   return "101-150"
+    elif length <= 200:   return "151-200"
+    elif length <= 260:   return "201-260"
+    elif length <= 300:   return "261-300"
+    else:                 return "300+"
+
+def write_lines(output_path, lines, batch=1024, timing=None):
+    # Scrive le righe separate da "\n" (come "\n".join) a blocchi, mentre
+    # vengono generate: la memoria non dipende dalla lunghezza del documento.
+    # timing (timing.PhaseTiming): vi si somma il tempo delle sole scritture
+    clock, cpu = time.perf_counter, time.thread_time
+    with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        buf, sep = [], ""
+        for line in lines:
+            buf.append(line)
+            if len(buf) >= batch:
+                start, start_cpu = clock(), cpu()
+                f.write(sep + "\n".join(buf))
+                if timing is not None:
+                    timing.add(clock() - start, cpu() - start_cpu, len(buf))
+                buf, sep = [], "\n"
+        start, start_cpu = clock(), cpu()
+        if buf:
+            f.write(sep + "\n".join(buf))
+    if timing is not None:
+        # Compresa la chiusura del file, che svuota l'ultimo buffer
+        timing.add(clock() - start, cpu() - start_cpu, len(buf))
+
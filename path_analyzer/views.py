@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Sorgenti di righe per le viste virtualizzate della GUI.
+
+Una vista chiede solo len(sorgente) e sorgente.line(i) per le righe
+visibili: nessuna delle due classi formatta o copia in anticipo
+l'intero risultato, quindi aprire una scansione enorme costa quanto
+una piccola.
+"""
+
+from bisect import bisect_right
+
+from .utils import ELBOW, PIPE, SPACE, TEE
+
+EXPANDED = "▾ "
+COLLAPSED = "▸ "
+
+
+class LineList:
+    """Righe a blocchi: righe già pronte o blocchi (n, fn) formattati solo quando visibili."""
+
+    def __init__(self, lines=None):
+        self._starts = []
+        self._blocks = []
+        self._tail = None
+        self._len = 0
+        if lines:
+            self.extend(lines)
+
+    def __len__(self):
+        return self._len
+
+    def append(self, line):
+        # Le righe consecutive finiscono nello stesso blocco
+        if self._tail is None:
+            self._tail = []
+            self._starts.append(self._len)
+            self._blocks.append(self._tail.__getitem__)
+        self._tail.append(line)
+        self._len += 1
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def extend_lazy(self, count, fn):
+        # fn(k) -> k-esima riga del blocco, 0 <= k < count
+        if count:
+            self._starts.append(self._len)
+            self._blocks.append(fn)
+            self._tail = None
+            self._len += count
+
+    def line(self, index):
+        block = bisect_right(self._starts, index) - 1
+        return self._blocks[block](index - self._starts[block])
+
+
+class TreeRow:
+    __slots__ = ("item", "prefix", "connector", "is_dir", "level", "expanded", "more")
+
+    def __init__(self, item, prefix, connector, is_dir, level, more=None):
+        self.item = item
+        self.prefix = prefix
+        self.connector = connector
+        self.is_dir = is_dir
+        self.level = level
+        self.expanded = False
+        # Riga "… altri N elementi" di una cartella lunga: (sottocartelle, file, prossimo)
+        self.more = more
+
+    @property
+    def marker_col(self):
+        # Colonna del segno ▸/▾: un clic lì espande o chiude la cartella
+        return len(self.prefix) + len(self.connector)
+
+    def text(self):
+        if self.more is not None:
+            subdirs, files, start = self.more
+            return f"{self.prefix}{self.connector}… altri {len(subdirs) + len(files) - start:,} elementi"
+        if self.is_dir:
+            marker = EXPANDED if self.expanded else COLLAPSED
+            return f"{self.prefix}{self.connector}{marker}{self.item.name}"
+        return f"{self.prefix}{self.connector}{self.item.name}"
+
+
+class TreeRows:
+    """
+    Righe visibili dell'albero (vista pulita) con cartelle chiuse ed
+    espandibili su richiesta.
+
+    Espandere una cartella legge dal modello (DirInfo o NodeView) solo i
+    suoi figli diretti e ne inserisce al massimo `page` righe: se ce ne
+    sono di più, una riga "… altri N elementi" carica la pagina successiva.
+    """
+
+    PAGE = 1000
+
+    def __init__(self, root, page=PAGE):
+        self.page = page
+        self._rows = [TreeRow(root, "", "", True, 0)]
+        self.toggle(0)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def line(self, index):
+        return self._rows[index].text()
+
+    def row(self, index):
+        return self._rows[index]
+
+    def toggle(self, index):
+        # Espande, chiude o carica la pagina successiva; False per i file
+        row = self._rows[index]
+        if row.more is not None:
+            subdirs, files, start = row.more
+            self._rows[index:index + 1] = self._page(subdirs, files, start, row.level, row.prefix)
+            return True
+        if not row.is_dir:
+            return False
+        if row.expanded:
+            end = index + 1
+            while end < len(self._rows) and self._rows[end].level > row.level:
+                end += 1
+            del self._rows[index + 1:end]
+            row.expanded = False
+        else:
+            prefix = "" if row.level == 0 else row.prefix + (SPACE if row.connector == ELBOW else PIPE)
+            item = row.item
+            self._rows[index + 1:index + 1] = self._page(item.subdirs, item.files, 0, row.level + 1, prefix)
+            row.expanded = True
+        return True
+
+    def _page(self, subdirs, files, start, level, prefix):
+        # Sottocartelle prima dei file, come in iter_clean_tree
+        total = len(subdirs) + len(files)
+        stop = min(total, start + self.page)
+        rows = []
+        for i in range(start, stop):
+            is_dir = i < len(subdirs)
+            item = subdirs[i] if is_dir else files[i - len(subdirs)]
+            rows.append(TreeRow(item, prefix, ELBOW if i == total - 1 else TEE, is_dir, level))
+        if stop < total:
+            rows.append(TreeRow(None, prefix, ELBOW, False, level, more=(subdirs, files, stop)))
+        return rows
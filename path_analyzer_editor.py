@@ -6,687 +6,86 @@ Analizzatore + Editor massivo di path con wizard, preview, e rollback.
 Bottom-up execution per evitare cascading path invalidation.
 """
 
+
 import os
-import sys
-import re
-import json
 import threading
+import multiprocessing
 import datetime
-import time
-import shutil
-import webbrowser
-from collections import defaultdict
-from dataclasses import dataclass, field
-from typing import Optional, List, Tuple, Callable
-from enum import Enum
+from typing import List
 
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-import tkinter as tk
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# CONSTANTS
-# ═══════════════════════════════════════════════════════════════════════════════
-
-PIPE = "│   "; TEE = "├── "; ELBOW = "└── "; SPACE = "    "
-
-FILE_ICONS = {
-    ".pdf":"📄",".doc":"📝",".docx":"📝",".xls":"📊",".xlsx":"📊",".csv":"📊",
-    ".ppt":"📽️",".pptx":"📽️",".txt":"📃",".md":"📑",".log":"📃",
-    ".jpg":"🖼️",".jpeg":"🖼️",".png":"🖼️",".gif":"🖼️",".bmp":"🖼️",".svg":"🖼️",
-    ".mp4":"🎬",".avi":"🎬",".mkv":"🎬",".mp3":"🎵",".wav":"🎵",
-    ".py":"🐍",".js":"⚡",".ts":"⚡",".jsx":"⚡",".tsx":"⚡",
-    ".html":"🌐",".css":"🎨",".java":"☕",".cs":"🔷",".cpp":"⚙️",".c":"⚙️",
-    ".rs":"🦀",".go":"🐹",".rb":"💎",".php":"🐘",
-    ".sql":"🗃️",".json":"📋",".xml":"📋",".yaml":"📋",".yml":"📋",
-    ".sh":"🐚",".bat":"🐚",".ps1":"🐚",
-    ".zip":"📦",".rar":"📦",".7z":"📦",
-    ".exe":"⚙️",".dll":"🔧",".db":"🗄️",".sqlite":"🗄️",
-    ".ttf":"🔤",".otf":"🔤",".ini":"⚙️",".cfg":"⚙️",".env":"⚙️",
-    ".bak":"💾",".iso":"💿",
-}
-
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# DATA CLASSES
-# ═══════════════════════════════════════════════════════════════════════════════
-
-@dataclass
-class FileInfo:
-    name: str; path: str; extension: str; size: int; modified: float
-    path_length: int = 0; is_hidden: bool = False
-
-@dataclass
-class DirInfo:
-    name: str; path: str
-    files: list = field(default_factory=list)
-    subdirs: list = field(default_factory=list)
-    total_files: int = 0; total_size: int = 0; depth: int = 0
-    path_length: int = 0; error: Optional[str] = None
-
-@dataclass
-class PathLengthStats:
-    all_paths: list = field(default_factory=list)
-    over_limit: list = field(default_factory=list)
-    longest_file_path: str = ""; longest_file_length: int = 0
-    longest_dir_path: str = ""; longest_dir_length: int = 0
-    avg_length: float = 0; median_length: int = 0
-    distribution: dict = field(default_factory=lambda: defaultdict(int))
-
-@dataclass
-class ScanStats:
-    total_dirs: int = 0; total_files: int = 0; total_size: int = 0
-    max_depth: int = 0
-    extensions: dict = field(default_factory=lambda: defaultdict(int))
-    ext_sizes: dict = field(default_factory=lambda: defaultdict(int))
-    largest_files: list = field(default_factory=list)
-    errors: list = field(default_factory=list)
-    path_stats: PathLengthStats = field(default_factory=PathLengthStats)
-    scan_start: float = 0; scan_end: float = 0
-
-
-class RuleType(Enum):
-    FIND_REPLACE = "Trova e Sostituisci"
-    TRUNCATE = "Tronca a N caratteri"
-    REMOVE_CHARS = "Rimuovi caratteri"
-    REMOVE_PREFIX = "Rimuovi prefisso"
-    REMOVE_SUFFIX = "Rimuovi suffisso"
-    COMPRESS_SEPARATORS = "Comprimi separatori"
-    REGEX_REPLACE = "Regex"
-    SMART_ABBREVIATE = "Abbreviazione smart"
-
-
-@dataclass
-class RenameRule:
-    """Una singola regola di rinomina configurata dall'utente."""
-    rule_type: RuleType
-    params: dict = field(default_factory=dict)
-    apply_to_files: bool = True
-    apply_to_dirs: bool = True
-    enabled: bool = True
-
-    def describe(self) -> str:
-        t = self.rule_type.value
-        p = self.params
-        if self.rule_type == RuleType.FIND_REPLACE:
-            return f'{t}: "{p.get("find","")}" -> "{p.get("replace","")}"'
-        elif self.rule_type == RuleType.TRUNCATE:
-            return f'{t}: max {p.get("max_chars",50)} caratteri'
-        elif self.rule_type == RuleType.REMOVE_CHARS:
-            return f'{t}: "{p.get("chars","")}"'
-        elif self.rule_type == RuleType.REMOVE_PREFIX:
-            return f'{t}: "{p.get("prefix","")}"'
-        elif self.rule_type == RuleType.REMOVE_SUFFIX:
-            return f'{t}: "{p.get("suffix","")}"'
-        elif self.rule_type == RuleType.COMPRESS_SEPARATORS:
-            return f'{t}: comprimi ripetizioni di "{p.get("char","_")}"'
-        elif self.rule_type == RuleType.REGEX_REPLACE:
-            return f'{t}: /{p.get("pattern","")}/ -> "{p.get("replace","")}"'
-        elif self.rule_type == RuleType.SMART_ABBREVIATE:
-            return f'{t}: abbreviazioni comuni'
-        return t
-
-
-@dataclass
-class RenameOperation:
-    """Una singola operazione di rinomina pianificata."""
-    old_path: str
-    new_path: str
-    old_name: str
-    new_name: str
-    depth: int
-    is_dir: bool
-    old_length: int = 0
-    new_length: int = 0
-    savings: int = 0
-    status: str = "pending"  # pending, done, error, skipped
-    error_msg: str = ""
-
-    def __post_init__(self):
-        self.old_length = len(self.old_path)
-        self.new_length = len(self.new_path)
-        self.savings = self.old_length - self.new_length
-
-
-@dataclass
-class RenamePlan:
-    """Piano completo di rinomina con tutte le operazioni ordinate."""
-    operations: List[RenameOperation] = field(default_factory=list)
-    conflicts: List[str] = field(default_factory=list)
-    warnings: List[str] = field(default_factory=list)
-    total_savings: int = 0
-    paths_fixed: int = 0
-    is_valid: bool = True
-
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# UTILITY
-# ═══════════════════════════════════════════════════════════════════════════════
-
-def format_size(b):
-    if b < 0: return "N/A"
-    for u in ['B','KB','MB','GB','TB']:
-        if b < 1024: return f"{b} {u}" if u == 'B' else f"{b:.2f} {u}"
-        b /= 1024
-    return f"{b:.2f} PB"
-
-def format_date(ts):
-    try: return datetime.datetime.fromtimestamp(ts).strftime("%d/%m/%Y %H:%M")
-    except: return "N/A"
-
-def is_hidden(fp):
-    if os.path.basename(fp).startswith('.'): return True
-    try:
-        import ctypes
-        a = ctypes.windll.kernel32.GetFileAttributesW(str(fp))
-        if a != -1: return bool(a & 0x2)
-    except: pass
-    return False
-
-def get_icon(ext): return FILE_ICONS.get(ext.lower(), "📄")
-
-def safe_stat(p):
-    try: return os.stat(p)
-    except: return None
-
-def get_range(l):
-    if l<=50: return "0-50"
-    elif l<=100: return "51-100"
-    elif l<=150: return "101-150"
-    elif l<=200: return "151-200"
-    elif l<=260: return "201-260"
-    elif l<=300: return "261-300"
-    else: return "300+"
-
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# SMART ABBREVIATIONS
-# ═══════════════════════════════════════════════════════════════════════════════
-
-SMART_ABBREV = {
-    "documents": "docs", "document": "doc", "documentation": "docs",
-    "configuration": "cfg", "config": "cfg", "configure": "cfg",
-    "application": "app", "applications": "apps",
-    "development": "dev", "developer": "dev",
-    "production": "prod", "environment": "env",
-    "temporary": "tmp", "temp": "tmp",
-    "library": "lib", "libraries": "libs",
-    "resource": "res", "resources": "res",
-    "information": "info", "images": "img", "image": "img",
-    "source": "src", "sources": "src",
-    "package": "pkg", "packages": "pkgs",
-    "component": "cmp", "components": "cmps",
-    "database": "db", "backup": "bak", "backups": "bak",
-    "directory": "dir", "directories": "dirs",
-    "template": "tpl", "templates": "tpls",
-    "utilities": "util", "utility": "util",
-    "download": "dl", "downloads": "dl",
-    "attachment": "att", "attachments": "att",
-    "administration": "admin", "administrator": "admin",
-    "management": "mgmt", "manager": "mgr",
-    "project": "prj", "projects": "prjs",
-    "specification": "spec", "specifications": "specs",
-    "presentation": "pres", "presentations": "pres",
-    "reference": "ref", "references": "refs",
-    "description": "desc", "version": "ver",
-    "original": "orig", "screenshot": "scrn", "screenshots": "scrn",
-    "communication": "comm", "communications": "comms",
-    "repository": "repo", "repositories": "repos",
-    "attachment": "att", "implementation": "impl",
-    "maintenance": "maint", "certificate": "cert", "certificates": "certs",
-    "documento": "doc", "documenti": "docs", "documentazione": "docs",
-    "configurazione": "cfg", "applicazione": "app", "applicazioni": "apps",
-    "sviluppo": "dev", "produzione": "prod", "ambiente": "env",
-    "temporaneo": "tmp", "libreria": "lib", "librerie": "libs",
-    "risorsa": "res", "risorse": "res", "informazioni": "info",
-    "immagine": "img", "immagini": "img", "sorgente": "src",
-    "componente": "cmp", "componenti": "cmps",
-    "progetto": "prj", "progetti": "prjs",
-    "presentazione": "pres", "presentazioni": "pres",
-    "amministrazione": "admin", "gestione": "mgmt",
-    "archivio": "arch", "comunicazione": "comm", "comunicazioni": "comms",
-    "manutenzione": "maint", "certificato": "cert", "certificati": "certs",
-}
-
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# RULE PROCESSOR
-# ═══════════════════════════════════════════════════════════════════════════════
-
-class RuleProcessor:
-    """Applica le regole di rinomina a un nome di file/cartella."""
-
-    @staticmethod
-    def apply_rules(name: str, rules: List[RenameRule], is_dir: bool) -> str:
-        for rule in rules:
-            if not rule.enabled:
-                continue
-            if is_dir and not rule.apply_to_dirs:
-                continue
-            if not is_dir and not rule.apply_to_files:
-                continue
-
-            # Per i file, separa nome ed estensione
-            if not is_dir:
-                base, ext = os.path.splitext(name)
-            else:
-                base, ext = name, ""
-
-            base = RuleProcessor._apply_single(base, rule)
-
-            # Sicurezza: non permettere nomi vuoti
-            if not base.strip():
-                base = "_renamed"
-
-            name = base + ext
-
-        return name
-
-    @staticmethod
-    def _apply_single(base: str, rule: RenameRule) -> str:
-        p = rule.params
-        rt = rule.rule_type
-
-        if rt == RuleType.FIND_REPLACE:
-            find = p.get("find", "")
-            repl = p.get("replace", "")
-            case_sensitive = p.get("case_sensitive", False)
-            if find:
-                if case_sensitive:
-                    base = base.replace(find, repl)
-                else:
-                    base = re.sub(re.escape(find), repl, base, flags=re.IGNORECASE)
-
-        elif rt == RuleType.TRUNCATE:
-            max_c = p.get("max_chars", 50)
-            if len(base) > max_c:
-                base = base[:max_c]
-
-        elif rt == RuleType.REMOVE_CHARS:
-            chars = p.get("chars", "")
-            for c in chars:
-                base = base.replace(c, "")
-
-        elif rt == RuleType.REMOVE_PREFIX:
-            prefix = p.get("prefix", "")
-            if prefix and base.startswith(prefix):
-                base = base[len(prefix):]
-
-        elif rt == RuleType.REMOVE_SUFFIX:
-            suffix = p.get("suffix", "")
-            if suffix and base.endswith(suffix):
-                base = base[:-len(suffix)]
-
-        elif rt == RuleType.COMPRESS_SEPARATORS:
-            char = p.get("char", "_")
-            if char:
-                pattern = re.escape(char) + "{2,}"
-                base = re.sub(pattern, char, base)
-                base = base.strip(char)
-
-        elif rt == RuleType.REGEX_REPLACE:
-            pattern = p.get("pattern", "")
-            repl = p.get("replace", "")
-            if pattern:
-                try:
-                    base = re.sub(pattern, repl, base)
-                except re.error:
-                    pass  # Regex invalida, skip
-
-        elif rt == RuleType.SMART_ABBREVIATE:
-            words = re.split(r'([_\-\s.]+)', base)
-            result = []
-            for w in words:
-                low = w.lower()
-                if low in SMART_ABBREV:
-                    abbr = SMART_ABBREV[low]
-                    # Mantieni il case originale se era capitalizzato
-                    if w[0].isupper() and len(w) > 0:
-                        abbr = abbr.capitalize()
-                    result.append(abbr)
-                else:
-                    result.append(w)
-            base = "".join(result)
-
-        return base
-
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# SCANNER ENGINE (from v3, compacted)
-# ═══════════════════════════════════════════════════════════════════════════════
-
-class PathAnalyzer:
-
-    def __init__(self, root_path, max_depth=-1, exclude_dirs=None,
-                 show_hidden=True, top_n_files=15, path_limit=260,
-                 progress_cb=None):
-        self.root_path = os.path.abspath(root_path)
-        self.max_depth = max_depth
-        self.exclude_dirs = set(exclude_dirs or [])
-        self.show_hidden = show_hidden
-        self.top_n_files = top_n_files
-        self.path_limit = path_limit
-        self.progress_cb = progress_cb
-        self.stats = ScanStats()
-        self.root_dir = None
-        self._cancel = False
-
-    def cancel(self): self._cancel = True
-
-    def scan(self):
-        self.stats.scan_start = time.time()
-        self._cancel = False
-        if not os.path.exists(self.root_path):
-            raise FileNotFoundError(f"Percorso non trovato: {self.root_path}")
-        if not os.path.isdir(self.root_path):
-            raise NotADirectoryError(f"Non e' una directory: {self.root_path}")
-        self.root_dir = self._scan_dir(self.root_path, 0)
-        if self._cancel: return None
-        self.stats.scan_end = time.time()
-        self.stats.largest_files.sort(key=lambda x: x.size, reverse=True)
-        self.stats.largest_files = self.stats.largest_files[:self.top_n_files]
-        self._compute_path_stats()
-        return self.root_dir
-
-    def _scan_dir(self, dir_path, depth):
-        if self._cancel: return DirInfo(name="", path="")
-        dn = os.path.basename(dir_path) or dir_path
-        pl = len(dir_path)
-        di = DirInfo(name=dn, path=dir_path, depth=depth, path_length=pl)
-        self.stats.total_dirs += 1
-        self.stats.max_depth = max(self.stats.max_depth, depth)
-        self.stats.path_stats.all_paths.append((dir_path, pl, "DIR"))
-        if pl > self.path_limit:
-            self.stats.path_stats.over_limit.append((dir_path, pl, "DIR"))
-        if self.progress_cb and self.stats.total_dirs % 50 == 0:
-            self.progress_cb(self.stats.total_dirs, self.stats.total_files)
-        try:
-            entries = sorted(os.scandir(dir_path), key=lambda e: (not e.is_dir(), e.name.lower()))
-        except PermissionError:
-            di.error = "Accesso negato"; self.stats.errors.append(f"Accesso negato: {dir_path}"); return di
-        except OSError as e:
-            di.error = str(e); self.stats.errors.append(f"Errore: {dir_path}: {e}"); return di
-        for entry in entries:
-            if self._cancel: break
-            try:
-                if not self.show_hidden and is_hidden(entry.path): continue
-                if entry.name in self.exclude_dirs: continue
-                if entry.is_dir(follow_symlinks=False):
-                    if self.max_depth >= 0 and depth >= self.max_depth: continue
-                    sub = self._scan_dir(entry.path, depth + 1)
-                    di.subdirs.append(sub); di.total_files += sub.total_files; di.total_size += sub.total_size
-                elif entry.is_file(follow_symlinks=False):
-                    st = safe_stat(entry.path); sz = st.st_size if st else 0; mt = st.st_mtime if st else 0
-                    ext = os.path.splitext(entry.name)[1].lower(); fpl = len(entry.path)
-                    fi = FileInfo(name=entry.name, path=entry.path, extension=ext, size=sz,
-                                  modified=mt, path_length=fpl, is_hidden=is_hidden(entry.path))
-                    di.files.append(fi); di.total_files += 1; di.total_size += sz
-                    self.stats.total_files += 1; self.stats.total_size += sz
-                    self.stats.extensions[ext or "(nessuna)"] += 1; self.stats.ext_sizes[ext or "(nessuna)"] += sz
-                    self.stats.path_stats.all_paths.append((entry.path, fpl, "FILE"))
-                    if fpl > self.path_limit: self.stats.path_stats.over_limit.append((entry.path, fpl, "FILE"))
-                    self.stats.largest_files.append(fi)
-                    if len(self.stats.largest_files) > self.top_n_files * 3:
-                        self.stats.largest_files.sort(key=lambda x: x.size, reverse=True)
-                        self.stats.largest_files = self.stats.largest_files[:self.top_n_files]
-            except: continue
-        return di
-
-    def _compute_path_stats(self):
-        ps = self.stats.path_stats
-        if not ps.all_paths: return
-        lengths = sorted([p[1] for p in ps.all_paths])
-        ps.avg_length = sum(lengths) / len(lengths)
-        ps.median_length = lengths[len(lengths) // 2]
-        for _, l, _ in ps.all_paths: ps.distribution[get_range(l)] += 1
-        fps = [(p,l) for p,l,t in ps.all_paths if t == "FILE"]
-        dps = [(p,l) for p,l,t in ps.all_paths if t == "DIR"]
-        if fps: lf = max(fps, key=lambda x:x[1]); ps.longest_file_path,ps.longest_file_length = lf
-        if dps: ld = max(dps, key=lambda x:x[1]); ps.longest_dir_path,ps.longest_dir_length = ld
-        ps.over_limit.sort(key=lambda x: x[1], reverse=True)
-
-    def build_clean_tree(self, di, prefix="", is_last=True, is_root=True):
-        lines = []
-        if is_root: lines.append(di.name); cp = ""
-        else:
-            lines.append(f"{prefix}{ELBOW if is_last else TEE}{di.name}")
-            cp = prefix + (SPACE if is_last else PIPE)
-        items = [(True,s) for s in di.subdirs] + [(False,f) for f in di.files]
-        for i,(d,it) in enumerate(items):
-            last = i == len(items) - 1
-            if d: lines.extend(self.build_clean_tree(it, cp, last, False))
-            else: lines.append(f"{cp}{ELBOW if last else TEE}{it.name}")
-        return lines
+from path_analyzer import (PathAnalyzer, PhaseTiming, RenameEngine, RenamePlan, RenameRule, RuleType,
+                           default_checkpoint_path, format_size, write_lines)
+from path_analyzer.timing import timing_path
+# Moduli caricati su richiesta dal pacchetto: importati per nome, così PyInstaller li include
+from path_analyzer.export import export_results
+from path_analyzer.snapshot import DEFAULT_SNAPSHOT_DB
+from path_analyzer.views import LineList, TreeRows
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# RENAME ENGINE — Il cuore del sistema
+# VISTA VIRTUALIZZATA (solo le righe visibili stanno nel widget)
 # ═══════════════════════════════════════════════════════════════════════════════
 
-class RenameEngine:
-    """
-    Motore di rinomina con esecuzione bottom-up.
-
-    STRATEGIA CHIAVE:
-    1. Raccoglie tutti i path problematici
-    2. Applica le regole IN MEMORIA per calcolare i nuovi nomi
-    3. Ordina le operazioni per profondita DECRESCENTE (bottom-up)
-    4. Esegue le rinominazioni dal piu profondo al meno profondo
-    5. In questo modo, quando rinomini una cartella, tutti i suoi figli
-       sono gia stati rinominati e il vecchio path e' ancora valido
-    """
-
-    def __init__(self, root_path: str, path_limit: int = 260):
-        self.root_path = root_path
-        self.path_limit = path_limit
-        self.plan = RenamePlan()
-        self.executed_ops: List[RenameOperation] = []  # Per rollback
-
-    def create_plan(self, rules: List[RenameRule],
-                    only_over_limit: bool = True,
-                    progress_cb: Callable = None) -> RenamePlan:
-        """
-        Crea il piano di rinomina senza toccare il filesystem.
-        Scansiona il tree e applica le regole in memoria.
-        """
-        self.plan = RenamePlan()
-        ops = []
-
-        # Raccoglie tutti gli elementi con os.walk bottom-up
-        # Bottom-up garantisce che le cartelle figlio vengano PRIMA dei genitori
-        all_entries = []
-
-        for dirpath, dirnames, filenames in os.walk(self.root_path, topdown=False):
-            depth = dirpath.replace(self.root_path, "").count(os.sep)
-
-            # File in questa directory
-            for fname in filenames:
-                full_path = os.path.join(dirpath, fname)
-                if only_over_limit and len(full_path) <= self.path_limit:
-                    continue
-                all_entries.append((full_path, fname, depth, False))
-
-            # La directory stessa (solo se non e' la root)
-            if os.path.abspath(dirpath) != os.path.abspath(self.root_path):
-                dname = os.path.basename(dirpath)
-                if only_over_limit and len(dirpath) <= self.path_limit:
-                    continue
-                all_entries.append((dirpath, dname, depth, True))
-
-        if progress_cb:
-            progress_cb(0, len(all_entries))
-
-        # Per ogni entry, calcola il nuovo nome applicando le regole
-        # IMPORTANTE: calcoliamo i nuovi path tenendo conto delle rinominazioni
-        # gia pianificate per le cartelle padre. Usiamo una mappa di sostituzione.
-        dir_renames = {}  # old_dir_path -> new_dir_name
-
-        for idx, (full_path, name, depth, is_dir) in enumerate(all_entries):
-            if progress_cb and idx % 100 == 0:
-                progress_cb(idx, len(all_entries))
-
-            new_name = RuleProcessor.apply_rules(name, rules, is_dir)
-
-            if new_name == name:
-                continue  # Nessun cambiamento
-
-            # Calcola il nuovo path completo
-            parent = os.path.dirname(full_path)
-            new_path = os.path.join(parent, new_name)
-
-            # Controlla conflitti
-            if os.path.exists(new_path) and new_path.lower() != full_path.lower():
-                self.plan.conflicts.append(
-                    f"Conflitto: '{new_name}' esiste gia in {parent}"
-                )
-                continue
-
-            op = RenameOperation(
-                old_path=full_path, new_path=new_path,
-                old_name=name, new_name=new_name,
-                depth=depth, is_dir=is_dir
-            )
-            ops.append(op)
-
-            if is_dir:
-                dir_renames[full_path] = new_name
-
-        # Ordina per profondita DECRESCENTE (bottom-up)
-        # A parita di profondita, i file prima delle cartelle
-        ops.sort(key=lambda o: (-o.depth, not o.is_dir))
-
-        self.plan.operations = ops
-        self.plan.total_savings = sum(o.savings for o in ops)
-        self.plan.paths_fixed = len(ops)
-        self.plan.is_valid = len(self.plan.conflicts) == 0
-
-        # Warnings
-        if not ops:
-            self.plan.warnings.append("Nessuna modifica necessaria con le regole attuali.")
-
-        # Verifica duplicati nello stesso folder
-        by_folder = defaultdict(list)
-        for op in ops:
-            parent = os.path.dirname(op.old_path)
-            by_folder[parent].append(op.new_name.lower())
-        for folder, names in by_folder.items():
-            dupes = [n for n in names if names.count(n) > 1]
-            if dupes:
-                self.plan.is_valid = False
-                self.plan.conflicts.append(
-                    f"Nomi duplicati in {folder}: {set(dupes)}"
-                )
-
-        return self.plan
-
-    def execute(self, on_error: str = "skip",
-                progress_cb: Callable = None) -> Tuple[int, int, List[str]]:
-        """
-        Esegue il piano di rinomina.
-        Le operazioni sono GIA ordinate bottom-up dal create_plan().
-
-        on_error: "skip" = continua, "stop" = ferma tutto
-
-        Returns: (successi, errori, lista_errori)
-        """
-        self.executed_ops = []
-        success = 0
-        errors = 0
-        error_list = []
-        total = len(self.plan.operations)
-
-        for idx, op in enumerate(self.plan.operations):
-            if progress_cb and idx % 10 == 0:
-                progress_cb(idx, total, success, errors)
-
-            try:
-                # Verifica che il path sorgente esista ancora
-                if not os.path.exists(op.old_path):
-                    # Il path potrebbe essere cambiato da un'operazione precedente
-                    # su una cartella genitore. Ma con bottom-up non dovrebbe succedere.
-                    op.status = "skipped"
-                    op.error_msg = "Path non trovato (possibile rinomina genitore)"
-                    error_list.append(f"SKIP: {op.old_path} non trovato")
-                    errors += 1
-                    if on_error == "stop":
-                        break
-                    continue
-
-                # Verifica che il target non esista
-                if os.path.exists(op.new_path) and op.new_path.lower() != op.old_path.lower():
-                    op.status = "skipped"
-                    op.error_msg = "Destinazione gia esistente"
-                    error_list.append(f"SKIP: {op.new_path} esiste gia")
-                    errors += 1
-                    if on_error == "stop":
-                        break
-                    continue
-
-                # Esegui la rinomina
-                os.rename(op.old_path, op.new_path)
-                op.status = "done"
-                self.executed_ops.append(op)
-                success += 1
-
-            except PermissionError:
-                op.status = "error"
-                op.error_msg = "Permesso negato"
-                error_list.append(f"ERRORE permesso: {op.old_path}")
-                errors += 1
-                if on_error == "stop": break
-
-            except OSError as e:
-                op.status = "error"
-                op.error_msg = str(e)
-                error_list.append(f"ERRORE: {op.old_path}: {e}")
-                errors += 1
-                if on_error == "stop": break
-
-        if progress_cb:
-            progress_cb(total, total, success, errors)
-
-        return success, errors, error_list
-
-    def rollback(self, progress_cb: Callable = None) -> Tuple[int, int]:
-        """
-        Annulla le operazioni eseguite in ordine INVERSO (top-down).
-        Questo e' l'opposto dell'esecuzione: prima le cartelle piu alte,
-        poi quelle piu profonde, poi i file.
-        """
-        # Inverti l'ordine: le ultime eseguite (le piu alte) vanno rollbackate per prime
-        to_undo = list(reversed(self.executed_ops))
-        success = 0
-        errors = 0
-        total = len(to_undo)
-
-        for idx, op in enumerate(to_undo):
-            if progress_cb and idx % 10 == 0:
-                progress_cb(idx, total)
-
-            try:
-                if os.path.exists(op.new_path):
-                    os.rename(op.new_path, op.old_path)
-                    success += 1
-            except:
-                errors += 1
-
-        self.executed_ops.clear()
-        return success, errors
-
-    def save_undo_log(self, path: str):
-        """Salva il log delle operazioni per undo futuro."""
-        data = {
-            "timestamp": datetime.datetime.now().isoformat(),
-            "root_path": self.root_path,
-            "operations": [
-                {"old": op.old_path, "new": op.new_path, "is_dir": op.is_dir,
-                 "depth": op.depth, "status": op.status}
-                for op in self.executed_ops
-            ]
-        }
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
+class VirtualTextView(ctk.CTkFrame):  # area di testo che disegna solo la finestra visibile di una sorgente
+    def __init__(self, master, font, on_click=None):
+        super().__init__(master, fg_color="transparent")
+        self.source = None; self.first = 0; self.font = font; self.on_click = on_click  # on_click(riga, colonna, doppio) -> True se ridisegnare
+        self.text = ctk.CTkTextbox(self, font=font, wrap="none", activate_scrollbars=False)
+        self.vbar = ctk.CTkScrollbar(self, command=self._on_vbar)
+        self.hbar = ctk.CTkScrollbar(self, orientation="horizontal", command=self.text.xview)
+        self.text.configure(xscrollcommand=self.hbar.set, state="disabled")
+        self.vbar.pack(side="right", fill="y"); self.hbar.pack(side="bottom", fill="x")
+        self.text.pack(side="left", fill="both", expand=True)
+        self.text.bind("<Configure>", lambda e: self._render())
+        self.text.bind("<MouseWheel>", self._on_wheel)
+        self.text.bind("<Button-4>", lambda e: self._on_key(-3)); self.text.bind("<Button-5>", lambda e: self._on_key(3))
+        self.text.bind("<Shift-MouseWheel>", lambda e: self.text.xview_scroll(-1 if e.delta > 0 else 1, "units"))
+        self.text.bind("<Button-1>", lambda e: self._on_button(e, False))
+        self.text.bind("<Double-Button-1>", lambda e: self._on_button(e, True))
+        for key, rows in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page")):
+            self.text.bind(key, lambda e, rows=rows: self._on_key(rows))
+        self.text.bind("<Control-Home>", lambda e: self._on_key(-len(self.source or ())))
+        self.text.bind("<Control-End>", lambda e: self._on_key(len(self.source or ())))
+
+    def set_source(self, source): self.source = source; self.first = 0; self._render()
+    def refresh(self): self._render()
+    def scroll(self, rows): self.first += rows; self._render()
+    def _visible_rows(self): return max(1, self.text.winfo_height() // max(1, self.font.metrics("linespace")) + 1)
+
+    def _render(self):
+        src = self.source; total = len(src) if src is not None else 0; rows = self._visible_rows()
+        self.first = max(0, min(self.first, total - rows + 1)); stop = min(total, self.first + rows)
+        x = self.text.xview()[0]
+        self.text.configure(state="normal"); self.text.delete("1.0", "end")
+        if total: self.text.insert("1.0", "\n".join(src.line(i) for i in range(self.first, stop)))
+        self.text.configure(state="disabled"); self.text.xview_moveto(x)
+        if total: self.vbar.set(self.first / total, stop / total)
+        else: self.vbar.set(0, 1)
+
+    def _on_vbar(self, action, value, unit=None):
+        if action == "moveto": self.first = int(float(value) * len(self.source or ()))
+        elif unit == "pages": self.first += int(value) * self._visible_rows()
+        else: self.first += int(value)
+        self._render()
+
+    def _on_wheel(self, e):  # Windows: multipli di 120; macOS: valori piccoli
+        step = e.delta // 120 if abs(e.delta) >= 120 else e.delta
+        self.scroll(-3 * step if step else (-1 if e.delta > 0 else 1)); return "break"
+
+    def _on_key(self, rows):
+        if rows in ("page", "-page"): page = self._visible_rows() - 1; rows = page if rows == "page" else -page
+        self.scroll(rows); return "break"
+
+    def _on_button(self, e, double):
+        self.text.focus_set()
+        if self.source is None or self.on_click is None: return None
+        line, col = map(int, self.text.index(f"@{e.x},{e.y}").split("."))
+        i = self.first + line - 1
+        if i < len(self.source) and self.on_click(i, col, double): self._render(); return "break"
+        return None
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # GUI — MAIN APPLICATION
@@ -705,6 +104,7 @@ class PathAnalyzerApp(ctk.CTk):
         self.analyzer = None
         self.rename_engine = None
         self._scan_thread = None
+        self._resume_from = None
         self._last_report = None
 
         self._build_ui()
@@ -739,9 +139,23 @@ class PathAnalyzerApp(ctk.CTk):
         self.depth_var = ctk.StringVar(value="-1")
         ctk.CTkEntry(r1, textvariable=self.depth_var, width=50, height=28).pack(side="left", padx=(4,12))
 
+        ctk.CTkLabel(r1, text="Thread:").pack(side="left")
+        self.workers_var = ctk.StringVar(value="8")
+        ctk.CTkEntry(r1, textvariable=self.workers_var, width=40, height=28).pack(side="left", padx=(4,12))
+
+        ctk.CTkLabel(r1, text="Processi:").pack(side="left")
+        self.processes_var = ctk.StringVar(value="1")
+        ctk.CTkEntry(r1, textvariable=self.processes_var, width=40, height=28).pack(side="left", padx=(4,12))
+
         self.hidden_var = ctk.BooleanVar(value=True)
         ctk.CTkCheckBox(r1, text="File nascosti", variable=self.hidden_var).pack(side="left", padx=(0,12))
 
+        self.columnar_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(r1, text="Albero compatto", variable=self.columnar_var).pack(side="left", padx=(0,12))
+
+        self.incremental_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(r1, text="Incrementale", variable=self.incremental_var).pack(side="left", padx=(0,12))
+
         ctk.CTkLabel(r1, text="Escludi:").pack(side="left")
         self.exclude_var = ctk.StringVar(value=".git, node_modules, __pycache__, .vs")
         ctk.CTkEntry(r1, textvariable=self.exclude_var, height=28).pack(side="left", fill="x", expand=True, padx=(4,0))
@@ -774,9 +188,12 @@ class PathAnalyzerApp(ctk.CTk):
         self.tabs = ctk.CTkTabview(self)
         self.tabs.pack(fill="both", expand=True, padx=16, pady=(6,12))
 
+        self.tree_rows = None
         for name in ["Struttura", "Statistiche", "Analisi Path", "Log"]:
-            tab = self.tabs.add(name)
-            txt = ctk.CTkTextbox(tab, font=ctk.CTkFont(family="Consolas", size=12), wrap="none")
+            tab = self.tabs.add(name); font = ctk.CTkFont(family="Consolas", size=12)
+            if name == "Struttura": txt = VirtualTextView(tab, font, on_click=self._on_tree_click)  # albero espandibile
+            elif name == "Analisi Path": txt = VirtualTextView(tab, font)
+            else: txt = ctk.CTkTextbox(tab, font=font, wrap="none")
             txt.pack(fill="both", expand=True)
             setattr(self, f"txt_{name.lower().replace(' ','_')}", txt)
 
@@ -793,15 +210,21 @@ class PathAnalyzerApp(ctk.CTk):
             return
         try:
             limit = int(self.limit_var.get()); depth = int(self.depth_var.get())
+            workers = int(self.workers_var.get()); processes = int(self.processes_var.get())
         except ValueError:
             messagebox.showerror("Errore", "Valori numerici non validi."); return
 
         excl = [e.strip() for e in self.exclude_var.get().split(",") if e.strip()]
+        checkpoint = default_checkpoint_path(path)  # scansione interrotta sulla stessa cartella: si puo' riprendere
+        self._resume_from = checkpoint if os.path.exists(checkpoint) and messagebox.askyesno(
+            "Scansione interrotta", "Una scansione precedente di questa cartella non e' stata completata.\nVuoi riprenderla?") else None
 
-        for t in [self.txt_struttura, self.txt_statistiche, self.txt_analisi_path, self.txt_log]:
+        for t in [self.txt_statistiche, self.txt_log]:
             t.configure(state="normal"); t.delete("1.0","end")
+        self.tree_rows = None; self.txt_struttura.set_source(None); self.txt_analisi_path.set_source(None)
 
         self._log("Avvio scansione: " + path)
+        if self._resume_from: self._log("Ripresa dal checkpoint: " + self._resume_from)
         self.scan_btn.configure(state="disabled")
         self.cancel_btn.configure(state="normal")
         self.edit_btn.configure(state="disabled")
@@ -811,17 +234,20 @@ class PathAnalyzerApp(ctk.CTk):
 
         self.analyzer = PathAnalyzer(root_path=path, max_depth=depth, exclude_dirs=excl,
                                      show_hidden=self.hidden_var.get(), path_limit=limit,
-                                     progress_cb=self._on_progress)
+                                     progress_callback=self._on_progress, workers=workers,
+                                     processes=processes, columnar=self.columnar_var.get(),
+                                     snapshot=DEFAULT_SNAPSHOT_DB if self.incremental_var.get() else None,
+                                     incremental=self.incremental_var.get(), checkpoint=checkpoint)
         self._scan_thread = threading.Thread(target=self._run_scan, daemon=True)
         self._scan_thread.start()
 
     def _run_scan(self):
         try:
-            r = self.analyzer.scan()
+            r = self.analyzer.resume(self._resume_from) if self._resume_from else self.analyzer.scan()
             if r is None: self.after(0, self._on_cancelled)
             else: self.after(0, self._on_complete)
         except Exception as e:
-            self.after(0, lambda: self._on_error(str(e)))
+            self.after(0, lambda msg=str(e): self._on_error(msg))  # e non esiste più fuori dall'except
 
     def _cancel_scan(self):
         if self.analyzer: self.analyzer.cancel()
@@ -832,7 +258,7 @@ class PathAnalyzerApp(ctk.CTk):
     def _on_cancelled(self):
         self.progress.stop(); self.progress.set(0)
         self.scan_btn.configure(state="normal"); self.cancel_btn.configure(state="disabled")
-        self.status_var.set("Annullata."); self._log("Scansione annullata.")
+        self.status_var.set("Annullata."); self._log("Scansione annullata (riprendibile alla prossima scansione).")
 
     def _on_error(self, e):
         self.progress.stop(); self.progress.set(0)
@@ -855,9 +281,8 @@ class PathAnalyzerApp(ctk.CTk):
             f"Completata in {el:.2f}s - {s.total_dirs:,} dir, {s.total_files:,} file, "
             f"{format_size(s.total_size)}, {len(ps.over_limit)} path oltre soglia")
 
-        # Popola tab Struttura
-        self.txt_struttura.delete("1.0","end")
-        self.txt_struttura.insert("1.0", "\n".join(a.build_clean_tree(a.root_dir)))
+        # Popola tab Struttura (solo il primo livello, il resto si espande su richiesta)
+        self.tree_rows = TreeRows(a.root_dir); self.txt_struttura.set_source(self.tree_rows)
 
         # Popola tab Statistiche
         self.txt_statistiche.delete("1.0","end")
@@ -878,60 +303,82 @@ class PathAnalyzerApp(ctk.CTk):
         self.txt_statistiche.insert("1.0", "\n".join(lines))
 
         # Popola tab Analisi Path
-        self.txt_analisi_path.delete("1.0","end")
-        pl = [
+        pl = LineList(); pl.extend([
             f"{'='*60}", f"  ANALISI PATH (soglia: {a.path_limit})", f"{'='*60}",
-            f"  Percorsi:   {len(ps.all_paths):,}",
+            f"  Percorsi:   {ps.total_paths:,}",
             f"  Media:      {ps.avg_length:.0f} chars",
             f"  Mediana:    {ps.median_length} chars",
             f"  Max file:   {ps.longest_file_length} chars",
             f"  Max dir:    {ps.longest_dir_length} chars",
             f"  Oltre:      {len(ps.over_limit)}", "",
-        ]
+        ])
         if ps.over_limit:
             pl.append(f"{'='*60}")
             pl.append(f"  PERCORSI OLTRE SOGLIA ({len(ps.over_limit)})")
             pl.append(f"{'='*60}")
-            for i,(p,l,t) in enumerate(ps.over_limit, 1):
-                pl.append(f"  {i:>4}. [{t:>4}] {l} chars (+{l-a.path_limit})")
-                pl.append(f"        {p}")
-        self.txt_analisi_path.insert("1.0", "\n".join(pl))
+            def over(k, ol=ps.over_limit, lim=a.path_limit):  # due righe per voce, formattate solo a schermo
+                p, l, t = ol[k // 2]
+                return f"        {p}" if k % 2 else f"  {k // 2 + 1:>4}. [{t:>4}] {l} chars (+{l-lim})"
+            pl.extend_lazy(2 * len(ps.over_limit), over)
+        self.txt_analisi_path.set_source(pl)
 
         self._log(f"Scansione completata: {s.total_dirs:,} dir, {s.total_files:,} file, {len(ps.over_limit)} oltre soglia")
+        if s.syscalls: self._log(f"Chiamate di sistema: {s.syscalls:,} ({(s.total_dirs + s.total_files) / s.syscalls:.1f} voci per chiamata)")
+        if s.dirs_reused or s.dirs_relisted: self._log(f"Snapshot: {s.dirs_reused:,} cartelle riusate, {s.dirs_relisted:,} rilette")
+        self._log_phases(s.phases)
+
+    def _log_phases(self, phases, names=None):  # tempo reale contro CPU: attesa alta in lettura = file server lento
+        for name, line in zip(phases, phases.log_lines()):
+            if names is None or name in names: self._log("  ⏱ " + line)
+
+    def _on_tree_click(self, i, col, double):  # clic su ▸/▾ o doppio clic: espande/chiude; "… altri": pagina successiva
+        r = self.tree_rows.row(i) if self.tree_rows else None
+        if r is None or not (r.is_dir or r.more is not None): return False
+        if r.more is None and not double and not r.marker_col <= col < r.marker_col + 2: return False
+        return self.tree_rows.toggle(i)
 
     def _export(self):
         if not self.analyzer or not self.analyzer.root_dir: return
         path = filedialog.asksaveasfilename(title="Salva Report", defaultextension=".md",
-                                            filetypes=[("Markdown","*.md")])
+                                            filetypes=[("Markdown","*.md"), ("SQLite","*.db"), ("CSV","*.csv"), ("NDJSON","*.ndjson")])
         if not path: return
         # Usa il generatore report dalla v3 (semplificato qui)
         self._log(f"Export report: {path}")
         try:
-            self._generate_md_report(path)
-            self._last_report = path
+            if path.lower().endswith(".md"):
+                self._generate_md_report(path); self._last_report = path
+                self._log_phases(self.analyzer.stats.phases, ("render", "write"))
+            else: self._log(f"Esportate {export_results(self.analyzer, path):,} voci")  # una riga per voce
             messagebox.showinfo("OK", f"Report salvato:\n{path}")
         except Exception as e:
             messagebox.showerror("Errore", str(e))
 
-    def _generate_md_report(self, output_path):
+    def _generate_md_report(self, output_path):  # tempi come PathAnalyzer.generate_report, JSON accanto al report
+        a = self.analyzer; ph = a.stats.phases; written = PhaseTiming()
+        for name in ("render", "write"): ph.pop(name, None)
+        with ph.measure("render", a.stats.total_dirs + a.stats.total_files):
+            write_lines(output_path, self._md_report_lines(), timing=written)
+        ph.move("render", "write", written)
+        a.write_timing(timing_path(output_path))
+
+    def _md_report_lines(self):  # generatore: il report si scrive sezione per sezione
         a = self.analyzer; s = a.stats; ps = s.path_stats
         now = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-        L = ["# Path Analyzer Report","",f"> {now} - Path Analyzer Editor v4.0","","---",""]
-        L.append("## Riepilogo\n")
-        L.append(f"| Metrica | Valore |\n|---|---|\n| Cartelle | {s.total_dirs:,} |\n| File | {s.total_files:,} |")
-        L.append(f"| Dimensione | {format_size(s.total_size)} |\n| Path oltre soglia | **{len(ps.over_limit)}** |\n")
+        yield from ["# Path Analyzer Report","",f"> {now} - Path Analyzer Editor v4.0","","---",""]
+        yield "## Riepilogo\n"
+        yield f"| Metrica | Valore |\n|---|---|\n| Cartelle | {s.total_dirs:,} |\n| File | {s.total_files:,} |"
+        yield f"| Dimensione | {format_size(s.total_size)} |\n| Path oltre soglia | **{len(ps.over_limit)}** |\n"
         if ps.over_limit:
-            L.append(f"## Percorsi oltre soglia ({a.path_limit} chars)\n")
-            L.append("| # | Tipo | Lunghezza | Eccesso | Percorso |")
-            L.append("|---|------|-----------|---------|----------|")
+            yield f"## Percorsi oltre soglia ({a.path_limit} chars)\n"
+            yield "| # | Tipo | Lunghezza | Eccesso | Percorso |"
+            yield "|---|------|-----------|---------|----------|"
             for i,(p,l,t) in enumerate(ps.over_limit, 1):
-                L.append(f"| {i} | {t} | **{l}** | +{l-a.path_limit} | `{p}` |")
-            L.append("")
-        L.append("## Struttura\n\n```")
-        L.extend(a.build_clean_tree(a.root_dir))
-        L.append("```\n")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(L))
+                yield f"| {i} | {t} | **{l}** | +{l-a.path_limit} | `{p}` |"
+            yield ""
+        yield "## Struttura\n\n```"
+        yield from a.iter_clean_tree(a.root_dir)
+        yield "```\n"
+        yield from s.phases.report_lines()
 
     # ─── WIZARD ──────────────────────────────────────────────────────────
 
@@ -961,6 +408,7 @@ class WizardWindow(ctk.CTkToplevel):
         self.analyzer = analyzer
         self.engine = RenameEngine(analyzer.root_path, analyzer.path_limit)
         self.rules: List[RenameRule] = []
+        self.minimal_var = ctk.BooleanVar(value=False)
         self.current_step = 0
 
         self.title("Editor Rinomina - Wizard")
@@ -1083,6 +531,8 @@ class WizardWindow(ctk.CTkToplevel):
         ctk.CTkButton(right, text="Rimuovi Ultima", height=30,
                       fg_color="#c0392b", hover_color="#e74c3c",
                       command=self._remove_last_rule).pack(padx=10, pady=(0,8))
+        ctk.CTkCheckBox(right, text="Minimo di rinomine (prima le cartelle comuni)",
+                        variable=self.minimal_var).pack(anchor="w", padx=10, pady=(0,8))
 
         self._refresh_rules_display()
 
@@ -1190,11 +640,13 @@ class WizardWindow(ctk.CTkToplevel):
 
         self.preview_text.insert("1.0", "Calcolo preview in corso...\n")
 
-        threading.Thread(target=self._calc_preview, daemon=True).start()
+        threading.Thread(target=self._calc_preview, args=(self.minimal_var.get(),), daemon=True).start()
 
-    def _calc_preview(self):
-        plan = self.engine.create_plan(self.rules, only_over_limit=True)
+    def _calc_preview(self, minimal):
+        plan = self.engine.create_plan(self.rules, only_over_limit=True, scan=self.analyzer,  # dall'albero in memoria
+                                       minimal=minimal)
         self.after(0, lambda: self._show_preview(plan))
+        self.after(0, lambda: self.parent_app._log_phases(self.engine.phases, ("plan",)))
 
     def _show_preview(self, plan: RenamePlan):
         self.preview_text.configure(state="normal")
@@ -1206,6 +658,8 @@ class WizardWindow(ctk.CTkToplevel):
         lines.append(f"{'='*80}")
         lines.append(f"  Operazioni pianificate:  {len(plan.operations)}")
         lines.append(f"  Risparmio totale:        ~{plan.total_savings} caratteri")
+        lines.append(f"  Path risolti:            {plan.paths_fixed} (di cui {plan.fixed_by_parent} dalla cartella padre)")
+        lines.append(f"  Ancora oltre soglia:     {plan.still_over}")
         lines.append(f"  Conflitti:               {len(plan.conflicts)}")
         lines.append(f"  Warnings:                {len(plan.warnings)}")
         lines.append(f"  Piano valido:            {'SI' if plan.is_valid else 'NO'}")
@@ -1250,7 +704,7 @@ class WizardWindow(ctk.CTkToplevel):
                 lines.append(f"  {i}. [{t}] depth={op.depth}")
                 lines.append(f"     PRIMA:  {op.old_path}")
                 lines.append(f"             ({op.old_length} chars)")
-                lines.append(f"     DOPO:   {op.new_path}")
+                lines.append(f"     DOPO:   {op.final_path}")
                 lines.append(f"             ({op.new_length} chars, -{op.savings})")
                 lines.append("")
 
@@ -1280,7 +734,8 @@ class WizardWindow(ctk.CTkToplevel):
             "",
             "Le operazioni verranno eseguite in ordine bottom-up",
             "(dal livello piu profondo al piu alto) per evitare",
-            "l'invalidazione dei percorsi.",
+            "l'invalidazione dei percorsi: ogni cartella attende",
+            "le rinomine al suo interno, le altre vanno in parallelo.",
             "",
             "Verra creato un file di log per il rollback.",
         ]
@@ -1297,6 +752,13 @@ class WizardWindow(ctk.CTkToplevel):
         ctk.CTkRadioButton(ef, text="Salta e continua", variable=self.on_error_var, value="skip").pack(side="left", padx=4)
         ctk.CTkRadioButton(ef, text="Ferma tutto", variable=self.on_error_var, value="stop").pack(side="left", padx=4)
 
+        # Rinomine in parallelo tra sottoalberi indipendenti: su una share di rete la latenza si sovrappone
+        self.exec_workers_var = ctk.StringVar(value=self.parent_app.workers_var.get())
+        wf = ctk.CTkFrame(f, fg_color="transparent")
+        wf.pack(pady=(0,8))
+        ctk.CTkLabel(wf, text="Rinomine in parallelo (thread):").pack(side="left", padx=(0,8))
+        ctk.CTkEntry(wf, textvariable=self.exec_workers_var, width=40, height=28).pack(side="left")
+
     # ─── STEP 3: ESECUZIONE ─────────────────────────────────────────────
 
     def _step_execute(self):
@@ -1326,11 +788,13 @@ class WizardWindow(ctk.CTkToplevel):
 
     def _run_execute(self):
         on_err = self.on_error_var.get()
+        try: workers = max(1, int(self.exec_workers_var.get()))
+        except ValueError: workers = 1
 
         def progress(idx, total, ok, err):
             self.after(0, lambda: self._exec_progress(idx, total, ok, err))
 
-        success, errors, error_list = self.engine.execute(on_error=on_err, progress_cb=progress)
+        success, errors, error_list = self.engine.execute(on_error=on_err, progress_cb=progress, workers=workers)
 
         # Salva undo log
         undo_path = os.path.join(os.path.dirname(self.analyzer.root_path),
@@ -1391,6 +855,7 @@ class WizardWindow(ctk.CTkToplevel):
             self.rollback_btn.configure(state="normal")
 
         self.parent_app._log(f"Editor: {success} rinominati, {errors} errori")
+        self.parent_app._log_phases(self.engine.phases, ("execute",))
 
     def _do_rollback(self):
         if not messagebox.askyesno("Conferma Rollback",
@@ -1403,6 +868,7 @@ class WizardWindow(ctk.CTkToplevel):
         self.exec_text.configure(state="normal")
         self.exec_text.insert("end", f"\n\n{'='*60}\n  ROLLBACK: {ok} ripristinati, {err} errori\n{'='*60}\n")
         self.parent_app._log(f"Rollback: {ok} ripristinati, {err} errori")
+        self.parent_app._log_phases(self.engine.phases, ("rollback",))
 
         if err == 0:
             messagebox.showinfo("Rollback", f"Rollback completato: {ok} elementi ripristinati.")
@@ -1415,6 +881,7 @@ class WizardWindow(ctk.CTkToplevel):
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def main():
+    multiprocessing.freeze_support()
     app = PathAnalyzerApp()
     app.mainloop()
 
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Scansione asincrona: lettura anticipata limitata e annullamento del task."""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import PathAnalyzer
+from path_analyzer.aio import AsyncPathAnalyzer
+
+
+class CountingAnalyzer(AsyncPathAnalyzer):
+    # Registra quante letture sono avviate e non ancora consumate
+    peak = 0
+
+    def _start_listing(self, dir_path, depth):
+        task = super()._start_listing(dir_path, depth)
+        self.peak = max(self.peak, len(self._listings))
+        return task
+
+
+class AsyncScanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="path_analyzer_aio_")
+        self.root = os.path.join(self.tmp, "share")
+        # Cartella larga: 200 sottocartelle con 3 cartelle e un file ciascuna
+        for i in range(200):
+            for j in range(3):
+                os.makedirs(os.path.join(self.root, "c%03d" % i, "s%d" % j))
+            open(os.path.join(self.root, "c%03d" % i, "f.txt"), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_read_ahead_is_bounded(self):
+        analyzer = CountingAnalyzer(self.root, max_in_flight=2, read_ahead=5)
+        root_dir = asyncio.run(analyzer.scan())
+        self.assertEqual(root_dir.total_files, 200)
+        self.assertEqual(analyzer.stats.total_dirs, 801)
+        self.assertLessEqual(analyzer.peak, 5)
+
+    def test_task_cancel_stops_builder_and_writes_checkpoint(self):
+        checkpoint = os.path.join(self.tmp, "scan.ckpt")
+        analyzer = AsyncPathAnalyzer(self.root, max_in_flight=2, checkpoint=checkpoint, checkpoint_interval=3600)
+
+        async def scan_then_cancel():
+            task = asyncio.ensure_future(analyzer.scan())
+            loop = asyncio.get_running_loop()
+            seen = []
+
+            def on_entry(*entry):
+                # Chiamata dal thread del builder
+                seen.append(entry)
+                if len(seen) == 50:
+                    loop.call_soon_threadsafe(task.cancel)
+
+            analyzer.on_entry = on_entry
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scan_then_cancel())
+        self.assertTrue(os.path.isfile(checkpoint))
+
+        resumed = PathAnalyzer(self.root, checkpoint_interval=3600)
+        root_dir = resumed.resume(checkpoint)
+        self.assertEqual(root_dir.total_files, 200)
+        self.assertEqual(resumed.stats.total_dirs, 801)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Checkpoint: frequenza di scrittura."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import PathAnalyzer
+
+
+class CountingWrites(PathAnalyzer):
+    writes = 0
+
+    def _write_checkpoint(self, stack):
+        super()._write_checkpoint(stack)
+        self.writes += 1
+
+
+class CheckpointIntervalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="path_analyzer_ckpt_")
+        self.root = os.path.join(self.tmp, "share")
+        for i in range(300):
+            os.makedirs(os.path.join(self.root, "c%03d" % (i // 20), "s%03d" % i))
+            open(os.path.join(self.root, "c%03d" % (i // 20), "s%03d" % i, "f.txt"), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_interval_grows_with_write_time(self):
+        # Intervallo 0: senza il limite sul costo si scriverebbe a ogni cartella
+        analyzer = CountingWrites(self.root, checkpoint=os.path.join(self.tmp, "scan.ckpt"), checkpoint_interval=0)
+        self.assertIsNotNone(analyzer.scan())
+        self.assertGreater(analyzer.writes, 0)
+        self.assertLess(analyzer.writes, analyzer.stats.total_dirs // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
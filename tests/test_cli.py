@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Riga di comando: codici di uscita."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer.cli import EXIT_ERROR, EXIT_OK, main
+
+
+class CliExitCodeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="path_analyzer_cli_")
+        self.root = os.path.join(self.tmp, "share")
+        os.makedirs(os.path.join(self.root, "cartella"))
+        open(os.path.join(self.root, "cartella", "file.txt"), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def run_cli(self, *args):
+        return main([self.root, "--no-report", "--ndjson", "none", "--quiet", *args])
+
+    def test_export(self):
+        target = os.path.join(self.tmp, "scan.csv")
+        self.assertEqual(self.run_cli("--export", target), EXIT_OK)
+        self.assertTrue(os.path.isfile(target))
+
+    def test_export_to_unwritable_path(self):
+        for name in ("scan.csv", "scan.db"):
+            target = os.path.join(self.tmp, "manca", name)
+            self.assertEqual(self.run_cli("--export", target), EXIT_ERROR)
+
+    def test_report_to_unwritable_path(self):
+        # Sotto un file: nessuna cartella si puo' creare, anche da root
+        blocked = os.path.join(self.root, "cartella", "file.txt")
+        for args in (("-o", os.path.join(self.tmp, "manca", "report.md")),
+                     ("-o", os.path.join(blocked, "report.html")),
+                     ("-o", os.path.join(blocked, "pezzi"), "--shard-size", "1")):
+            with self.subTest(args=args):
+                code = main([self.root, "--ndjson", "none", "--quiet", *args])
+                self.assertEqual(code, EXIT_ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
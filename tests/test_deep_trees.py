@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Alberi piu profondi del limite di ricorsione di Python."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import PathAnalyzer
+
+# Oltre sys.getrecursionlimit(), entro PATH_MAX con nomi di un carattere
+DEPTH = 1500
+
+
+class StopAfterChain(PathAnalyzer):
+    # Si ferma quando la catena e gia chiusa sotto una cartella ancora aperta
+    def _write_checkpoint(self, stack):
+        if len(stack) == 2 and self.stats.total_files:
+            super()._write_checkpoint(stack)
+            self.cancel()
+
+
+class DeepTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="path_analyzer_deep_")
+        self.root = os.path.join(self.tmp, "r")
+        # Una catena profonda in "a" e una cartella corta "b": due sotto-alberi di primo livello
+        self.created = [self.root, os.path.join(self.root, "b"), os.path.join(self.root, "a")]
+        for path in self.created:
+            os.mkdir(path)
+        path = self.created[-1]
+        for _ in range(DEPTH):
+            path = os.path.join(path, "d")
+            os.mkdir(path)
+            self.created.append(path)
+        self.leaf = os.path.join(path, "f.txt")
+        with open(self.leaf, "w") as f:
+            f.write("x" * 10)
+
+    def tearDown(self):
+        # shutil.rmtree ricorre per livello: si smonta la catena dal fondo
+        if os.path.exists(self.leaf):
+            os.remove(self.leaf)
+        for path in reversed(self.created):
+            os.rmdir(path)
+        shutil.rmtree(self.tmp)  # report e checkpoint: poco profondi
+
+    def assertFullScan(self, analyzer, root_dir):
+        self.assertIsNotNone(root_dir)
+        self.assertEqual(analyzer.stats.total_dirs, DEPTH + 3)
+        self.assertEqual(analyzer.stats.total_files, 1)
+        self.assertEqual(root_dir.total_size, 10)
+        self.assertEqual(analyzer.stats.max_depth, DEPTH + 1)
+
+    def test_process_scan(self):
+        analyzer = PathAnalyzer(self.root, processes=2)
+        self.assertFullScan(analyzer, analyzer.scan())
+
+    def test_checkpoint_and_resume(self):
+        for columnar in (False, True):
+            checkpoint = os.path.join(self.tmp, "scan.ckpt")
+            analyzer = StopAfterChain(self.root, columnar=columnar, checkpoint=checkpoint, checkpoint_interval=0)
+            self.assertIsNone(analyzer.scan())
+            self.assertTrue(os.path.isfile(checkpoint))
+
+            resumed = PathAnalyzer(self.root, columnar=columnar, checkpoint_interval=0)
+            self.assertFullScan(resumed, resumed.resume(checkpoint))
+            self.assertFalse(os.path.exists(checkpoint))
+
+    def test_columnar_to_info(self):
+        analyzer = PathAnalyzer(self.root, columnar=True)
+        self.assertFullScan(analyzer, analyzer.scan())
+        dir_info = analyzer.root_dir.to_info()
+        self.assertEqual(dir_info.total_files, 1)
+        for _ in range(DEPTH + 1):
+            (dir_info,) = [sub for sub in dir_info.subdirs if sub.name in ("a", "d")]
+        self.assertEqual(dir_info.depth, DEPTH + 1)
+        self.assertEqual(dir_info.files[0].path, self.leaf)
+
+    def test_sharded_report_with_processes(self):
+        analyzer = PathAnalyzer(self.root)
+        analyzer.scan()
+        output_dir = os.path.join(self.tmp, "report")
+        summary = analyzer.generate_sharded_report(output_dir, processes=2)
+        self.assertTrue(os.path.isfile(summary))
+        names = os.listdir(output_dir)
+        self.assertTrue(any(name.endswith(".tree.md") for name in names), names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Esportazione: stesse righe con l'albero a oggetti e con quello colonnare."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import PathAnalyzer
+from path_analyzer.export import iter_rows
+
+
+class ExportRowsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.join(tempfile.mkdtemp(prefix="path_analyzer_export_"), "share")
+        # File e cartelle con nomi che si alternano: l'ordine non dipende dal nome
+        for folder in ("b_cartella", os.path.join("b_cartella", "interna"), "d_cartella", "f_vuota"):
+            os.makedirs(os.path.join(self.root, folder))
+        for name in ("a.txt", "c.pdf", os.path.join("b_cartella", "a.doc"),
+                     os.path.join("b_cartella", "interna", "z.csv"), os.path.join("d_cartella", ".nascosto")):
+            with open(os.path.join(self.root, name), "w") as f:
+                f.write(name)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.root), ignore_errors=True)
+
+    def test_same_rows_for_both_tree_modes(self):
+        rows = []
+        for columnar in (False, True):
+            analyzer = PathAnalyzer(self.root, path_limit=40, columnar=columnar)
+            analyzer.scan()
+            rows.append(list(iter_rows(analyzer)))
+        self.assertEqual(rows[0], rows[1])
+
+        # id = posizione nella visita, il padre viene sempre prima
+        ids = [row[0] for row in rows[0]]
+        self.assertEqual(ids, list(range(len(ids))))
+        self.assertTrue(all(row[1] is None or row[1] < row[0] for row in rows[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
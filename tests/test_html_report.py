@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Report HTML: la cartella dei pezzi di un report precedente."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import PathAnalyzer
+
+
+class HtmlReportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="path_analyzer_html_")
+        self.root = os.path.join(self.tmp, "share")
+        os.makedirs(os.path.join(self.root, "cartella"))
+        open(os.path.join(self.root, "cartella", "file.txt"), "w").close()
+        self.analyzer = PathAnalyzer(self.root)
+        self.analyzer.scan()
+        self.report = os.path.join(self.tmp, "report.html")
+        self.tree_dir = os.path.join(self.tmp, "report_files", "tree")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_rewrites_its_own_chunks(self):
+        self.analyzer.generate_report(self.report)
+        stale = os.path.join(self.tree_dir, "999999.js")
+        open(stale, "w").close()
+        self.analyzer.generate_report(self.report)
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.isfile(os.path.join(self.tree_dir, "000000.js")))
+
+    def test_keeps_a_folder_it_did_not_create(self):
+        os.makedirs(self.tree_dir)
+        own = os.path.join(self.tree_dir, "appunti.txt")
+        open(own, "w").close()
+        with self.assertRaises(FileExistsError):
+            self.analyzer.generate_report(self.report)
+        self.assertTrue(os.path.isfile(own))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""ListingPool: letture in anticipo limitate."""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer.listing import ListingPool
+
+
+def children(path, depth):
+    # Albero sintetico: 6 figli per cartella fino alla profondità 3 (259 cartelle)
+    return [(f"{path}/{i}", depth + 1) for i in range(6)] if depth < 3 else []
+
+
+class ListingPoolTest(unittest.TestCase):
+
+    def make_pool(self, peak, max_ready):
+        pool = None
+
+        def expand(result, depth):
+            with pool._cond:
+                peak[0] = max(peak[0], len(pool._results))
+            return children(result, depth)
+
+        pool = ListingPool(lambda path: path, expand, workers=4, max_ready=max_ready)
+        return pool
+
+    def test_ready_results_are_bounded(self):
+        peak = [0]
+        pool = self.make_pool(peak, max_ready=5)
+        pool.start([("r", 0)])
+        try:
+            self.assertEqual(pool.take("r", 0), "r")
+            # Lo scanner non consuma: i worker si fermano al limite
+            time.sleep(0.3)
+            with pool._cond:
+                self.assertLessEqual(len(pool._results), 5)
+                self.assertEqual(pool._running, 0)
+        finally:
+            pool.close()
+        self.assertLessEqual(peak[0], 5)
+
+    def test_visit_reads_every_folder_once(self):
+        pool = self.make_pool([0], max_ready=3)
+        pool.start([("r", 0)])
+        seen, stack = [], [("r", 0)]
+        try:
+            while stack:
+                path, depth = stack.pop()
+                seen.append(pool.take(path, depth))
+                stack.extend(reversed(children(path, depth)))
+        finally:
+            pool.close()
+        self.assertEqual(len(seen), 259)
+        self.assertEqual(len(set(seen)), 259)
+        self.assertFalse(pool._results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Piano ed esecuzione delle rinomine su alberi temporanei."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_analyzer import RenameEngine, RenameRule, RuleType
+
+
+class RenameOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="path_analyzer_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_folder_and_its_file_in_the_same_plan(self):
+        # Cartella e file allo stesso livello del piano: il file va rinominato prima
+        folder = os.path.join(self.root, "documentazione")
+        os.mkdir(folder)
+        open(os.path.join(folder, "documentazione.txt"), "w").close()
+
+        engine = RenameEngine(self.root, path_limit=260)
+        rule = RenameRule(RuleType.FIND_REPLACE, {"find": "documentazione", "replace": "doc"})
+        plan = engine.create_plan([rule], only_over_limit=False)
+        self.assertEqual([op.is_dir for op in plan.operations], [False, True])
+
+        success, errors, error_list = engine.execute()
+        self.assertEqual((success, errors), (2, 0), error_list)
+        self.assertTrue(os.path.isfile(os.path.join(self.root, "doc", "doc.txt")))
+
+        self.assertEqual(engine.rollback(), (2, 0))
+        self.assertTrue(os.path.isfile(os.path.join(folder, "documentazione.txt")))
+
+
+if __name__ == "__main__":
+    unittest.main()